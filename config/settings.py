@@ -3,4 +3,107 @@
 DB_NAME = "reminders_app.db"  # Name of the SQLite database file
 PUSHBULLET_API_KEY = ""  # Add your Pushbullet API Key
 EMAIL_SENDER = ""              # Email sender for notifications
-EMAIL_PASSWORD = ""           # Password for the sender's email
\ No newline at end of file
+EMAIL_PASSWORD = ""           # Password for the sender's email
+
+# Pushbullet API client (point PUSHBULLET_BASE_URL at a local HTTP stub for load tests)
+PUSHBULLET_BASE_URL = "https://api.pushbullet.com/v2"
+PUSHBULLET_CONNECT_TIMEOUT = 3.05  # Seconds to establish a connection
+PUSHBULLET_READ_TIMEOUT = 10.0     # Seconds to wait for a response
+PUSHBULLET_MAX_RETRIES = 3         # Retries on 429 / 5xx / failed connections
+PUSHBULLET_BACKOFF_BASE = 1.0      # First retry delay, doubled each retry (unless Retry-After says otherwise)
+PUSHBULLET_BACKOFF_MAX = 30.0      # Longest wait between attempts
+PUSHBULLET_POOL_SIZE = 10          # Keep-alive connections kept open
+
+# SMTP server and session pool (point these at a local test server, e.g. localhost:1025 / "none")
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 465
+SMTP_SECURITY = "ssl"                # "ssl" (implicit TLS), "starttls" or "none"
+SMTP_TIMEOUT = 10.0                  # Socket timeout in seconds
+SMTP_POOL_SIZE = 4                   # Logged-in sessions kept open at most
+SMTP_IDLE_TIMEOUT = 240.0            # Sessions idle longer than this are closed, not reused
+SMTP_NOOP_AFTER_SECONDS = 30.0       # Sessions idle longer than this are probed with NOOP before reuse
+SMTP_MAX_MESSAGES_PER_SESSION = 100  # Reconnect after this many emails on one session
+
+# SQLite connection tuning
+DB_READER_POOL_SIZE = 4           # Reader connections kept open alongside the single writer
+DB_BUSY_TIMEOUT = 5.0             # Seconds to wait on a locked database before failing
+DB_CACHE_SIZE_KB = 16384          # Page cache per connection (KiB)
+DB_MMAP_SIZE = 268435456          # Bytes of the database file to memory-map (256 MiB)
+DB_STATEMENT_CACHE_SIZE = 256     # Prepared statements cached per connection
+DB_ITER_BATCH_SIZE = 1000         # Rows per fetchmany() when streaming large result sets
+DB_PAGE_SIZE = 20                 # Reminders shown per page in the CLI listings
+
+# Schema migrations
+MIGRATION_BATCH_SIZE = 5000                   # Rows backfilled per write transaction
+MIGRATION_ESTIMATED_ROWS_PER_SECOND = 200000  # Throughput assumed by `migrate --dry-run`
+
+# Bulk import
+IMPORT_CHUNK_SIZE = 5000  # Rows validated and written per transaction
+
+# Time-partitioned storage (optional)
+PARTITIONED_STORAGE = False   # Move finished one-time reminders into per-month tables
+PARTITION_DIR = "partitions"  # Where detached cold partitions are written
+PARTITION_CHUNK_SIZE = 5000   # Rows moved per transaction
+PARTITION_ACTIVE_DAYS = 7     # Finished reminders stay in the active table this long
+
+# Archival of finished reminders
+ARCHIVE_RETENTION_DAYS = 7        # Notified one-time reminders older than this are archived
+ARCHIVE_CHUNK_SIZE = 1000         # Rows moved per transaction
+ARCHIVE_INTERVAL_SECONDS = 3600   # How often the checker runs the archival job
+
+# Event scheduler
+EVENT_SCHEDULER_HORIZON_SECONDS = 3600  # Pending reminders due within this window are kept in memory
+EVENT_SCHEDULER_MAX_SLEEP = 30.0        # Longest sleep before checking for writes by other processes
+
+# Daemon mode (`python main.py daemon`)
+DAEMON_PIDFILE = "reminder_daemon.pid"              # Holds the PID of the running daemon
+DAEMON_HEARTBEAT_FILE = "reminder_daemon.heartbeat"  # JSON status rewritten every interval
+DAEMON_HEARTBEAT_INTERVAL = 15.0                    # Seconds between heartbeats
+DAEMON_DRAIN_TIMEOUT = 30.0                         # Seconds to let in-flight deliveries finish on shutdown
+
+# asyncio delivery pipeline
+ASYNC_CHANNEL_LIMITS = {"desktop": 4, "email": 16, "pushbullet": 32}  # Concurrent sends per channel
+ASYNC_DB_WORKERS = 1  # Threads on the dedicated database executor
+
+# Parallel delivery in the checker: all channels of a reminder, and many reminders, at once
+FANOUT_CHANNEL_WORKERS = {"desktop": 1, "email": SMTP_POOL_SIZE, "pushbullet": 8}  # Concurrent sends per channel
+DELIVERY_MAX_IN_FLIGHT = 64  # Reminders being delivered at the same time
+
+# Delivery mode: "inline" sends from the checker itself; "outbox" only queues one outbox row per
+# channel in the checker's transaction and leaves sending to outbox workers (`python main.py outbox work`)
+DELIVERY_MODE = "inline"
+OUTBOX_WORKERS = 4              # Sends in flight per outbox worker
+OUTBOX_BATCH_SIZE = 100         # Entries claimed per round trip
+OUTBOX_LEASE_SECONDS = 300      # A claimed entry not finished by then is taken over by another worker
+OUTBOX_POLL_INTERVAL = 1.0      # Seconds an idle worker waits before looking again
+OUTBOX_MAX_ATTEMPTS = 6         # Failed sends before an entry is dead-lettered
+OUTBOX_BACKOFF_BASE = 30.0      # Seconds before the first retry; doubled on every further attempt
+OUTBOX_BACKOFF_MAX = 3600.0     # Longest wait between attempts
+OUTBOX_RETENTION_DAYS = 7       # Sent entries older than this are purged with the archival job
+
+# Email digests: due reminders for the same address are sent as one email
+EMAIL_DIGEST = True                # Set to False to always send one email per reminder
+EMAIL_DIGEST_WINDOW_SECONDS = 900  # Occurrences due within this span of each other share a digest
+EMAIL_DIGEST_MIN_ITEMS = 2         # Fewer reminders than this go out as ordinary emails
+
+# Rate-limited dispatch (token buckets): (sustained sends per second, burst size).
+# Set these to what your providers accept; channels / recipients not listed are not limited.
+DISPATCH_CHANNEL_RATES = {"email": (1.0, 10), "pushbullet": (1.0, 5)}
+DISPATCH_RECIPIENT_RATES = {"email": (0.5, 5)}  # Per email address
+DISPATCH_MAX_RECIPIENT_BUCKETS = 10000         # Idle per-recipient buckets are dropped beyond this
+
+# Claiming due reminders (several checker processes may share one database)
+CLAIM_BATCH_SIZE = 500      # Due reminders claimed per round trip
+CLAIM_LEASE_SECONDS = 300   # A claim held longer than this (crashed worker) can be taken over
+
+# Missed fires (reminders that came due while nothing was running)
+MISSED_FIRE_POLICY = "once"      # Default per-reminder policy: "once", "all" or "skip"
+MISSED_FIRE_GRACE_SECONDS = 300  # "skip" still sends a reminder that is at most this late
+LATE_DELIVERY_WARNING_SECONDS = 300  # Deliveries later than this are logged as warnings
+
+# Upcoming window (reminders due soon, kept in memory and updated incrementally)
+UPCOMING_WINDOW_HOURS = 24
+UPCOMING_SHADOW_TABLE = False  # Also mirror the window into the upcoming_window table for other processes
+
+# Recurrence rules ("every 2 weeks on mon,thu", "last fri of every month", ...)
+RECURRENCE_CACHE_SIZE = 1024  # Compiled rules kept, keyed by rule text
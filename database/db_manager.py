@@ -1,38 +1,276 @@
 # Database connection and query management
 
+import queue
 import sqlite3
-from config.settings import DB_NAME
-from typing import Tuple, List, Any
+import threading
+from contextlib import contextmanager
+from database.migrations import MigrationRunner
+from database.partitions import PartitionManager
+from config.settings import (
+    DB_NAME,
+    DB_READER_POOL_SIZE,
+    DB_BUSY_TIMEOUT,
+    DB_CACHE_SIZE_KB,
+    DB_MMAP_SIZE,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_ITER_BATCH_SIZE,
+    DB_PAGE_SIZE,
+    PARTITIONED_STORAGE,
+)
+from typing import Tuple, List, Any, Iterator, Optional
 
 
 class DBManager:
-    def __init__(self, db_name: str = DB_NAME, create_table: bool = True) -> None:
+    """
+    Owns the SQLite connections for a single database.
+
+    - One long-lived writer connection serializes every write behind a lock.
+    - A small pool of reader connections serves SELECTs concurrently (WAL mode).
+    - In-memory databases are private to one connection, so reads go through the writer.
+    - With `partitioned=True`, finished reminders live in per-month tables (see PartitionManager).
+    """
+
+    def __init__(self, db_name: str = DB_NAME, create_table: bool = True,
+                 reader_pool_size: int = DB_READER_POOL_SIZE, partitioned: bool = PARTITIONED_STORAGE) -> None:
         self.db_name = db_name
+        self.reader_pool_size = 0 if self.is_memory else reader_pool_size
+        self.partitions: Optional[PartitionManager] = PartitionManager(self) if partitioned else None
+
+        self._write_lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._savepoint_depth = 0
+
+        self._pool_lock = threading.Lock()
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        self._reader_count = 0
+
         if create_table:
             self.create_table()
 
-    @staticmethod
-    def create_table() -> None:
+    @property
+    def is_memory(self) -> bool:
+        """True when the database lives only in memory and cannot be shared between connections."""
+        return self.db_name in ("", ":memory:") or "mode=memory" in self.db_name
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """
+        Opens a connection bound to `self.db_name` and applies the tuning PRAGMAs.
+
+        Args:
+            read_only (bool): Whether the connection is a pooled reader.
+
+        Returns:
+            sqlite3.Connection: A connection in autocommit mode; transactions are explicit.
         """
-        Creates the 'reminders' table in the database if it doesn't exist.
+        conn = sqlite3.connect(
+            self.db_name,
+            timeout=DB_BUSY_TIMEOUT,
+            isolation_level=None,  # We issue BEGIN/COMMIT ourselves
+            check_same_thread=False,  # Guarded by the write lock / reader pool
+            cached_statements=DB_STATEMENT_CACHE_SIZE,
+            uri=self.db_name.startswith("file:"),
+        )
+        conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KB}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+
+        if not self.is_memory:
+            conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            # Only takes effect on a new database; see enable_incremental_vacuum for existing ones
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            if not self.is_memory:
+                conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        """Returns the writer connection, opening it on first use."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            return self._writer
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """Takes a reader from the pool, opening a new one while the pool is below its size."""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        self._get_writer()  # The writer creates the file and switches it to WAL first
+
+        with self._pool_lock:
+            if self._reader_count < self.reader_pool_size:
+                self._reader_count += 1
+                return self._connect(read_only=True)
+
+        return self._readers.get()  # Pool exhausted, wait for a reader to come back
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
         """
-        with sqlite3.connect(DB_NAME) as conn:
+        Lends a connection for read-only queries.
+
+        Yields:
+            sqlite3.Connection: A pooled reader, or the writer for in-memory databases.
+        """
+        if self.reader_pool_size == 0:
+            with self._write_lock:
+                yield self._get_writer()
+            return
+
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Runs the enclosed statements as one transaction on the writer connection.
+
+        Commits on success and rolls back if an exception escapes. Nested calls
+        become savepoints, so a failing inner block only undoes its own work.
+
+        Yields:
+            sqlite3.Cursor: A cursor on the writer connection.
+        """
+        with self._write_lock:
+            conn = self._get_writer()
             cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS reminders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    description TEXT NOT NULL,
-                    reminder_time DATETIME NOT NULL,
-                    email TEXT,
-                    recurrence TEXT DEFAULT 'none',
-                    notified INTEGER DEFAULT 0
-                )
-            """)
-            conn.commit()
-
-    @staticmethod
-    def fetch_all(query: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+
+            if conn.in_transaction:
+                self._savepoint_depth += 1
+                savepoint = f"sp_{self._savepoint_depth}"
+                conn.execute(f"SAVEPOINT {savepoint}")
+                try:
+                    yield cursor
+                except BaseException:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                    raise
+                else:
+                    conn.execute(f"RELEASE {savepoint}")
+                finally:
+                    self._savepoint_depth -= 1
+                    cursor.close()
+                return
+
+            # IMMEDIATE takes the write lock up front instead of upgrading mid-transaction
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def attached(self, path: str, schema: str) -> Iterator[sqlite3.Cursor]:
+        """
+        Attaches another database file to the writer for the duration of one transaction.
+
+        Args:
+            path (str): Database file to attach.
+            schema (str): Schema name the file is visible under.
+
+        Yields:
+            sqlite3.Cursor: A cursor inside the transaction.
+        """
+        with self._write_lock:
+            conn = self._get_writer()
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+            try:
+                with self.transaction() as cursor:
+                    yield cursor
+            finally:
+                conn.execute(f"DETACH DATABASE {schema}")
+
+    def data_version(self) -> int:
+        """
+        `PRAGMA data_version` of the writer connection: it changes whenever another
+        connection (or process) commits, but not for this manager's own writes.
+        """
+        with self._write_lock:
+            return self._get_writer().execute("PRAGMA data_version").fetchone()[0]
+
+    def incremental_vacuum(self) -> int:
+        """
+        Returns the free pages left behind by deletes to the filesystem.
+
+        Needs `auto_vacuum = INCREMENTAL`; on other databases this reclaims nothing.
+
+        Returns:
+            int: Bytes the main database file shrank by.
+        """
+        with self._write_lock:
+            conn = self._get_writer()
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            before = conn.execute("PRAGMA page_count").fetchone()[0]
+            conn.executescript("PRAGMA incremental_vacuum;")  # execute() would stop after the first page
+            after = conn.execute("PRAGMA page_count").fetchone()[0]
+            if not self.is_memory:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")  # Let the file itself shrink
+            return (before - after) * page_size
+
+    def enable_incremental_vacuum(self) -> bool:
+        """
+        Switches an existing database to `auto_vacuum = INCREMENTAL`.
+
+        This rewrites the whole file with VACUUM once, so run it off-peak.
+
+        Returns:
+            bool: True if the database was converted, False if it already was incremental.
+        """
+        with self._write_lock:
+            conn = self._get_writer()
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            return True
+
+    def range_source(self, start: Optional[int] = None, end: Optional[int] = None) -> str:
+        """
+        FROM-clause source for reminders firing in [start, end).
+
+        Without partitioning this is just `reminders`; otherwise the partition router
+        adds only the month partitions that overlap the range.
+        """
+        if self.partitions is None:
+            return "reminders"
+        return self.partitions.source(start, end)
+
+    def close(self) -> None:
+        """Closes the writer and every pooled reader connection."""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+        with self._pool_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._reader_count = 0
+
+    def create_table(self) -> None:
+        """
+        Creates the 'reminders' table if it doesn't exist and applies any pending schema migrations.
+        """
+        MigrationRunner(self).migrate()
+
+    def fetch_all(self, query: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
         """
         Executes a SELECT query and fetches all matching results.
 
@@ -44,16 +282,90 @@ class DBManager:
             List[Tuple[Any, ...]]: A list of tuples containing the fetched rows.
         """
         try:
-            with sqlite3.connect(DB_NAME) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                return cursor.fetchall()
+            with self.read() as conn:
+                return conn.execute(query, params).fetchall()
         except sqlite3.Error as e:
             print(f"❌ Database Error (fetch_all): {e}")
             return []
 
-    @staticmethod
-    def execute(query: str, params: Tuple[Any, ...] = ()) -> None:
+    def iter_query(self, query: str, params: Tuple[Any, ...] = (),
+                   batch_size: int = DB_ITER_BATCH_SIZE) -> Iterator[Tuple[Any, ...]]:
+        """
+        Lazily yields the rows of a SELECT query, `batch_size` rows at a time.
+
+        Only one batch is held in memory; the connection stays borrowed until the
+        iterator is exhausted or closed.
+
+        Args:
+            query (str): The SQL query to execute.
+            params (Tuple[Any, ...], optional): Parameters to use in the query.
+            batch_size (int, optional): Rows fetched per `fetchmany` call.
+
+        Yields:
+            Tuple[Any, ...]: One row at a time.
+        """
+        with self.read() as conn:
+            cursor = conn.execute(query, params)
+            try:
+                while rows := cursor.fetchmany(batch_size):
+                    yield from rows
+            finally:
+                cursor.close()
+
+    def paginate(self, columns: str, where: str = "", params: Tuple[Any, ...] = (),
+                 page_size: int = DB_PAGE_SIZE, source: str = "reminders") -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Lazily yields pages of reminders ordered by (fire_at, id) using keyset pagination.
+
+        Each page is an indexed range query that starts right after the last row of the
+        previous page, so deep pages cost the same as the first one and a page is only
+        queried when the caller asks for it.
+
+        Args:
+            columns (str): Comma-separated columns to select from `reminders`.
+            where (str, optional): Extra filter, e.g. "fire_at >= ? AND fire_at < ?".
+            params (Tuple[Any, ...], optional): Parameters for `where`.
+            page_size (int, optional): Rows per page.
+            source (str, optional): Table or subquery to read from (see `range_source`).
+
+        Yields:
+            List[Tuple[Any, ...]]: One page of rows with the requested columns.
+        """
+        last_key = None
+        while True:
+            conditions = [f"({where})"] if where else []
+            page_params = list(params)
+
+            if last_key is not None:
+                last_fire_at, last_id = last_key
+                if last_fire_at is None:  # NULLs sort first; finish them before moving on
+                    conditions.append("((fire_at IS NULL AND id > ?) OR fire_at IS NOT NULL)")
+                    page_params.append(last_id)
+                else:
+                    conditions.append("(fire_at, id) > (?, ?)")
+                    page_params.extend(last_key)
+
+            query = f"SELECT {columns}, fire_at, id FROM {source}"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += " ORDER BY fire_at, id LIMIT ?"
+
+            try:
+                with self.read() as conn:
+                    rows = conn.execute(query, (*page_params, page_size)).fetchall()
+            except sqlite3.Error as e:
+                print(f"❌ Database Error (paginate): {e}")
+                return
+
+            if not rows:
+                return
+            last_key = rows[-1][-2:]
+            yield [row[:-2] for row in rows]
+
+            if len(rows) < page_size:
+                return
+
+    def execute(self, query: str, params: Tuple[Any, ...] = ()) -> None:
         """
         Executes an INSERT, UPDATE, or DELETE query and commits the changes.
 
@@ -62,10 +374,8 @@ class DBManager:
             params (Tuple[Any, ...], optional): Parameters to use in the query.
         """
         try:
-            with sqlite3.connect(DB_NAME) as conn:
-                cursor = conn.cursor()
+            with self.transaction() as cursor:
                 cursor.execute(query, params)
-                conn.commit()
         except sqlite3.Error as e:
             print(f"❌ Database Error (execute): {e}")
 
@@ -78,4 +388,4 @@ class DBManager:
             notified (bool, optional): Whether the reminder has been notified. Defaults to True
         """
         query = "UPDATE reminders SET notified = ? WHERE id = ?"
-        self.execute(query, (int(notified), reminder_id))
\ No newline at end of file
+        self.execute(query, (int(notified), reminder_id))
@@ -0,0 +1,330 @@
+# Versioned schema migrations driven by PRAGMA user_version
+
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from config.settings import MIGRATION_BATCH_SIZE, MIGRATION_ESTIMATED_ROWS_PER_SECOND
+from utils.validation_utils import fold_title
+from typing import Any, Callable, List, Optional, Tuple
+
+
+# SQL expression turning a local 'YYYY-MM-DD HH:MM[:SS]' column into UTC epoch seconds
+FIRE_AT_SQL = "CAST(strftime('%s', {}, 'utc') AS INTEGER)"
+
+
+@dataclass
+class Backfill:
+    """
+    A batched UPDATE: `SET {assignments}` on every row of `table` matching `where`.
+
+    Rows are walked in id order, one short transaction per batch, so the write
+    lock is never held for longer than a single batch.
+    """
+    table: str
+    assignments: str
+    where: str
+
+
+@dataclass
+class Rewrite:
+    """
+    Per-row value changes worked out in Python: `plan(cursor)` returns (id, old value, new value)
+    for every row whose `column` in `table` changes. Dry runs count them; each is logged when applied.
+    """
+    table: str
+    column: str
+    plan: Callable[[sqlite3.Cursor], List[Tuple[int, Any, Any]]]
+
+
+def dedupe_titles(cursor: sqlite3.Cursor) -> List[Tuple[int, Any, Any]]:
+    """
+    Plans the title dedupe: the oldest of each case-insensitively equal title keeps it, the others
+    get " (<id>)" appended, or " (<id>-2)", " (<id>-3)", ... while that name is taken as well.
+    """
+    rows = cursor.execute("SELECT id, title FROM reminders ORDER BY id").fetchall()
+    taken = {fold_title(title) for _, title in rows}
+    kept, renames = set(), []
+    for row_id, title in rows:
+        if fold_title(title) not in kept:
+            kept.add(fold_title(title))
+            continue
+        new_title, attempt = f"{title} ({row_id})", 1
+        while fold_title(new_title) in taken:
+            attempt += 1
+            new_title = f"{title} ({row_id}-{attempt})"
+        taken.add(fold_title(new_title))
+        renames.append((row_id, title, new_title))
+    return renames
+
+
+@dataclass
+class Migration:
+    """
+    One ordered schema step.
+
+    - `add_columns`: (table, column, declaration) tuples, skipped when the column already exists.
+    - `statements`: idempotent DDL run in one transaction before the backfill.
+    - `rewrite`: optional per-row changes applied right after `statements`.
+    - `backfill`: optional batched data migration.
+    - `finalize`: idempotent DDL run after the backfill (e.g. indexes over the new data).
+    """
+    version: int
+    description: str
+    add_columns: List[Tuple[str, str, str]] = field(default_factory=list)
+    statements: List[str] = field(default_factory=list)
+    rewrite: Optional[Rewrite] = None
+    backfill: Optional[Backfill] = None
+    finalize: List[str] = field(default_factory=list)
+
+
+@dataclass
+class MigrationReport:
+    """Outcome (or dry-run estimate) of a single migration step."""
+    version: int
+    description: str
+    rows: int
+    seconds: float
+    dry_run: bool
+
+    def __str__(self) -> str:
+        verb = "would touch" if self.dry_run else "touched"
+        timing = "est." if self.dry_run else "took"
+        return f"v{self.version} {self.description}: {verb} {self.rows} rows, {timing} {self.seconds:.2f}s"
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="Create reminders table",
+        statements=["""
+            CREATE TABLE IF NOT EXISTS reminders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                reminder_time DATETIME NOT NULL,
+                email TEXT,
+                recurrence TEXT DEFAULT 'none',
+                notified INTEGER DEFAULT 0
+            )
+        """],
+    ),
+    Migration(
+        version=2,
+        description="Add integer fire_at column with due/cleanup/range indexes",
+        add_columns=[("reminders", "fire_at", "INTEGER")],
+        backfill=Backfill(
+            table="reminders",
+            assignments=f"fire_at = {FIRE_AT_SQL.format('reminder_time')}",
+            where="fire_at IS NULL",
+        ),
+        finalize=[
+            # Writers that only set reminder_time get fire_at filled in for them;
+            # writers that set both (bulk inserts, recurrence updates) skip the extra UPDATE.
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_reminders_fire_at_insert
+            AFTER INSERT ON reminders WHEN NEW.fire_at IS NULL
+            BEGIN
+                UPDATE reminders SET fire_at = {FIRE_AT_SQL.format('NEW.reminder_time')} WHERE id = NEW.id;
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_reminders_fire_at_update
+            AFTER UPDATE OF reminder_time ON reminders WHEN NEW.fire_at IS OLD.fire_at
+            BEGIN
+                UPDATE reminders SET fire_at = {FIRE_AT_SQL.format('NEW.reminder_time')} WHERE id = NEW.id;
+            END
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_reminders_due ON reminders (notified, fire_at)",
+            "CREATE INDEX IF NOT EXISTS idx_reminders_recurrence_due ON reminders (recurrence, notified, fire_at)",
+            "CREATE INDEX IF NOT EXISTS idx_reminders_fire_at ON reminders (fire_at)",
+        ],
+    ),
+    Migration(
+        version=3,
+        description="Enforce case-insensitive unique titles",
+        # Older databases may already hold duplicates; keep the first and rename the rest
+        rewrite=Rewrite("reminders", "title", dedupe_titles),
+        finalize=["CREATE UNIQUE INDEX IF NOT EXISTS idx_reminders_title_nocase ON reminders (title COLLATE NOCASE)"],
+    ),
+    Migration(
+        version=4,
+        description="Add claimed_by / lease_until for multi-process claiming",
+        add_columns=[("reminders", "claimed_by", "TEXT"), ("reminders", "lease_until", "INTEGER")],
+    ),
+    Migration(
+        version=5,
+        description="Add per-reminder missed_fire_policy",
+        add_columns=[("reminders", "missed_fire_policy", "TEXT NOT NULL DEFAULT 'once'")],
+    ),
+    Migration(
+        version=6,
+        description="Create the delivery outbox",
+        statements=[
+            # One row per (occurrence, channel, recipient); the unique key makes re-enqueueing a no-op
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                reminder_id INTEGER NOT NULL,
+                occurrence TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                recipient TEXT NOT NULL DEFAULT '',
+                title TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at INTEGER NOT NULL,
+                claimed_by TEXT,
+                lease_until INTEGER,
+                last_error TEXT,
+                created_at INTEGER NOT NULL,
+                sent_at INTEGER,
+                UNIQUE (reminder_id, occurrence, channel, recipient)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_outbox_ready ON outbox (status, next_attempt_at)",
+        ],
+    ),
+    Migration(
+        version=7,
+        description="Add urgent reminders and per-address email digest preferences",
+        add_columns=[("reminders", "urgent", "INTEGER NOT NULL DEFAULT 0"),
+                     ("outbox", "urgent", "INTEGER NOT NULL DEFAULT 0")],
+        statements=["""
+            CREATE TABLE IF NOT EXISTS email_preferences (
+                email TEXT PRIMARY KEY COLLATE NOCASE,
+                digest INTEGER NOT NULL DEFAULT 1,
+                urgent_separately INTEGER NOT NULL DEFAULT 0
+            )
+        """],
+    ),
+]
+
+
+class MigrationRunner:
+    """Applies pending migrations in version order and records progress in `PRAGMA user_version`."""
+
+    def __init__(self, db_manager: Any, migrations: Optional[List[Migration]] = None,
+                 batch_size: int = MIGRATION_BATCH_SIZE) -> None:
+        """
+        Args:
+            db_manager (Any): The DBManager whose database is migrated.
+            migrations (Optional[List[Migration]]): Steps to apply. Defaults to `MIGRATIONS`.
+            batch_size (int): Rows per backfill transaction.
+        """
+        self.db_manager = db_manager
+        self.migrations = sorted(migrations if migrations is not None else MIGRATIONS, key=lambda m: m.version)
+        self.batch_size = batch_size
+
+    def current_version(self) -> int:
+        """Returns the schema version stored in the database."""
+        with self.db_manager.read() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def pending(self) -> List[Migration]:
+        """Returns the migrations newer than the database's current version."""
+        version = self.current_version()
+        return [m for m in self.migrations if m.version > version]
+
+    def migrate(self, dry_run: bool = False, verbose: bool = False) -> List[MigrationReport]:
+        """
+        Applies every pending migration, or only estimates them when `dry_run` is set.
+
+        Args:
+            dry_run (bool): Report estimated rows and duration without changing anything.
+            verbose (bool): Print one line per step.
+
+        Returns:
+            List[MigrationReport]: One report per pending migration.
+        """
+        reports = []
+        for migration in self.pending():
+            if dry_run:
+                rows = self._estimate_rows(migration)
+                report = MigrationReport(migration.version, migration.description, rows,
+                                         rows / MIGRATION_ESTIMATED_ROWS_PER_SECOND, dry_run=True)
+            else:
+                started = time.perf_counter()
+                rows = self._apply(migration, verbose)
+                report = MigrationReport(migration.version, migration.description, rows,
+                                         time.perf_counter() - started, dry_run=False)
+            if verbose:
+                print(f"🛠️ {report}")
+            reports.append(report)
+        return reports
+
+    def _apply(self, migration: Migration, verbose: bool = False) -> int:
+        """Runs one migration end to end and returns the number of rewritten and backfilled rows."""
+        with self.db_manager.transaction() as cursor:
+            for table, column, declaration in migration.add_columns:
+                if column not in self._columns(cursor, table):
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+            for statement in migration.statements:
+                cursor.execute(statement)
+            changes = migration.rewrite.plan(cursor) if migration.rewrite else []
+            for row_id, old, new in changes:
+                message = f"v{migration.version}: {migration.rewrite.table} {row_id} {migration.rewrite.column} '{old}' -> '{new}'"
+                logging.warning(f"Migration {message}")
+                if verbose:
+                    print(f"✏️ {message}")
+                cursor.execute(f"UPDATE {migration.rewrite.table} SET {migration.rewrite.column} = ? WHERE id = ?",
+                               (new, row_id))
+
+        rows = len(changes) + (self._run_backfill(migration.backfill) if migration.backfill else 0)
+
+        with self.db_manager.transaction() as cursor:
+            for statement in migration.finalize:
+                cursor.execute(statement)
+            cursor.execute(f"PRAGMA user_version = {int(migration.version)}")
+
+        return rows
+
+    def _run_backfill(self, backfill: Backfill) -> int:
+        """Walks the table in id order, updating one bounded batch per transaction."""
+        last_id = 0
+        total = 0
+        while True:
+            with self.db_manager.transaction() as cursor:
+                ids = cursor.execute(
+                    f"SELECT id FROM {backfill.table} WHERE id > ? AND ({backfill.where}) ORDER BY id LIMIT ?",
+                    (last_id, self.batch_size),
+                ).fetchall()
+                if not ids:
+                    return total
+                cursor.execute(
+                    f"UPDATE {backfill.table} SET {backfill.assignments} "
+                    f"WHERE id BETWEEN ? AND ? AND ({backfill.where})",
+                    (ids[0][0], ids[-1][0]),
+                )
+                total += cursor.rowcount
+                last_id = ids[-1][0]
+
+    def _estimate_rows(self, migration: Migration) -> int:
+        """Counts the rows a migration's rewrite would change plus those its backfill would touch."""
+        changed = 0
+        if migration.rewrite:
+            try:
+                with self.db_manager.read() as conn:
+                    changed = len(migration.rewrite.plan(conn.cursor()))
+            except sqlite3.OperationalError:
+                pass  # Table does not exist yet
+        if migration.backfill is None:
+            return changed
+        return changed + self._estimate_backfill(migration)
+
+    def _estimate_backfill(self, migration: Migration) -> int:
+        """Counts the rows a migration's backfill would touch."""
+        backfill = migration.backfill
+        try:
+            with self.db_manager.read() as conn:
+                columns = self._columns(conn.cursor(), backfill.table)
+                new_columns = [column for table, column, _ in migration.add_columns if table == backfill.table]
+                if any(column not in columns for column in new_columns):
+                    return conn.execute(f"SELECT COUNT(*) FROM {backfill.table}").fetchone()[0]
+                return conn.execute(f"SELECT COUNT(*) FROM {backfill.table} WHERE {backfill.where}").fetchone()[0]
+        except sqlite3.OperationalError:
+            return 0  # Table does not exist yet
+
+    @staticmethod
+    def _columns(cursor: sqlite3.Cursor, table: str) -> set[str]:
+        """Returns the column names of `table` (empty if it doesn't exist)."""
+        return {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
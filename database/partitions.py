@@ -0,0 +1,227 @@
+# Time-partitioned storage for finished reminders
+
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+from datetime import datetime
+from config.settings import PARTITION_DIR, PARTITION_CHUNK_SIZE
+from utils.time_utils import from_epoch, to_epoch
+from typing import Any, List, Optional, Tuple
+
+
+# Columns shared by the active table and every partition, in union order, with their partition DDL.
+# A column added to `reminders` by a migration belongs here too, or rotation would drop it.
+PARTITION_SCHEMA = [
+    ("id", "INTEGER PRIMARY KEY"),
+    ("title", "TEXT NOT NULL"),
+    ("description", "TEXT NOT NULL"),
+    ("reminder_time", "DATETIME NOT NULL"),
+    ("email", "TEXT"),
+    ("recurrence", "TEXT DEFAULT 'none'"),
+    ("notified", "INTEGER DEFAULT 0"),
+    ("fire_at", "INTEGER"),
+    ("missed_fire_policy", "TEXT NOT NULL DEFAULT 'once'"),
+    ("urgent", "INTEGER NOT NULL DEFAULT 0"),
+]
+PARTITION_COLUMNS = ", ".join(name for name, _ in PARTITION_SCHEMA)
+
+PARTITION_PATTERN = re.compile(r"^reminders_(\d{4})_(\d{2})$")
+
+
+def partition_table(moment: datetime) -> str:
+    """Name of the month partition a local time belongs to, e.g. reminders_2025_06."""
+    return f"reminders_{moment.year:04d}_{moment.month:02d}"
+
+
+def partition_bounds(table: str) -> Tuple[int, int]:
+    """
+    Epoch bounds [start, end) covered by a month partition.
+
+    Args:
+        table (str): Partition table name.
+
+    Returns:
+        Tuple[int, int]: First second of the month and first second of the next month.
+    """
+    year, month = (int(part) for part in PARTITION_PATTERN.match(table).groups())
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return to_epoch(start), to_epoch(end)
+
+
+class PartitionManager:
+    """
+    Keeps the active `reminders` table small by moving finished reminders into per-month tables.
+
+    - Only notified one-time reminders are moved, so due and upcoming scans only ever
+      need the active table and their cost follows the active window, not total history.
+    - Month, year and date views are routed to the active table plus the overlapping months.
+    - Cold months can be detached into standalone (optionally gzipped) files and reattached later.
+    """
+
+    def __init__(self, db_manager: Any, directory: str = PARTITION_DIR) -> None:
+        """
+        Args:
+            db_manager (Any): The DBManager owning the active table.
+            directory (str): Where detached partitions are written.
+        """
+        self.db_manager = db_manager
+        self.directory = directory
+
+    def partitions(self) -> List[str]:
+        """Returns the month partitions present in the database, oldest first."""
+        rows = self.db_manager.fetch_all(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB 'reminders_[0-9]*_[0-9]*' ORDER BY name"
+        )
+        return [row[0] for row in rows if PARTITION_PATTERN.match(row[0])]
+
+    @staticmethod
+    def _ensure_partition(cursor: sqlite3.Cursor, table: str, schema: str = "main") -> None:
+        """
+        Creates a month partition (same columns as the active table) if needed, and adds
+        the columns a partition written by an older version is missing.
+        """
+        columns = ",\n                ".join(f"{name} {ddl}" for name, ddl in PARTITION_SCHEMA)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {schema}.{table} (
+                {columns}
+            )
+        """)
+        present = {row[1] for row in cursor.execute(f"PRAGMA {schema}.table_info({table})")}
+        for name, ddl in PARTITION_SCHEMA:
+            if name not in present:
+                cursor.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN {name} {ddl}")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_fire_at ON {table} (fire_at)")
+        # Titles stay taken while their reminder is kept (see ReminderManager.title_exists)
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_title ON {table} (title COLLATE NOCASE)")
+
+    def rotate(self, before: int, chunk_size: int = PARTITION_CHUNK_SIZE) -> int:
+        """
+        Moves notified one-time reminders that fired before `before` into their month partitions.
+
+        Works in bounded chunks, one short transaction each, so the checker is never blocked for long.
+
+        Args:
+            before (int): Epoch cutoff; only reminders with fire_at < before are moved.
+            chunk_size (int): Rows moved per transaction.
+
+        Returns:
+            int: Number of reminders moved.
+        """
+        moved = 0
+        while True:
+            with self.db_manager.transaction() as cursor:
+                rows = cursor.execute("""
+                    SELECT id, fire_at FROM reminders
+                    WHERE recurrence = 'none' AND notified = 1 AND fire_at < ?
+                    ORDER BY fire_at LIMIT ?
+                """, (before, chunk_size)).fetchall()
+                if not rows:
+                    return moved
+
+                by_table: dict[str, List[int]] = {}
+                for reminder_id, fire_at in rows:
+                    by_table.setdefault(partition_table(from_epoch(fire_at)), []).append(reminder_id)
+
+                for table, ids in by_table.items():
+                    self._ensure_partition(cursor, table)
+                    placeholders = ", ".join("?" * len(ids))
+                    cursor.execute(
+                        f"INSERT OR IGNORE INTO {table} ({PARTITION_COLUMNS}) "
+                        f"SELECT {PARTITION_COLUMNS} FROM reminders WHERE id IN ({placeholders})", ids)
+                    cursor.execute(f"DELETE FROM reminders WHERE id IN ({placeholders})", ids)
+
+                moved += len(rows)
+
+    def route(self, start: Optional[int] = None, end: Optional[int] = None) -> List[str]:
+        """
+        Tables that can hold reminders firing in [start, end).
+
+        Args:
+            start (Optional[int]): Inclusive lower bound (epoch seconds), None for unbounded.
+            end (Optional[int]): Exclusive upper bound (epoch seconds), None for unbounded.
+
+        Returns:
+            List[str]: The active table followed by every overlapping month partition.
+        """
+        tables = ["reminders"]
+        for table in self.partitions():
+            month_start, month_end = partition_bounds(table)
+            if (end is None or month_start < end) and (start is None or month_end > start):
+                tables.append(table)
+        return tables
+
+    def source(self, start: Optional[int] = None, end: Optional[int] = None) -> str:
+        """
+        FROM-clause source covering [start, end): the active table alone, or a UNION ALL
+        of it and the overlapping partitions (filters are pushed down into each arm).
+        """
+        tables = self.route(start, end)
+        if len(tables) == 1:
+            return "reminders"
+        union = " UNION ALL ".join(f"SELECT {PARTITION_COLUMNS} FROM {table}" for table in tables)
+        return f"({union})"
+
+    def detach(self, table: str, compress: bool = False) -> str:
+        """
+        Moves a cold month partition out of the live database into its own file.
+
+        Args:
+            table (str): Partition to detach, e.g. reminders_2024_01.
+            compress (bool): Gzip the detached file.
+
+        Returns:
+            str: Path of the written file.
+        """
+        if not PARTITION_PATTERN.match(table):
+            raise ValueError(f"'{table}' is not a month partition.")
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{table}.db")
+
+        with self.db_manager.attached(path, "cold") as cursor:
+            self._ensure_partition(cursor, table, schema="cold")
+            cursor.execute(f"INSERT OR IGNORE INTO cold.{table} ({PARTITION_COLUMNS}) "
+                           f"SELECT {PARTITION_COLUMNS} FROM main.{table}")
+            cursor.execute(f"DROP TABLE main.{table}")
+
+        if compress:
+            with open(path, "rb") as source, gzip.open(f"{path}.gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(path)
+            path = f"{path}.gz"
+
+        return path
+
+    def reattach(self, path: str) -> str:
+        """
+        Loads a detached (optionally gzipped) partition file back into the live database.
+
+        Args:
+            path (str): File written by `detach`.
+
+        Returns:
+            str: Name of the restored partition table.
+        """
+        table = os.path.basename(path).removesuffix(".gz").removesuffix(".db")
+        if not PARTITION_PATTERN.match(table):
+            raise ValueError(f"'{path}' is not a detached month partition.")
+
+        db_path = path
+        if path.endswith(".gz"):
+            db_path = path.removesuffix(".gz")
+            with gzip.open(path, "rb") as source, open(db_path, "wb") as target:
+                shutil.copyfileobj(source, target)
+
+        with self.db_manager.attached(db_path, "cold") as cursor:
+            self._ensure_partition(cursor, table)
+            self._ensure_partition(cursor, table, schema="cold")  # A file detached by an older version
+            cursor.execute(f"INSERT OR IGNORE INTO main.{table} ({PARTITION_COLUMNS}) "
+                           f"SELECT {PARTITION_COLUMNS} FROM cold.{table}")
+
+        os.remove(db_path)
+        if db_path != path:
+            os.remove(path)
+        return table
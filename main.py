@@ -1,14 +1,335 @@
 # Entry point of an application
 
+import argparse
+import asyncio
+import sys
 from views.cli_menu import ShowMenu
+from database.db_manager import DBManager
+from database.migrations import MigrationRunner
+from services.reminder_manager import ReminderManager
+from services.import_service import import_reminders, IMPORT_FORMATS
+from services.export_service import export_reminders, EXPORT_FORMATS
+from config.settings import (
+    IMPORT_CHUNK_SIZE,
+    PARTITION_ACTIVE_DAYS,
+    ARCHIVE_RETENTION_DAYS,
+    ARCHIVE_CHUNK_SIZE,
+    DAEMON_PIDFILE,
+    DAEMON_HEARTBEAT_FILE,
+    DAEMON_HEARTBEAT_INTERVAL,
+    OUTBOX_WORKERS,
+)
+from services.scheduler_service import ReminderScheduler
+from services.daemon import ReminderDaemon
+from services.async_scheduler import AsyncReminderScheduler
+from services.simulation import Simulation
+from services.notification_service import NotificationService
+from services.outbox import Outbox, OutboxWorker
+from services.digest import DigestCoalescer
+from database.partitions import PartitionManager
+from utils.time_utils import day_range, to_epoch
+from datetime import datetime, timedelta
+from typing import Optional, List
 
 
-def main() -> None:
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser. Without a command the interactive menu starts."""
+
+    parser = argparse.ArgumentParser(description="Reminder Notification Application")
+    commands = parser.add_subparsers(dest="command")
+
+    migrate = commands.add_parser("migrate", help="Apply pending database schema migrations")
+    migrate.add_argument("--dry-run", action="store_true", help="Only report estimated rows and duration per step")
+
+    importer = commands.add_parser("import", help="Bulk-import reminders from a CSV or JSONL file")
+    importer.add_argument("path", help="Input file")
+    importer.add_argument("--format", choices=IMPORT_FORMATS, help="Input format (default: from file extension)")
+    importer.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per transaction")
+    importer.add_argument("--errors", help="Write rejected rows to this CSV file (default: <path>.errors.csv)")
+
+    exporter = commands.add_parser("export", help="Stream reminders to a CSV, JSONL or iCalendar file")
+    exporter.add_argument("path", help="Output file (append .gz to compress)")
+    exporter.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from file extension)")
+    exporter.add_argument("--from", dest="date_from", help="First day to include (YYYY-MM-DD)")
+    exporter.add_argument("--to", dest="date_to", help="Last day to include (YYYY-MM-DD)")
+    exporter.add_argument("--notified", choices=("yes", "no"), help="Only notified / only pending reminders")
+    exporter.add_argument("--gzip", action="store_true", help="Gzip-compress the output")
+
+    partitions = commands.add_parser("partitions", help="Manage month partitions of finished reminders")
+    actions = partitions.add_subparsers(dest="action", required=True)
+    actions.add_parser("list", help="List month partitions and their row counts")
+    rotate = actions.add_parser("rotate", help="Move finished one-time reminders into month partitions")
+    rotate.add_argument("--days", type=int, default=PARTITION_ACTIVE_DAYS,
+                        help="Keep reminders that fired within this many days in the active table")
+    detach = actions.add_parser("detach", help="Move a month partition out into its own file")
+    detach.add_argument("table", help="Partition name, e.g. reminders_2024_01")
+    detach.add_argument("--gzip", action="store_true", help="Gzip-compress the detached file")
+    reattach = actions.add_parser("reattach", help="Load a detached partition file back")
+    reattach.add_argument("path", help="File written by 'partitions detach'")
+
+    archive = commands.add_parser("archive", help="Archive finished reminders and shrink the database file")
+    archive.add_argument("--days", type=int, default=ARCHIVE_RETENTION_DAYS,
+                         help="Archive notified one-time reminders older than this many days")
+    archive.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE, help="Rows per transaction")
+    archive.add_argument("--enable-vacuum", action="store_true",
+                         help="First convert an existing database to incremental vacuum (rewrites the file once)")
+
+    check = commands.add_parser("check", help="Run the reminder checker without the menu")
+    check.add_argument("--async", dest="use_async", action="store_true",
+                       help="Deliver due reminders concurrently on an asyncio event loop")
+    check.add_argument("--interval", type=int, default=10, help="Seconds between checks")
+    check.add_argument("--max-checks", type=int, default=2, help="Stop after this many checks")
+    check.add_argument("--minutes", type=float, default=1, help="Stop after this many minutes")
+
+    daemon = commands.add_parser("daemon", help="Deliver reminders until SIGTERM / SIGINT")
+    daemon.add_argument("--pidfile", default=DAEMON_PIDFILE, help="PID file path")
+    daemon.add_argument("--heartbeat", default=DAEMON_HEARTBEAT_FILE, help="Heartbeat (JSON status) file path")
+    daemon.add_argument("--heartbeat-interval", type=float, default=DAEMON_HEARTBEAT_INTERVAL,
+                        help="Seconds between heartbeats")
+
+    simulate = commands.add_parser("simulate", help="Replay generated reminders on a simulated clock and report misses")
+    simulate.add_argument("--reminders", type=int, default=100, help="Reminders to generate")
+    simulate.add_argument("--days", type=float, default=365, help="Simulated days")
+    simulate.add_argument("--interval", type=float, default=60, help="Seconds between checks")
+    simulate.add_argument("--seed", type=int, default=0, help="Random seed for the generated reminders")
+    simulate.add_argument("--pushbullet", action="store_true", help="Simulate a configured Pushbullet key")
+
+    outbox = commands.add_parser("outbox", help="Inspect, drain or replay the delivery outbox")
+    outbox_actions = outbox.add_subparsers(dest="action", required=True)
+    outbox_actions.add_parser("status", help="Show queue depth, retries and dead-lettered sends")
+    work = outbox_actions.add_parser("work", help="Send queued deliveries until Ctrl+C")
+    work.add_argument("--workers", type=int, default=OUTBOX_WORKERS, help="Sends in flight at once")
+    work.add_argument("--once", action="store_true", help="Send what is ready now, then exit")
+    replay = outbox_actions.add_parser("replay", help="Queue dead-lettered (or sent) deliveries again")
+    replay.add_argument("--sent", action="store_true", help="Replay sent deliveries instead of dead-lettered ones")
+    replay.add_argument("--since", metavar="YYYY-MM-DD", help="Only deliveries queued on or after this day")
+    replay.add_argument("--reminder", type=int, help="Only deliveries of this reminder ID")
+
+    prefs = commands.add_parser("email-prefs", help="Show or change the email digest preferences of an address")
+    prefs.add_argument("email", help="Email address")
+    prefs.add_argument("--digest", choices=["on", "off"], help="Coalesce due reminders into digest emails")
+    prefs.add_argument("--urgent", choices=["separate", "digest"],
+                       help="Send urgent reminders on their own, or include them in digests")
+
+    return parser
+
+
+def run_migrations(dry_run: bool) -> None:
+    """Apply (or estimate) pending schema migrations on the configured database."""
+
+    db_manager = DBManager(create_table=False)
+    runner = MigrationRunner(db_manager)
+    print(f"📦 Schema version: {runner.current_version()}")
+
+    reports = runner.migrate(dry_run=dry_run, verbose=True)
+    if not reports:
+        print("✅ Database schema is up to date.")
+    db_manager.close()
+
+
+def run_import(path: str, file_format: Optional[str], chunk_size: int, errors_path: Optional[str]) -> None:
+    """Bulk-import reminders from a file and print the throughput and rejected-row summary."""
+
+    db_manager = DBManager()
+    errors_path = errors_path or f"{path}.errors.csv"
+    report = import_reminders(ReminderManager(db_manager), path, file_format, chunk_size, errors_path)
+
+    print(f"✅ {report}")
+    if report.errors:
+        print(f"⚠️ Rejected rows written to {errors_path}")
+    db_manager.close()
+
+
+def run_export(args: argparse.Namespace) -> None:
+    """Stream the selected reminders into a file."""
+
+    start = day_range(args.date_from)[0] if args.date_from else None
+    end = day_range(args.date_to)[1] if args.date_to else None
+    notified = None if args.notified is None else args.notified == "yes"
+
+    db_manager = DBManager()
+    count = export_reminders(db_manager, args.path, args.format, start, end, notified, args.gzip or None)
+    print(f"✅ Exported {count} reminders to {args.path}")
+    db_manager.close()
+
+
+def run_partitions(args: argparse.Namespace) -> None:
+    """List, rotate, detach or reattach month partitions."""
+
+    db_manager = DBManager()
+    partitions = PartitionManager(db_manager)
+
+    if args.action == "list":
+        tables = partitions.partitions()
+        for table in tables:
+            count = db_manager.fetch_all(f"SELECT COUNT(*) FROM {table}")[0][0]
+            print(f"  {table}: {count} reminders")
+        if not tables:
+            print("📭 No month partitions yet.")
+
+    elif args.action == "rotate":
+        moved = partitions.rotate(to_epoch(datetime.now() - timedelta(days=args.days)))
+        print(f"✅ Moved {moved} finished reminders into month partitions.")
+
+    elif args.action == "detach":
+        print(f"✅ Detached {args.table} to {partitions.detach(args.table, args.gzip)}")
+
+    elif args.action == "reattach":
+        print(f"✅ Reattached {partitions.reattach(args.path)}")
+
+    db_manager.close()
+
+
+def run_checker(args: argparse.Namespace) -> None:
+    """Run the (sync or asyncio) reminder checker headless."""
+
+    db_manager = DBManager()
+    scheduler = ReminderScheduler(db_manager)
+    if args.use_async:
+        checker = AsyncReminderScheduler(scheduler)
+        try:
+            asyncio.run(checker.run_reminder_checker(args.interval, args.max_checks, args.minutes))
+        finally:
+            checker.close()
+    else:
+        scheduler.run_reminder_checker(args.interval, args.max_checks, args.minutes)
+    scheduler.close()
+    if scheduler.notification_service is not None:
+        scheduler.notification_service.close()
+    db_manager.close()
+
+
+def run_outbox(args: argparse.Namespace) -> None:
+    """Show outbox metrics, drain the outbox or replay dead-lettered deliveries."""
+
+    db_manager = DBManager()
+    outbox = Outbox(db_manager)
+
+    if args.action == "status":
+        print(f"📬 {outbox.metrics()}")
+
+    elif args.action == "work":
+        notification_service = NotificationService(db_manager)
+        worker = OutboxWorker(outbox, notification_service, workers=args.workers)
+        try:
+            if args.once:
+                print(f"✅ Processed {worker.drain()} outbox entries.")
+            else:
+                print("📬 Outbox worker started (Ctrl+C to stop).")
+                worker.run()
+        except KeyboardInterrupt:
+            print("\n🛑 Outbox worker stopped.")
+        finally:
+            worker.close()
+            notification_service.close()
+        print(f"📬 {worker.stats.sent} sent, {worker.stats.retried} rescheduled, "
+              f"{worker.stats.dead_lettered} dead-lettered")
+
+    elif args.action == "replay":
+        since = day_range(args.since)[0] if args.since else None
+        replayed = outbox.replay("sent" if args.sent else "dead", since, args.reminder)
+        print(f"✅ Queued {replayed} deliveries again.")
+
+    db_manager.close()
+
+
+def run_email_prefs(args: argparse.Namespace) -> None:
+    """Update (when options are given) and print the digest preferences of one address."""
+
+    db_manager = DBManager()
+    coalescer = DigestCoalescer(db_manager)
+    if args.digest is None and args.urgent is None:
+        preferences = coalescer.preferences([args.email])[args.email]
+    else:
+        preferences = coalescer.set_preferences(
+            args.email,
+            digest=None if args.digest is None else args.digest == "on",
+            urgent_separately=None if args.urgent is None else args.urgent == "separate")
+    print(f"📨 {args.email}: digests {'on' if preferences.digest else 'off'}, urgent reminders "
+          f"{'sent separately' if preferences.urgent_separately else 'included in digests'}")
+    db_manager.close()
+
+
+def run_archive(args: argparse.Namespace) -> None:
+    """Run the archival job once and print the rows and bytes reclaimed."""
+
+    db_manager = DBManager()
+    if args.enable_vacuum and db_manager.enable_incremental_vacuum():
+        print("✅ Database switched to incremental vacuum.")
+
+    report = ReminderScheduler(db_manager).clean_old_reminders(args.days, args.chunk_size)
+    print(f"✅ {report}")
+    db_manager.close()
+
+
+def run_simulation(args: argparse.Namespace) -> bool:
+    """Fast-forward a generated schedule and print lateness, duplicates and missed fires."""
+
+    simulation = Simulation(args.reminders, args.days, args.interval, args.seed, pushbullet=args.pushbullet)
+    try:
+        report = simulation.run()
+    finally:
+        simulation.close()
+
+    print(f"{'✅' if report.ok else '❌'} {report}")
+    for reminder_id, occurrence in report.missed_examples:
+        print(f"  - missed reminder {reminder_id} at {occurrence}")
+    return report.ok
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Initialize and start the application."""
 
+    args = build_parser().parse_args(argv or [])
+
+    if args.command == "migrate":
+        run_migrations(args.dry_run)
+        return
+
+    if args.command == "import":
+        run_import(args.path, args.format, args.chunk_size, args.errors)
+        return
+
+    if args.command == "export":
+        run_export(args)
+        return
+
+    if args.command == "partitions":
+        run_partitions(args)
+        return
+
+    if args.command == "archive":
+        run_archive(args)
+        return
+
+    if args.command == "check":
+        run_checker(args)
+        return
+
+    if args.command == "outbox":
+        run_outbox(args)
+        return
+
+    if args.command == "email-prefs":
+        run_email_prefs(args)
+        return
+
+    if args.command == "simulate":
+        if not run_simulation(args):
+            sys.exit(1)
+        return
+
+    if args.command == "daemon":
+        try:
+            ReminderDaemon(pidfile=args.pidfile, heartbeat_file=args.heartbeat,
+                           heartbeat_interval=args.heartbeat_interval).run()
+        except RuntimeError as e:
+            print(f"❌ {e}")
+        return
+
     app = ShowMenu()
     app.menu()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])
@@ -0,0 +1,101 @@
+# asyncio front end for the notification channels
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from config.settings import ASYNC_CHANNEL_LIMITS
+from services.digest import Digest
+from services.fanout import ChannelResult, ReminderDelivery
+from services.notification_service import NotificationService
+from typing import Any, Callable, Dict, Optional
+
+
+class AsyncNotificationService:
+    """
+    Sends notifications from coroutines without letting one slow channel hold up the others.
+
+    - Each channel (desktop, email, pushbullet) has its own semaphore and thread pool sized
+      to its limit in ASYNC_CHANNEL_LIMITS, so a slow SMTP login only queues other emails.
+    - The blocking senders of NotificationService do the actual work; any number of
+      deliveries can be awaiting a slot while only `limit` run per channel.
+    """
+
+    def __init__(self, notification_service: NotificationService,
+                 channel_limits: Optional[Dict[str, int]] = None) -> None:
+        """
+        Args:
+            notification_service (NotificationService): Provides the blocking channel senders.
+            channel_limits (Optional[Dict[str, int]]): Concurrent sends per channel.
+        """
+        self.notification_service = notification_service
+        self.channel_limits = {**ASYNC_CHANNEL_LIMITS, **(channel_limits or {})}
+        self.in_flight = 0  # Deliveries started and not yet finished
+
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._executors = {
+            channel: ThreadPoolExecutor(max_workers=limit, thread_name_prefix=f"notify-{channel}")
+            for channel, limit in self.channel_limits.items()
+        }
+
+    async def _send(self, channel: str, sender: Callable[..., Any], *args: Any) -> Any:
+        """Runs a blocking sender on its channel's pool once a channel slot is free."""
+        semaphore = self._semaphores.setdefault(channel, asyncio.Semaphore(self.channel_limits[channel]))
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executors[channel], partial(sender, *args))
+
+    async def send_desktop_notification(self, title: str, message: str) -> bool:
+        return await self._send("desktop", self.notification_service.send_desktop_notification, title, message)
+
+    async def send_email_notification(self, recipient_email: Optional[str], subject: str, message: str) -> bool:
+        return await self._send("email", self.notification_service.send_email_notification,
+                                recipient_email, subject, message)
+
+    async def send_pushbullet_notification(self, title: str, message: str) -> bool:
+        return await self._send("pushbullet", self.notification_service.send_pushbullet_notification, title, message)
+
+    async def send_digest(self, digest: Digest) -> bool:
+        return await self._send("email", self.notification_service.send_digest, digest)
+
+    async def check_reminder(self, reminder: Dict[str, Any]) -> ReminderDelivery:
+        """
+        Sends one due reminder on every configured channel concurrently. The message and
+        the channels come from NotificationService (`compose`, `channels_for`), as for the
+        blocking checker.
+
+        The caller records the state transition (see AsyncReminderScheduler), as with
+        `NotificationService.check_reminder(..., update_status=False)`.
+
+        Args:
+            reminder (Dict[str, Any]): The reminder details including id, title, time and email.
+
+        Returns:
+            ReminderDelivery: Per-channel results; true if every channel succeeded.
+        """
+        service = self.notification_service
+        title, message = service.compose(reminder["title"], reminder["time"])
+        print(f"   🔍 Due Reminder: \"{reminder['title']}\"")
+
+        channels = service.channels_for(reminder)
+        sends = [self._send(channel, service.send, channel, recipient, title, message) for channel, recipient in channels]
+
+        self.in_flight += 1
+        try:
+            outcomes = await asyncio.gather(*sends, return_exceptions=True)
+        finally:
+            self.in_flight -= 1
+
+        delivery = ReminderDelivery(reminder["id"], reminder["title"], reminder["time"])
+        for (channel, _), outcome in zip(channels, outcomes):
+            if isinstance(outcome, Exception):
+                logging.error(f"Error processing reminder '{reminder['title']}': {outcome}")
+                delivery.results.append(ChannelResult(channel, False, error=str(outcome)))
+            else:
+                delivery.results.append(ChannelResult(channel, outcome is not False))
+        return delivery
+
+    def close(self) -> None:
+        """Shuts the channel pools down once their current sends finish."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
@@ -0,0 +1,145 @@
+# asyncio variant of the reminder checker loop
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from config.settings import ASYNC_DB_WORKERS
+from services.async_notification_service import AsyncNotificationService
+from services.scheduler_service import ReminderScheduler
+from utils.clock import Clock
+from typing import Any, Callable, Dict, List, Optional
+
+
+class AsyncReminderScheduler:
+    """
+    Runs the reminder checker on an event loop.
+
+    - Database calls go through a dedicated executor, so SQLite never blocks the loop.
+    - Due reminders are claimed and paced like `ReminderScheduler.check_due` (a `claim_limit`
+      batch at a time, released by the scheduler's DispatchScheduler token buckets); released
+      deliveries run concurrently, with per-channel concurrency limits in AsyncNotificationService.
+    - Waiting between checks is an awaitable clock sleep instead of `time.sleep`.
+    """
+
+    def __init__(self, scheduler: ReminderScheduler, notifier: Optional[AsyncNotificationService] = None,
+                 clock: Optional[Clock] = None, db_workers: int = ASYNC_DB_WORKERS) -> None:
+        """
+        Args:
+            scheduler (ReminderScheduler): Provides the due query and the batch state transitions.
+            notifier (Optional[AsyncNotificationService]): Channel senders; wraps the scheduler's
+                NotificationService when omitted.
+            clock (Optional[Clock]): Source of time and sleeps; the scheduler's clock when omitted.
+            db_workers (int): Threads on the database executor.
+        """
+        self.scheduler = scheduler
+        self.clock = clock or scheduler.clock
+        self._db_executor = ThreadPoolExecutor(max_workers=db_workers, thread_name_prefix="reminder-db")
+
+        if notifier is None:
+            if scheduler.notification_service is None:
+                # Lazy import to avoid circular dependencies
+                from services.notification_service import NotificationService
+                scheduler.notification_service = NotificationService(scheduler.db_manager, clock=self.clock)
+            notifier = AsyncNotificationService(scheduler.notification_service)
+        self.notifier = notifier
+
+    async def _db(self, call: Callable[..., Any], *args: Any) -> Any:
+        """Runs a blocking database call on the dedicated executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, partial(call, *args))
+
+    async def check_once(self) -> int:
+        """
+        Claims what is due a rate-limit budget at a time and delivers each batch, applying its
+        transitions in one transaction, until nothing due is left.
+
+        Returns:
+            int: Number of reminders delivered.
+        """
+        limit = self.scheduler.claim_limit()
+        due_reminders = await self._db(self.scheduler.claim_due_reminders, limit)
+        if not due_reminders:
+            print("✅ No due reminders.")
+            return 0
+
+        processed = 0
+        while due_reminders:
+            now = self.clock.now()
+            due_batch = [self.scheduler.reminder_from_row(reminder) for reminder in due_reminders]
+            if self.scheduler.delivery_mode == "outbox":
+                # Sending is left to the outbox workers
+                await self._db(self.scheduler.process_due, due_batch, self.notifier.notification_service, now)
+            else:
+                await self.deliver(due_batch, now)
+                # Mark notified / advance recurrence for the whole batch in one commit
+                await self._db(self.scheduler.apply_due_transitions, due_batch, now)
+            processed += len(due_batch)
+            due_reminders = await self._db(self.scheduler.claim_due_reminders, limit) if len(due_reminders) == limit else []
+        return processed
+
+    async def deliver(self, due_batch: List[Dict[str, Any]], now: datetime) -> None:
+        """
+        Releases the batch's occurrences (and email digests) as the dispatcher's token buckets
+        allow, each as its own task, and waits for all of them.
+
+        Args:
+            due_batch (List[Dict[str, Any]]): Claimed reminders (see `reminder_from_row`).
+            now (datetime): Current time.
+        """
+        occurrences = [occurrence for reminder in due_batch for occurrence in self.scheduler.due_occurrences(reminder, now)]
+        # Emails for the same address go out as one digest each
+        occurrences, digests = await self._db(self.scheduler.coalescer.plan, occurrences)
+        tasks = []
+
+        def submit(job: Dict[str, Any]) -> None:
+            send = self.notifier.send_digest(job["digest"]) if "digest" in job else self.notifier.check_reminder(job)
+            tasks.append(asyncio.ensure_future(send))
+
+        print(f"\n✅ Sending Notifications:")
+        stats = await self.scheduler.dispatcher.dispatch_async(occurrences + [digest.as_job() for digest in digests],
+                                                               submit, self.notifier.notification_service)
+        await asyncio.gather(*tasks)
+        if stats.delayed:
+            print(f"⏱️ {stats}")
+
+    async def run_reminder_checker(self, check_interval: int = 10, max_checks: Optional[int] = 2,
+                                   duration_minutes: Optional[float] = 1) -> None:
+        """
+        Run the reminder checker for a limited number of checks or duration.
+
+        Args:
+            check_interval (int): Time (in seconds) to wait between checks.
+            max_checks (Optional[int]): Maximum number of checks to perform; None for no limit.
+            duration_minutes (Optional[float]): Duration (in minutes) before stopping; None for no limit.
+        """
+        print("=" * 50)
+        print("🔄 ASYNC REMINDER CHECKER STARTED".center(50))
+        print("=" * 50)
+
+        end_time = None if duration_minutes is None else self.clock.time() + duration_minutes * 60
+        check_count = 0
+
+        while max_checks is None or check_count < max_checks:
+            print(f"\n🔎 [{self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}] Checking reminders...")
+            await self.check_once()
+
+            check_count += 1
+            print(f"🔄 Check {check_count}/{max_checks or '∞'} completed.")
+
+            if end_time is not None and self.clock.time() >= end_time:
+                print("⏳ Time limit reached. Stopping reminder checker.")
+                break
+            if max_checks is not None and check_count >= max_checks:
+                break
+
+            await self.clock.sleep_async(check_interval)
+
+        print("=" * 50)
+        print("✅ ASYNC REMINDER CHECKER STOPPED".center(50))
+        print("=" * 50)
+
+    def close(self) -> None:
+        """Stops the database executor and the channel pools."""
+        self._db_executor.shutdown(wait=True)
+        self.notifier.close()
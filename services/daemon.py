@@ -0,0 +1,173 @@
+# Long-running delivery daemon (`python main.py daemon`)
+
+import json
+import os
+import signal
+import threading
+import time
+from config.settings import (
+    DAEMON_PIDFILE,
+    DAEMON_HEARTBEAT_FILE,
+    DAEMON_HEARTBEAT_INTERVAL,
+    DAEMON_DRAIN_TIMEOUT,
+)
+from database.db_manager import DBManager
+from services.event_scheduler import EventScheduler
+from services.notification_service import NotificationService
+from services.outbox import OutboxWorker
+from services.scheduler_service import ReminderScheduler
+from typing import Any, Dict, Optional
+
+
+def _pid_alive(pid: int) -> bool:
+    """True if a process with this PID exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by someone else
+    return True
+
+
+class ReminderDaemon:
+    """
+    Delivers reminders until told to stop, without ever prompting.
+
+    - Everything (database connections, NotificationService, the event heap) is built once at startup.
+    - SIGTERM / SIGINT stop the scheduler; the delivery in progress is allowed to finish.
+    - A pidfile guards against two daemons on one database, and a heartbeat file
+      reports liveness and counters every DAEMON_HEARTBEAT_INTERVAL seconds.
+    - Partition rotation and archival run from the heartbeat loop.
+    - In outbox delivery mode the scheduler only queues sends, and an OutboxWorker
+      thread drains the outbox; its queue depth is part of the heartbeat.
+    """
+
+    def __init__(self, db_manager: Optional[DBManager] = None, pidfile: str = DAEMON_PIDFILE,
+                 heartbeat_file: str = DAEMON_HEARTBEAT_FILE,
+                 heartbeat_interval: float = DAEMON_HEARTBEAT_INTERVAL,
+                 drain_timeout: float = DAEMON_DRAIN_TIMEOUT) -> None:
+        self.db_manager = db_manager or DBManager()
+        self.pidfile = pidfile
+        self.heartbeat_file = heartbeat_file
+        self.heartbeat_interval = heartbeat_interval
+        self.drain_timeout = drain_timeout
+
+        self.notification_service = NotificationService(self.db_manager)
+        self.scheduler = ReminderScheduler(self.db_manager, self.notification_service)
+        self.events = EventScheduler(self.scheduler, self.notification_service)
+        self.outbox_worker: Optional[OutboxWorker] = None
+        if self.scheduler.delivery_mode == "outbox":
+            self.outbox_worker = OutboxWorker(self.scheduler.outbox, self.notification_service,
+                                              dispatcher=self.scheduler.dispatcher)
+
+        self.started_at: Optional[float] = None
+        self._stop = threading.Event()
+
+    def write_pidfile(self) -> None:
+        """
+        Records our PID, replacing a stale pidfile left by a crashed daemon.
+
+        Raises:
+            RuntimeError: If another daemon is still running.
+        """
+        try:
+            with open(self.pidfile, encoding="utf-8") as handle:
+                pid = int(handle.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            pid = 0
+
+        if pid and pid != os.getpid() and _pid_alive(pid):
+            raise RuntimeError(f"Daemon already running with PID {pid} ({self.pidfile}).")
+
+        with open(self.pidfile, "w", encoding="utf-8") as handle:
+            handle.write(str(os.getpid()))
+
+    def _remove_pidfile(self) -> None:
+        try:
+            os.remove(self.pidfile)
+        except FileNotFoundError:
+            pass
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot written to the heartbeat file."""
+        status = {
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "heartbeat_at": time.time(),
+            "reminders_sent": self.events.fired,
+            "last_dispatch_at": self.events.last_dispatch,
+            "next_fire_at": self.events.next_fire_at(),
+            "queue_wait_avg_seconds": round(self.scheduler.dispatcher.stats.average_wait, 3),
+            "queue_wait_max_seconds": round(self.scheduler.dispatcher.stats.max_wait, 3),
+        }
+        if self.outbox_worker is not None:
+            metrics = self.scheduler.outbox.metrics()
+            status["outbox"] = {
+                "ready": metrics.ready,
+                "awaiting_retry": metrics.scheduled,
+                "in_flight": metrics.in_flight,
+                "dead": metrics.dead,
+                "oldest_ready_seconds": metrics.oldest_ready_seconds,
+                "sent": self.outbox_worker.stats.sent,
+                "retried": self.outbox_worker.stats.retried,
+                "dead_lettered": self.outbox_worker.stats.dead_lettered,
+            }
+        return status
+
+    def write_heartbeat(self) -> None:
+        """Atomically replaces the heartbeat file with the current status."""
+        temp_path = f"{self.heartbeat_file}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.status(), handle)
+        os.replace(temp_path, self.heartbeat_file)
+
+    def request_stop(self, signum: Optional[int] = None, frame: Any = None) -> None:
+        """Signal handler: stop accepting new work and let the current delivery finish."""
+        if signum is not None:
+            print(f"\n🛑 Received {signal.Signals(signum).name}, draining in-flight deliveries...")
+        self._stop.set()
+        self.events.stop()
+
+    def _install_signal_handlers(self) -> None:
+        # Python only allows signal handlers on the main thread
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.request_stop)
+            signal.signal(signal.SIGINT, self.request_stop)
+
+    def run(self) -> None:
+        """Runs until SIGTERM / SIGINT (or `request_stop`), then shuts down cleanly."""
+        self.write_pidfile()
+        self._install_signal_handlers()
+        self.started_at = time.time()
+        print(f"🚀 Reminder daemon started (PID {os.getpid()}).")
+
+        worker = threading.Thread(target=self.events.run, name="reminder-scheduler", daemon=True)
+        worker.start()
+        if self.outbox_worker is not None:
+            self.outbox_worker.start()
+        try:
+            while not self._stop.is_set():
+                self.write_heartbeat()
+                self.scheduler.rotate_partitions()
+                self.scheduler.run_archival_if_due()
+                if not worker.is_alive():
+                    print("❌ Scheduler thread stopped unexpectedly.")
+                    break
+                self._stop.wait(self.heartbeat_interval)
+        finally:
+            self.events.stop()
+            worker.join(timeout=self.drain_timeout)
+            if worker.is_alive():
+                print("⚠️ Deliveries still running after the drain timeout; exiting anyway.")
+            if self.outbox_worker is not None:
+                if not self.outbox_worker.stop(self.drain_timeout):
+                    print("⚠️ Outbox batch still running after the drain timeout; its leases will expire.")
+                else:
+                    self.outbox_worker.close()
+            self.write_heartbeat()
+            self._remove_pidfile()
+            self.scheduler.close()
+            self.notification_service.close()
+            self.db_manager.close()
+            print("✅ Reminder daemon stopped.")
@@ -0,0 +1,160 @@
+# Email digests: one message per recipient instead of one per due reminder
+
+import sqlite3
+from dataclasses import dataclass
+from config.settings import EMAIL_DIGEST, EMAIL_DIGEST_WINDOW_SECONDS, EMAIL_DIGEST_MIN_ITEMS
+from utils.time_utils import parse_reminder_time, to_epoch
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class RecipientPreferences:
+    """How one email address wants its reminders (stored in `email_preferences`)."""
+    digest: bool = True               # Coalesce due reminders into digests
+    urgent_separately: bool = False   # Opt out of digests for urgent reminders: send them on their own
+
+
+@dataclass
+class Digest:
+    """Several due occurrences sent to one address as a single email."""
+    recipient: str
+    items: List[Dict[str, Any]]
+
+    def as_job(self) -> Dict[str, Any]:
+        """The shape DispatchScheduler paces: one email to one recipient, due with its oldest item."""
+        return {"id": f"digest:{self.recipient}", "title": f"Digest for {self.recipient}", "time": self.items[0]["time"],
+                "channel": "email", "recipient": self.recipient, "digest": self}
+
+    def render(self) -> Tuple[str, str]:
+        """
+        Returns:
+            Tuple[str, str]: The email subject and body; urgent reminders are listed first.
+        """
+        items = sorted(self.items, key=lambda item: (not item.get("urgent"), item["time"]))
+        lines = [f"  - {'[URGENT] ' if item.get('urgent') else ''}{item['title']} at {item['time']}" for item in items]
+        subject = f"Reminder Digest: {len(items)} reminders"
+        return subject, f"⏰ You have {len(items)} reminders due:\n\n" + "\n".join(lines)
+
+
+class DigestCoalescer:
+    """
+    Groups due occurrences by email address before they reach the email channel.
+
+    - Occurrences for the same address (case-insensitive) whose times lie within `window`
+      seconds of the first one in the group become one Digest, if there are at least `min_items`.
+    - The other channels (desktop, Pushbullet) are untouched: only the email part of a
+      coalesced occurrence moves into the digest.
+    - Per-address preferences can turn digests off, or keep urgent reminders out of them.
+    """
+
+    def __init__(self, db_manager: Any, window: float = EMAIL_DIGEST_WINDOW_SECONDS,
+                 min_items: int = EMAIL_DIGEST_MIN_ITEMS, enabled: bool = EMAIL_DIGEST) -> None:
+        """
+        Args:
+            db_manager (Any): Database holding the email_preferences table.
+            window (float): Longest span, in seconds, between the first and last item of a digest.
+            min_items (int): Smallest group sent as a digest.
+            enabled (bool): Coalesce at all.
+        """
+        self.db_manager = db_manager
+        self.window = window
+        self.min_items = max(2, min_items)
+        self.enabled = enabled
+
+    def preferences(self, recipients: Iterable[str]) -> Dict[str, RecipientPreferences]:
+        """
+        Stored preferences of the given addresses (one query), keyed by lower-cased address.
+        Addresses without a stored row get the defaults.
+        """
+        recipients = list(recipients)
+        found: Dict[str, RecipientPreferences] = {}
+        if recipients:
+            try:
+                rows = self.db_manager.fetch_all(
+                    f"SELECT email, digest, urgent_separately FROM email_preferences "
+                    f"WHERE email IN ({', '.join('?' * len(recipients))})", tuple(recipients))
+            except sqlite3.Error as e:
+                print(f"❌ Database Error (digest preferences): {e}")
+                rows = []
+            found = {email.lower(): RecipientPreferences(bool(digest), bool(urgent)) for email, digest, urgent in rows}
+        return {recipient: found.get(recipient.lower(), RecipientPreferences()) for recipient in recipients}
+
+    def set_preferences(self, email: str, digest: Optional[bool] = None,
+                        urgent_separately: Optional[bool] = None) -> RecipientPreferences:
+        """
+        Changes the given preferences of an address, keeping the others.
+
+        Returns:
+            RecipientPreferences: The preferences now stored.
+        """
+        email = email.strip()
+        current = self.preferences([email])[email]
+        if digest is not None:
+            current.digest = digest
+        if urgent_separately is not None:
+            current.urgent_separately = urgent_separately
+
+        with self.db_manager.transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO email_preferences (email, digest, urgent_separately) VALUES (?, ?, ?)
+                ON CONFLICT (email) DO UPDATE SET digest = excluded.digest, urgent_separately = excluded.urgent_separately
+            """, (email, int(current.digest), int(current.urgent_separately)))
+        return current
+
+    def _windows(self, items: List[Tuple[int, Dict[str, Any]]]) -> List[List[Tuple[int, Dict[str, Any]]]]:
+        """Splits (index, item) pairs into runs spanning at most `window` seconds, in time order."""
+        timed = []
+        for index, item in items:
+            try:
+                timed.append((to_epoch(parse_reminder_time(item["time"])), index, item))
+            except (KeyError, TypeError, ValueError):
+                continue  # Unreadable time: leave it as an ordinary email
+        timed.sort(key=lambda entry: (entry[0], entry[1]))
+
+        runs: List[List[Tuple[int, Dict[str, Any]]]] = []
+        start = None
+        for epoch, index, item in timed:
+            if start is None or epoch - start > self.window:
+                runs.append([])
+                start = epoch
+            runs[-1].append((index, item))
+        return runs
+
+    def plan(self, items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Digest]]:
+        """
+        Picks which emails to coalesce.
+
+        Args:
+            items (List[Dict[str, Any]]): Due occurrences (id, title, time, email, urgent, ...).
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Digest]]: The items in their original order, with
+            "email" cleared on the ones that went into a digest, and the digests to send.
+        """
+        if not self.enabled:
+            return items, []
+
+        by_recipient: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, item in enumerate(items):
+            if item.get("email"):
+                by_recipient.setdefault(item["email"].strip().lower(), []).append((index, item))
+        candidates = {recipient: group for recipient, group in by_recipient.items() if len(group) >= self.min_items}
+        if not candidates:
+            return items, []
+
+        preferences = self.preferences(candidates)
+        digests: List[Digest] = []
+        coalesced = set()
+        for recipient, group in candidates.items():
+            preference = preferences[recipient]
+            if not preference.digest:
+                continue
+            if preference.urgent_separately:
+                group = [(index, item) for index, item in group if not item.get("urgent")]
+            for run in self._windows(group):
+                if len(run) >= self.min_items:
+                    digests.append(Digest(run[0][1]["email"].strip(), [item for _, item in run]))
+                    coalesced.update(index for index, _ in run)
+
+        remaining = [{**item, "email": None} if index in coalesced else item for index, item in enumerate(items)]
+        return remaining, digests
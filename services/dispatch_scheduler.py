@@ -0,0 +1,251 @@
+# Rate-limited delivery: per-channel and per-recipient token buckets, oldest-due first
+
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from config.settings import DISPATCH_CHANNEL_RATES, DISPATCH_RECIPIENT_RATES, DISPATCH_MAX_RECIPIENT_BUCKETS
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.time_utils import parse_reminder_time, to_epoch
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Allows `rate` sends per second on average and up to `burst` back to back.
+
+    Tokens refill continuously; a send takes one. An idle bucket fills up to `burst`.
+    """
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        """
+        Args:
+            rate (float): Tokens added per second.
+            burst (float): Bucket size.
+            now (float): Current time (epoch seconds); the bucket starts full.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def available(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= 1 - 1e-9  # Tolerate float error after sleeping exactly `wait_time`
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+@dataclass
+class DispatchStats:
+    """Deliveries and how long they waited in the queue for a token."""
+    sent: int = 0
+    failed: int = 0
+    delayed: int = 0  # Sends that had to wait for a token
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.sent if self.sent else 0.0
+
+    def record(self, wait: float) -> None:
+        self.sent += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        if wait > 0:
+            self.delayed += 1
+
+    def __str__(self) -> str:
+        return (f"{self.sent} sent ({self.failed} failed), {self.delayed} delayed by rate limits, "
+                f"queue wait avg {self.average_wait:.1f}s / max {self.max_wait:.1f}s")
+
+
+@dataclass(order=True)
+class _Job:
+    due_at: float
+    seq: int
+    reminder: Dict[str, Any] = field(compare=False)
+    buckets: List[TokenBucket] = field(compare=False)
+    queued_at: float = field(compare=False)
+
+
+class DispatchScheduler:
+    """
+    Spreads a burst of due reminders over the send budget of each channel.
+
+    - Every channel in DISPATCH_CHANNEL_RATES has one token bucket, and every recipient
+      (email address) of a channel in DISPATCH_RECIPIENT_RATES has its own.
+    - A reminder is sent once every bucket it needs (email and its address, Pushbullet)
+      has a token; desktop notifications are not limited.
+    - The queue is ordered by due time: the oldest reminder gets the next token, and a
+      reminder held back by its own recipient's limit does not block the others.
+    - Between sends the dispatcher sleeps until the next token is due, so throughput stays
+      at the configured rates instead of bursting into provider throttling.
+    """
+
+    def __init__(self, channel_rates: Optional[Dict[str, Tuple[float, float]]] = None,
+                 recipient_rates: Optional[Dict[str, Tuple[float, float]]] = None,
+                 clock: Clock = SYSTEM_CLOCK, max_recipient_buckets: int = DISPATCH_MAX_RECIPIENT_BUCKETS) -> None:
+        """
+        Args:
+            channel_rates (Optional[Dict[str, Tuple[float, float]]]): (rate, burst) per channel.
+            recipient_rates (Optional[Dict[str, Tuple[float, float]]]): (rate, burst) per recipient of a channel.
+            clock (Clock): Source of time and sleeps.
+            max_recipient_buckets (int): Per-recipient buckets kept before idle ones are dropped.
+        """
+        self.channel_rates = DISPATCH_CHANNEL_RATES if channel_rates is None else channel_rates
+        self.recipient_rates = DISPATCH_RECIPIENT_RATES if recipient_rates is None else recipient_rates
+        self.clock = clock
+        self.max_recipient_buckets = max_recipient_buckets
+
+        now = clock.time()
+        self._channel_buckets = {channel: TokenBucket(rate, burst, now)
+                                 for channel, (rate, burst) in self.channel_rates.items()}
+        self._recipient_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._seq = itertools.count()
+        self.stats = DispatchStats()  # Since start
+
+    def _recipient_bucket(self, channel: str, recipient: str, now: float) -> TokenBucket:
+        key = (channel, recipient)
+        bucket = self._recipient_buckets.get(key)
+        if bucket is None:
+            if len(self._recipient_buckets) >= self.max_recipient_buckets:
+                # A full bucket carries no state a fresh one would not have
+                self._recipient_buckets = {k: b for k, b in self._recipient_buckets.items() if not b.full(now)}
+            bucket = self._recipient_buckets[key] = TokenBucket(*self.recipient_rates[channel], now)
+        return bucket
+
+    def buckets_for(self, reminder: Dict[str, Any], notification_service: Any, now: float) -> List[TokenBucket]:
+        """
+        The buckets one delivery of `reminder` draws a token from: every configured channel,
+        or only `reminder["channel"]` (to `reminder["recipient"]`) for a single-channel send
+        such as an outbox entry.
+        """
+        if "channel" in reminder:
+            recipient = reminder.get("recipient")
+            channels = [(reminder["channel"], recipient.strip().lower() if recipient else None)]
+        else:
+            channels = [("desktop", None)]
+            if reminder.get("email"):
+                channels.append(("email", reminder["email"].strip().lower()))
+            if getattr(notification_service, "pushbullet_api_key", None):
+                channels.append(("pushbullet", None))
+
+        buckets = []
+        for channel, recipient in channels:
+            if channel in self._channel_buckets:
+                buckets.append(self._channel_buckets[channel])
+            if recipient is not None and channel in self.recipient_rates:
+                buckets.append(self._recipient_bucket(channel, recipient, now))
+        return buckets
+
+    def budget(self, seconds: float) -> Optional[int]:
+        """
+        Deliveries the tightest channel allows within `seconds` (from a full bucket).
+
+        Returns:
+            Optional[int]: The count, or None when no channel is limited.
+        """
+        if not self.channel_rates:
+            return None
+        return min(int(burst + rate * seconds) for rate, burst in self.channel_rates.values())
+
+    def dispatch(self, reminders: Iterable[Dict[str, Any]], send: Callable[[Dict[str, Any]], Any],
+                 notification_service: Any = None) -> DispatchStats:
+        """
+        Sends every reminder through `send`, as fast as the buckets allow, oldest due first.
+        Blocks until the queue is empty.
+
+        Args:
+            reminders (Iterable[Dict[str, Any]]): Due occurrences (id, title, time, email, ...).
+            send (Callable[[Dict[str, Any]], Any]): Delivers one reminder on all its channels,
+                e.g. `lambda r: notification_service.check_reminder(r, update_status=False)`.
+                A False return or an exception counts as a failed delivery.
+            notification_service (Any): Tells which channels are configured (Pushbullet key).
+
+        Returns:
+            DispatchStats: Counts and queue waits for this call (also added to `stats`).
+        """
+        queue, run = self._queue(reminders, notification_service), DispatchStats()
+        while (wait := self._release(queue, send, run)) is not None:
+            self.clock.sleep(wait)
+        return run
+
+    async def dispatch_async(self, reminders: Iterable[Dict[str, Any]], send: Callable[[Dict[str, Any]], Any],
+                             notification_service: Any = None) -> DispatchStats:
+        """
+        `dispatch` for an event loop: waits for tokens with the clock's awaitable sleep, so other
+        coroutines (the sends already released) keep running. `send` should only schedule the
+        delivery (e.g. create a task); its outcome is not awaited here.
+        """
+        queue, run = self._queue(reminders, notification_service), DispatchStats()
+        while (wait := self._release(queue, send, run)) is not None:
+            await self.clock.sleep_async(wait)
+        return run
+
+    def _queue(self, reminders: Iterable[Dict[str, Any]], notification_service: Any) -> List[_Job]:
+        """Heap of jobs ordered by due time, each with the buckets it draws from."""
+        now = self.clock.time()
+        queue = []
+        for reminder in reminders:
+            try:
+                due_at = to_epoch(parse_reminder_time(reminder["time"]))
+            except (KeyError, TypeError, ValueError):
+                due_at = now
+            queue.append(_Job(due_at, next(self._seq), reminder,
+                              self.buckets_for(reminder, notification_service, now), now))
+        heapq.heapify(queue)
+        return queue
+
+    def _release(self, queue: List[_Job], send: Callable[[Dict[str, Any]], Any], run: DispatchStats) -> Optional[float]:
+        """
+        Sends every queued job that has its tokens now, oldest first.
+
+        Returns:
+            Optional[float]: Seconds until the first held-back job could go, or None once the queue is empty.
+        """
+        now = self.clock.time()
+        held_back = []
+        while queue:
+            job = heapq.heappop(queue)
+            if not all(bucket.available(now) for bucket in job.buckets):
+                held_back.append(job)
+                continue
+
+            for bucket in job.buckets:
+                bucket.take(now)
+            wait = now - job.queued_at
+            run.record(wait)
+            self.stats.record(wait)
+            try:
+                delivered = send(job.reminder)
+            except Exception as e:
+                logging.error(f"Error dispatching reminder '{job.reminder.get('title')}': {e}")
+                delivered = False
+            if delivered is False:
+                run.failed += 1
+                self.stats.failed += 1
+            now = self.clock.time()
+
+        if not held_back:
+            return None
+        for job in held_back:
+            heapq.heappush(queue, job)
+        return min(max(bucket.wait_time(now) for bucket in job.buckets) for job in held_back)
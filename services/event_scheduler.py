@@ -0,0 +1,239 @@
+# Heap-driven scheduler that sleeps until the next reminder is due
+
+import heapq
+import sqlite3
+import threading
+from config.settings import EVENT_SCHEDULER_HORIZON_SECONDS, EVENT_SCHEDULER_MAX_SLEEP
+from services.scheduler_service import ReminderScheduler
+from utils.clock import Clock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class EventScheduler:
+    """
+    Fires reminders at their exact time instead of polling the database.
+
+    - Keeps a min-heap of (fire_at, id) for pending reminders due within the next
+      EVENT_SCHEDULER_HORIZON_SECONDS and sleeps on a condition until the earliest one.
+    - In-process adds, edits and deletes arrive through `on_reminder_event` (a ReminderManager
+      listener) and adjust the heap right away; writes by other processes are picked up
+      by watching `PRAGMA data_version`, at least every EVENT_SCHEDULER_MAX_SLEEP seconds.
+    - Entries are invalidated lazily: `_pending` maps each id to its current fire time and
+      stale heap entries are skipped when they surface.
+    - A due reminder another process holds a claim on goes back in the heap at its
+      `lease_until`, so a crashed peer's reminder is retried as soon as the lease ends.
+    """
+
+    def __init__(self, scheduler: ReminderScheduler, notification_service: Any = None,
+                 horizon: int = EVENT_SCHEDULER_HORIZON_SECONDS, max_sleep: float = EVENT_SCHEDULER_MAX_SLEEP,
+                 clock: Optional[Clock] = None) -> None:
+        """
+        Args:
+            scheduler (ReminderScheduler): Applies the state transitions of fired reminders.
+            notification_service (Any): Sends the notifications; built on first use when omitted.
+            horizon (int): Seconds ahead of now that are kept in memory.
+            max_sleep (float): Longest wait before checking the database for outside writes.
+            clock (Optional[Clock]): Source of the current time; the scheduler's clock when omitted.
+                Waits still block on the condition in real time.
+        """
+        self.scheduler = scheduler
+        self.clock = clock or scheduler.clock
+        self.db_manager = scheduler.db_manager
+        self.notification_service = notification_service
+        self.horizon = horizon
+        self.max_sleep = max_sleep
+
+        self._condition = threading.Condition()
+        self._heap: List[Tuple[int, int]] = []
+        self._pending: Dict[int, int] = {}  # id -> fire_at of its live heap entry
+        self._loaded_until = 0  # Reminders firing after this are not in the heap yet
+        self._data_version: Optional[int] = None
+        self._stopped = False
+        self.fired = 0  # Reminders sent since start
+        self.last_dispatch: Optional[float] = None  # clock.time() of the last dispatch
+
+    def _push(self, reminder_id: int, fire_at: int) -> None:
+        """Adds or moves a reminder in the heap (caller holds the condition)."""
+        if self._pending.get(reminder_id) == fire_at:
+            return
+        self._pending[reminder_id] = fire_at
+        heapq.heappush(self._heap, (fire_at, reminder_id))
+
+    def load(self, now: Optional[float] = None) -> int:
+        """
+        Rebuilds the heap from the database: every pending reminder due before now + horizon.
+
+        Returns:
+            int: Number of reminders scheduled.
+        """
+        now = self.clock.time() if now is None else now
+        until = int(now) + self.horizon
+        rows = self.db_manager.fetch_all(
+            "SELECT id, fire_at FROM reminders WHERE notified = 0 AND fire_at <= ? ORDER BY fire_at", (until,))
+
+        with self._condition:
+            self._heap = [(fire_at, reminder_id) for reminder_id, fire_at in rows]
+            heapq.heapify(self._heap)
+            self._pending = {reminder_id: fire_at for reminder_id, fire_at in rows}
+            self._loaded_until = until
+            self._data_version = self.db_manager.data_version()
+            self._condition.notify()
+        return len(rows)
+
+    def refresh(self, reminder_ids: Iterable[int]) -> None:
+        """Re-reads the given reminders and reschedules, cancels or ignores each one."""
+        reminder_ids = list(reminder_ids)
+        if not reminder_ids:
+            return
+
+        placeholders = ", ".join("?" * len(reminder_ids))
+        rows = dict(self.db_manager.fetch_all(
+            f"SELECT id, fire_at FROM reminders WHERE notified = 0 AND id IN ({placeholders})", tuple(reminder_ids)))
+
+        with self._condition:
+            for reminder_id in reminder_ids:
+                fire_at = rows.get(reminder_id)
+                if fire_at is None or fire_at > self._loaded_until:
+                    self._pending.pop(reminder_id, None)  # Gone, notified, or beyond the horizon
+                else:
+                    self._push(reminder_id, fire_at)
+            self._condition.notify()
+
+    def cancel(self, reminder_id: int) -> None:
+        """Drops a reminder from the schedule."""
+        with self._condition:
+            self._pending.pop(reminder_id, None)
+            self._condition.notify()
+
+    def on_reminder_event(self, event: str, reminder_id: Optional[int]) -> None:
+        """
+        ReminderManager listener: keeps the heap in step with add / edit / delete.
+
+        Args:
+            event (str): "added", "updated", "deleted" or "bulk_added".
+            reminder_id (Optional[int]): The reminder concerned; None for bulk changes.
+        """
+        if event == "deleted":
+            self.cancel(reminder_id)
+        elif reminder_id is None:
+            self.load()
+        else:
+            self.refresh([reminder_id])
+
+    def next_fire_at(self) -> Optional[int]:
+        """Earliest scheduled fire time, discarding stale heap entries on the way."""
+        with self._condition:
+            return self._peek()
+
+    def _peek(self) -> Optional[int]:
+        while self._heap:
+            fire_at, reminder_id = self._heap[0]
+            if self._pending.get(reminder_id) == fire_at:
+                return fire_at
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: float) -> List[int]:
+        """Pops every live entry due at or before `now` (caller holds the condition)."""
+        due = []
+        while (fire_at := self._peek()) is not None and fire_at <= now:
+            _, reminder_id = heapq.heappop(self._heap)
+            del self._pending[reminder_id]
+            due.append(reminder_id)
+        return due
+
+    def _external_change(self) -> bool:
+        """True if another connection committed since the heap was loaded."""
+        try:
+            return self.db_manager.data_version() != self._data_version
+        except sqlite3.Error:
+            return False
+
+    def wait_for_due(self) -> List[int]:
+        """
+        Blocks until at least one reminder is due (or `stop` is called) and returns the due ids.
+
+        Returns:
+            List[int]: Due reminder ids, oldest first; empty once stopped.
+        """
+        while True:
+            timed_out = False
+            with self._condition:
+                if self._stopped:
+                    return []
+
+                now = self.clock.time()
+                due = self._pop_due(now)
+                if due:
+                    return due
+
+                if now < self._loaded_until:
+                    fire_at = self._peek()
+                    timeout = self._loaded_until - now if fire_at is None else fire_at - now
+                    timed_out = not self._condition.wait(timeout=min(timeout, self.max_sleep))
+
+            # Reload once the horizon has passed or another process wrote to the database
+            if self.clock.time() >= self._loaded_until or (timed_out and self._external_change()):
+                self.load()
+
+    def dispatch(self, reminder_ids: List[int]) -> int:
+        """
+        Sends the due reminders and applies their transitions, one claim-sized chunk
+        (see `ReminderScheduler.claim_limit`) per transaction.
+        Recurring reminders are rescheduled at their next occurrence.
+
+        Returns:
+            int: Number of reminders sent.
+        """
+        if self.notification_service is None:
+            # Lazy import to avoid circular dependencies
+            from services.notification_service import NotificationService
+            self.notification_service = NotificationService(self.db_manager, clock=self.clock)
+
+        limit = self.scheduler.claim_limit()
+        sent = 0
+        for start in range(0, len(reminder_ids), limit):
+            # Claimed, so another process running the same schedule skips them
+            chunk = reminder_ids[start:start + limit]
+            rows = self.scheduler.claim_due_reminders(limit, reminder_ids=chunk)
+            claimed = {row[0] for row in rows}
+            self._requeue_leased([reminder_id for reminder_id in chunk if reminder_id not in claimed])
+            if not rows:
+                continue
+
+            now = self.clock.now()
+            due_batch = [self.scheduler.reminder_from_row(row) for row in rows]
+            # Paced by the scheduler's rate limits, oldest occurrence first (or queued in outbox mode)
+            self.scheduler.process_due(due_batch, self.notification_service, now)
+            self.refresh(reminder["id"] for reminder in due_batch if reminder["recurrence"] != "none")
+            self.fired += len(due_batch)
+            self.last_dispatch = self.clock.time()
+            sent += len(due_batch)
+        return sent
+
+    def _requeue_leased(self, reminder_ids: List[int]) -> None:
+        """Schedules reminders whose claim is held elsewhere again for when that lease ends."""
+        if not reminder_ids:
+            return
+        rows = self.db_manager.fetch_all(
+            f"SELECT id, lease_until FROM reminders WHERE notified = 0 AND lease_until > ? "
+            f"AND id IN ({', '.join('?' * len(reminder_ids))})", (int(self.clock.time()), *reminder_ids))
+        with self._condition:
+            for reminder_id, lease_until in rows:
+                self._push(reminder_id, lease_until)
+            self._condition.notify()
+
+    def run(self) -> None:
+        """Loads the schedule and fires reminders until `stop` is called."""
+        self.load()
+        while True:
+            due = self.wait_for_due()
+            if not due:
+                return
+            self.dispatch(due)
+
+    def stop(self) -> None:
+        """Wakes the loop and makes `run` return after the current dispatch."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
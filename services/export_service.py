@@ -0,0 +1,192 @@
+# Streaming export of reminders to CSV, JSONL and iCalendar
+
+import csv
+import gzip
+import json
+from datetime import datetime, timezone
+from database.db_manager import DBManager
+from services.recurrence_rules import compile_rule
+from typing import Any, IO, Iterator, List, Optional, Tuple
+
+
+EXPORT_FORMATS = ("csv", "jsonl", "ics")
+EXPORT_COLUMNS = ["id", "title", "description", "reminder_time", "email", "recurrence", "notified", "fire_at"]
+
+
+
+def detect_format(path: str) -> str:
+    """
+    Guess the export format from the file extension (a trailing .gz is ignored).
+
+    Args:
+        path (str): Output path.
+
+    Returns:
+        str: "csv", "jsonl" or "ics".
+
+    Raises:
+        ValueError: If the extension is not recognised.
+    """
+    lowered = path.lower().removesuffix(".gz")
+    for file_format in EXPORT_FORMATS:
+        if lowered.endswith(f".{file_format}"):
+            return file_format
+    raise ValueError(f"Cannot detect export format of '{path}'. Use --format csv|jsonl|ics.")
+
+
+def build_export_query(start: Optional[int] = None, end: Optional[int] = None,
+                       notified: Optional[bool] = None, source: str = "reminders") -> Tuple[str, Tuple[Any, ...]]:
+    """
+    Build the SELECT for an export; time bounds are a half-open range on the indexed fire_at column.
+
+    Args:
+        start (Optional[int]): Inclusive lower bound (epoch seconds).
+        end (Optional[int]): Exclusive upper bound (epoch seconds).
+        notified (Optional[bool]): Only notified / only pending reminders.
+        source (str): Table or subquery to read from (see `DBManager.range_source`).
+
+    Returns:
+        Tuple[str, Tuple[Any, ...]]: The query and its parameters.
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+    if start is not None:
+        conditions.append("fire_at >= ?")
+        params.append(start)
+    if end is not None:
+        conditions.append("fire_at < ?")
+        params.append(end)
+    if notified is not None:
+        conditions.append("notified = ?")
+        params.append(int(notified))
+
+    query = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM {source}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY fire_at, id"
+    return query, tuple(params)
+
+
+def write_csv(rows: Iterator[Tuple[Any, ...]], handle: IO[str]) -> int:
+    """Write rows as CSV with a header line. Returns the number of rows written."""
+    writer = csv.writer(handle)
+    writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows: Iterator[Tuple[Any, ...]], handle: IO[str]) -> int:
+    """Write one JSON object per row. Returns the number of rows written."""
+    count = 0
+    for row in rows:
+        handle.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False))
+        handle.write("\n")
+        count += 1
+    return count
+
+
+def _ics_escape(text: str) -> str:
+    """Escape a TEXT value per RFC 5545."""
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _ics_line(line: str) -> str:
+    """Fold a content line at 75 octets per RFC 5545 and terminate it with CRLF."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts, current, size = [], "", 0
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > (75 if not parts else 74):  # Continuation lines start with a space
+            parts.append(current)
+            current, size = "", 0
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_time(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _ics_rrule(recurrence: Any) -> str:
+    """RRULE value for a stored recurrence; empty for 'none' or text that no longer parses."""
+    try:
+        return compile_rule(recurrence).to_rrule()
+    except ValueError:
+        return ""
+
+
+def write_ics(rows: Iterator[Tuple[Any, ...]], handle: IO[str]) -> int:
+    """Write rows as VEVENTs of one VCALENDAR. Returns the number of rows written."""
+    stamp = _ics_time(int(datetime.now(timezone.utc).timestamp()))
+    handle.write(_ics_line("BEGIN:VCALENDAR"))
+    handle.write(_ics_line("VERSION:2.0"))
+    handle.write(_ics_line("PRODID:-//Reminder Notification Application//EN"))
+
+    count = 0
+    for reminder_id, title, description, _, email, recurrence, _, fire_at in rows:
+        if fire_at is None:
+            continue
+        handle.write(_ics_line("BEGIN:VEVENT"))
+        handle.write(_ics_line(f"UID:reminder-{reminder_id}@reminder-notification-app"))
+        handle.write(_ics_line(f"DTSTAMP:{stamp}"))
+        handle.write(_ics_line(f"DTSTART:{_ics_time(fire_at)}"))
+        handle.write(_ics_line(f"SUMMARY:{_ics_escape(title)}"))
+        handle.write(_ics_line(f"DESCRIPTION:{_ics_escape(description)}"))
+        rrule = _ics_rrule(recurrence)
+        if rrule:
+            handle.write(_ics_line(f"RRULE:{rrule}"))
+        if email:
+            handle.write(_ics_line(f"ATTENDEE:mailto:{email}"))
+        handle.write(_ics_line("END:VEVENT"))
+        count += 1
+
+    handle.write(_ics_line("END:VCALENDAR"))
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "ics": write_ics}
+
+
+def export_reminders(db_manager: DBManager, path: str, file_format: Optional[str] = None,
+                     start: Optional[int] = None, end: Optional[int] = None, notified: Optional[bool] = None,
+                     compress: Optional[bool] = None) -> int:
+    """
+    Stream reminders into a file without loading the table into memory.
+
+    Rows are read in `fetchmany` batches and written as they arrive, so memory use
+    stays flat regardless of table size.
+
+    Args:
+        db_manager (DBManager): Source database.
+        path (str): Output file.
+        file_format (Optional[str]): "csv", "jsonl" or "ics"; detected from the extension when omitted.
+        start (Optional[int]): Inclusive lower bound on fire_at (epoch seconds).
+        end (Optional[int]): Exclusive upper bound on fire_at (epoch seconds).
+        notified (Optional[bool]): Only notified / only pending reminders.
+        compress (Optional[bool]): Gzip the output; defaults to True when the path ends in .gz.
+
+    Returns:
+        int: Number of reminders exported.
+    """
+    file_format = file_format or detect_format(path)
+    if compress is None:
+        compress = path.lower().endswith(".gz")
+
+    query, params = build_export_query(start, end, notified, db_manager.range_source(start, end))
+    rows = db_manager.iter_query(query, params)
+
+    # iCalendar requires CRLF line endings; newline="" stops Python from translating them
+    opener = gzip.open if compress else open
+    try:
+        with opener(path, "wt", encoding="utf-8", newline="") as handle:
+            return WRITERS[file_format](rows, handle)
+    finally:
+        rows.close()  # Hand the connection back even if writing failed
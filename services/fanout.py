@@ -0,0 +1,163 @@
+# Parallel channel fan-out and the structured report of what each channel delivered
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from config.settings import FANOUT_CHANNEL_WORKERS
+from services.dispatch_scheduler import DispatchStats
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class ChannelResult:
+    """Outcome of one channel for one reminder."""
+    channel: str
+    ok: bool
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class ReminderDelivery:
+    """Every channel result of one reminder; true when all channels succeeded."""
+    reminder_id: Any
+    title: str
+    time: str
+    results: List[ChannelResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    @property
+    def failed_channels(self) -> List[str]:
+        return [result.channel for result in self.results if not result.ok]
+
+
+@dataclass
+class DeliveryReport:
+    """Deliveries of a batch, with per-channel counts."""
+    deliveries: List[ReminderDelivery] = field(default_factory=list)
+    seconds: float = 0.0
+    dispatch_stats: DispatchStats = field(default_factory=DispatchStats)  # Rate-limit waits of the batch
+    digests: int = 0          # Digest emails sent in place of single emails
+    digest_items: int = 0     # Single emails they replaced
+    lost_claims: List[Any] = field(default_factory=list)  # Reminders another checker took over mid-batch
+
+    def add(self, reminder: Dict[str, Any], outcome: Any) -> None:
+        """
+        Records what a notifier returned for `reminder`: a ReminderDelivery, or (for notifiers
+        without per-channel results) a plain success flag, where only False counts as failed.
+        """
+        if isinstance(outcome, ReminderDelivery):
+            self.deliveries.append(outcome)
+        else:
+            error = outcome if isinstance(outcome, BaseException) else None
+            ok = outcome is not False and error is None
+            self.deliveries.append(ReminderDelivery(
+                reminder.get("id"), reminder.get("title", ""), reminder.get("time", ""),
+                [ChannelResult("notifier", ok, error=None if error is None else str(error))]))
+
+    def add_digest(self, items: List[Dict[str, Any]], result: ChannelResult) -> None:
+        """Records one digest email as the email result of every occurrence it covered."""
+        by_occurrence = {(delivery.reminder_id, delivery.time): delivery for delivery in self.deliveries}
+        for item in items:
+            delivery = by_occurrence.get((item.get("id"), item.get("time")))
+            if delivery is not None:
+                delivery.results.append(result)
+        self.digests += 1
+        self.digest_items += len(items)
+
+    @property
+    def delivered(self) -> int:
+        return sum(1 for delivery in self.deliveries if delivery.ok)
+
+    @property
+    def failed(self) -> List[ReminderDelivery]:
+        return [delivery for delivery in self.deliveries if not delivery.ok]
+
+    def by_channel(self) -> Dict[str, Tuple[int, int]]:
+        """channel -> (sent, failed)."""
+        counts: Dict[str, Tuple[int, int]] = {}
+        for delivery in self.deliveries:
+            for result in delivery.results:
+                sent, failed = counts.get(result.channel, (0, 0))
+                counts[result.channel] = (sent + result.ok, failed + (not result.ok))
+        return counts
+
+    def __str__(self) -> str:
+        channels = ", ".join(f"{channel} {sent}/{sent + failed}" for channel, (sent, failed) in self.by_channel().items())
+        digests = f", {self.digests} digests for {self.digest_items} emails" if self.digests else ""
+        return (f"{self.delivered}/{len(self.deliveries)} reminders delivered in {self.seconds:.2f}s"
+                + (f" ({channels}{digests})" if channels else ""))
+
+
+class ChannelFanout:
+    """
+    Runs channel sends in parallel on one bounded thread pool per channel.
+
+    - All channels of a reminder go out at once, so its latency is the slowest channel,
+      not the sum; many reminders can be fanned out concurrently from different threads.
+    - Each channel's pool is sized from FANOUT_CHANNEL_WORKERS (desktop notifications stay
+      on one thread; email matches the SMTP session pool), so one slow channel only queues
+      its own sends.
+    - A sender reports success by returning anything but False; an exception is a failure.
+    """
+
+    def __init__(self, channel_workers: Optional[Dict[str, int]] = None) -> None:
+        """
+        Args:
+            channel_workers (Optional[Dict[str, int]]): Threads per channel, over FANOUT_CHANNEL_WORKERS.
+        """
+        self.channel_workers = {**FANOUT_CHANNEL_WORKERS, **(channel_workers or {})}
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, channel: str) -> ThreadPoolExecutor:
+        with self._lock:
+            pool = self._pools.get(channel)
+            if pool is None:
+                pool = self._pools[channel] = ThreadPoolExecutor(
+                    max_workers=self.channel_workers.get(channel, 1), thread_name_prefix=f"fanout-{channel}")
+            return pool
+
+    @staticmethod
+    def _timed(channel: str, sender: Callable[..., Any], *args: Any) -> ChannelResult:
+        started = time.perf_counter()
+        try:
+            ok = sender(*args) is not False
+            error = None
+        except Exception as e:
+            logging.error(f"Error sending {channel} notification: {e}")
+            ok, error = False, str(e)
+        return ChannelResult(channel, ok, time.perf_counter() - started, error)
+
+    def submit(self, channel: str, sender: Callable[..., Any], *args: Any) -> "Future[ChannelResult]":
+        """Queues one send on its channel's pool."""
+        return self._pool(channel).submit(self._timed, channel, sender, *args)
+
+    def run(self, sends: Iterable[Tuple[str, Callable[..., Any], Tuple[Any, ...]]]) -> List[ChannelResult]:
+        """
+        Sends on every channel at once and waits for all of them.
+
+        Args:
+            sends (Iterable[Tuple[str, Callable[..., Any], Tuple[Any, ...]]]): (channel, sender, args).
+
+        Returns:
+            List[ChannelResult]: One result per send, in the order given.
+        """
+        futures = [self.submit(channel, sender, *args) for channel, sender, args in sends]
+        wait(futures)
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """Waits for queued sends and stops the worker threads."""
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown(wait=True)
@@ -0,0 +1,91 @@
+# Streaming CSV / JSONL import of reminders
+
+import csv
+import json
+from config.settings import IMPORT_CHUNK_SIZE
+from services.reminder_manager import ReminderManager, ImportReport
+from typing import Any, Iterator, Optional
+
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+
+def detect_format(path: str) -> str:
+    """
+    Guess the import format from the file extension.
+
+    Args:
+        path (str): Path of the input file.
+
+    Returns:
+        str: "csv" or "jsonl".
+
+    Raises:
+        ValueError: If the extension is not recognised.
+    """
+    lowered = path.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Cannot detect import format of '{path}'. Use --format csv|jsonl.")
+
+
+def iter_csv_records(path: str) -> Iterator[dict]:
+    """
+    Stream rows of a CSV file with a header row (title, description, reminder_time, email, recurrence).
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        yield from csv.DictReader(handle)
+
+
+def iter_jsonl_records(path: str) -> Iterator[Any]:
+    """
+    Stream one JSON object per line. Blank lines are skipped; lines that are not
+    valid JSON are passed through as text so validation reports them per row.
+    """
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield line
+
+
+def write_error_report(report: ImportReport, path: str) -> None:
+    """
+    Write the rejected rows of an import as CSV (row, error).
+    """
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["row", "error"])
+        writer.writerows(report.errors)
+
+
+def import_reminders(reminder_manager: ReminderManager, path: str, file_format: Optional[str] = None,
+                     chunk_size: int = IMPORT_CHUNK_SIZE, errors_path: Optional[str] = None) -> ImportReport:
+    """
+    Import reminders from a CSV or JSONL file in chunks, without prompting.
+
+    Args:
+        reminder_manager (ReminderManager): Manager used to write the reminders.
+        path (str): Input file.
+        file_format (Optional[str]): "csv" or "jsonl"; detected from the extension when omitted.
+        chunk_size (int): Rows per transaction.
+        errors_path (Optional[str]): Where to write the per-row error report, if any rows failed.
+
+    Returns:
+        ImportReport: Counts, per-row errors, and rows per second.
+    """
+    file_format = file_format or detect_format(path)
+    records = iter_csv_records(path) if file_format == "csv" else iter_jsonl_records(path)
+
+    report = reminder_manager.add_reminders(records, chunk_size=chunk_size)
+
+    if report.errors and errors_path:
+        write_error_report(report, errors_path)
+
+    return report
@@ -1,11 +1,14 @@
-import smtplib
-import json
-import requests
 import logging
 from email.message import EmailMessage
 from plyer import notification
-from config.settings import EMAIL_SENDER, EMAIL_PASSWORD, PUSHBULLET_API_KEY
-from typing import Dict, Any, Optional, List
+from config.settings import EMAIL_SENDER, EMAIL_PASSWORD, PUSHBULLET_API_KEY, LATE_DELIVERY_WARNING_SECONDS
+from services.digest import Digest
+from services.fanout import ChannelFanout, ChannelResult, ReminderDelivery
+from services.pushbullet_client import PushbulletClient
+from services.smtp_pool import SMTPSessionPool
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.time_utils import parse_reminder_time, to_epoch
+from typing import Dict, Any, Optional, List, Tuple
 
 
 logging.basicConfig(
@@ -23,53 +26,130 @@ class NotificationService:
     Manages notifications through Desktop, Email, and Pushbullet.
     """
 
-    def __init__(self, db_manager: Any) -> None:
+    def __init__(self, db_manager: Any, clock: Clock = SYSTEM_CLOCK) -> None:
         """"
         Initializes the NotificationService with a database manager and notification credentials.
 
         Args:
             db_manager (Any): The database manager instance for accessing reminders.
+            clock (Clock): Source of the current time, used to measure how late a delivery is.
         """
         self.email_sender = EMAIL_SENDER
         self.email_password = EMAIL_PASSWORD
-        self.pushbullet_api_key = PUSHBULLET_API_KEY
         self.db_manager = db_manager  # Avoids circular import issue
+        self.clock = clock
+        self.pushbullet = PushbulletClient(PUSHBULLET_API_KEY, clock=clock)
+        self.fanout = ChannelFanout()
+        # Connects lazily on the first email, then keeps the sessions for later batches
+        self.smtp_pool = SMTPSessionPool(self.email_sender, self.email_password, clock=clock)
 
-    def check_reminder(self, reminder: Dict[str, Any]) -> None:
+    @property
+    def pushbullet_api_key(self) -> str:
+        return self.pushbullet.api_key
+
+    @pushbullet_api_key.setter
+    def pushbullet_api_key(self, api_key: str) -> None:
+        self.pushbullet.api_key = api_key
+
+    def lateness(self, reminder: Dict[str, Any]) -> float:
         """
-        Checks if a reminder is due and sends notifications via desktop, email, and Pushbullet.
+        Seconds between the reminder's time and now (negative if early, 0 if the time is unreadable).
 
         Args:
-            reminder (Dict[str, Any]): The reminder details including id, title, time and email.
+            reminder (Dict[str, Any]): The reminder details including its time.
         """
-        reminder_id = reminder["id"]
-        title = "Reminder Notification"
-        message = f"⏰ Reminder: {reminder['title']} at {reminder['time']}"
+        try:
+            return self.clock.time() - to_epoch(parse_reminder_time(reminder["time"]))
+        except (KeyError, TypeError, ValueError):
+            return 0.0
 
-        print(f"   🔍 Due Reminder: \"{reminder['title']}\"")
+    @staticmethod
+    def compose(title: str, when: str) -> Tuple[str, str]:
+        """The notification title and message for a reminder occurrence."""
+        return "Reminder Notification", f"⏰ Reminder: {title} at {when}"
 
-        try:
-            self.send_desktop_notification(title, message)
+    def channels_for(self, reminder: Dict[str, Any]) -> List[Tuple[str, Optional[str]]]:
+        """
+        The (channel, recipient) pairs a reminder is sent on: desktop always, email when the
+        reminder has an address, Pushbullet when an API key is configured.
+        """
+        channels: List[Tuple[str, Optional[str]]] = [("desktop", None)]
+        if reminder.get("email"):
+            channels.append(("email", reminder["email"]))
+        if self.pushbullet_api_key:
+            channels.append(("pushbullet", None))
+        return channels
+
+    def send(self, channel: str, recipient: Optional[str], title: str, message: str) -> bool:
+        """
+        Sends on one channel.
+
+        Args:
+            channel (str): "desktop", "email" or "pushbullet".
+            recipient (Optional[str]): Email address (email only).
+            title (str): Notification title / email subject.
+            message (str): Notification message.
+
+        Returns:
+            bool: False if the send failed.
+
+        Raises:
+            ValueError: If the channel is unknown.
+        """
+        if channel == "desktop":
+            return self.send_desktop_notification(title, message)
+        if channel == "email":
+            return self.send_email_notification(recipient, title, message)
+        if channel == "pushbullet":
+            return self.send_pushbullet_notification(title, message)
+        raise ValueError(f"Unknown notification channel: {channel}")
+
+    def check_reminder(self, reminder: Dict[str, Any], update_status: bool = True) -> ReminderDelivery:
+        """
+        Checks if a reminder is due and sends notifications via desktop, email, and Pushbullet,
+        all channels at once (see ChannelFanout).
+
+        Args:
+            reminder (Dict[str, Any]): The reminder details including id, title, time and email.
+            update_status (bool): Mark the reminder as notified right away. The checker passes
+                False and writes the whole due batch in one transaction instead.
 
-            if reminder.get("email"):
-                self.send_email_notification(reminder["email"], title, message)
+        Returns:
+            ReminderDelivery: Per-channel results; true if every channel succeeded.
+        """
+        reminder_id = reminder["id"]
+        title, message = self.compose(reminder["title"], reminder["time"])
 
-            if self.pushbullet_api_key:
-                self.send_pushbullet_notification(title, message)
+        print(f"   🔍 Due Reminder: \"{reminder['title']}\"")
 
-            self.db_manager.update_reminder_status(reminder_id, notified=True)
+        sends = [(channel, self.send, (channel, recipient, title, message))
+                 for channel, recipient in self.channels_for(reminder)]
+        delivery = ReminderDelivery(reminder_id, reminder["title"], reminder["time"], self.fanout.run(sends))
 
+        try:
+            if update_status:
+                self.db_manager.update_reminder_status(reminder_id, notified=True)
         except Exception as e:
             logging.error(f"Error processing reminder '{reminder['title']}': {e}")
+            delivery.results.append(ChannelResult("status", False, error=str(e)))
+
+        lateness = self.lateness(reminder)
+        if lateness > LATE_DELIVERY_WARNING_SECONDS:
+            logging.warning(f"Reminder '{reminder['title']}' delivered {lateness / 60:.0f} min late")
+
+        return delivery
 
     @staticmethod
-    def send_desktop_notification(title: str, message: str) -> None:
+    def send_desktop_notification(title: str, message: str) -> bool:
         """
         Sends a desktop notification with the given title and message.
 
         Args:
             title (str): Notification title.
             message (str): Notification message.
+
+        Returns:
+            bool: True if the notification was shown.
         """
         try:
             notification.notify(
@@ -78,10 +158,12 @@ class NotificationService:
                 timeout=10
             )
             print("     📢 Desktop notification: Sent ✔️")
+            return True
         except Exception as e:
             logging.error(f"Failed to send desktop notification: {e}")
+            return False
 
-    def send_email_notification(self, recipient_email: Optional[str], subject: str, message: str) -> None:
+    def send_email_notification(self, recipient_email: Optional[str], subject: str, message: str) -> bool:
         """
         Sends an email notification to the specified recipient with the given subject and message.
 
@@ -89,10 +171,13 @@ class NotificationService:
             recipient_email (Optional[str]): Recipient's email address.
             subject (str): Email subject.
             message (str): Email content
+
+        Returns:
+            bool: False if the email could not be sent (a missing address is not a failure).
         """
         if not recipient_email or recipient_email.lower() == "none":
             print("⚠️ No email provided. Skipping email notification.")
-            return
+            return True
 
         try:
             msg = EmailMessage()
@@ -101,43 +186,53 @@ class NotificationService:
             msg["To"] = recipient_email
             msg.set_content(message)
 
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-                server.login(self.email_sender, self.email_password)
-                server.send_message(msg)
+            self.smtp_pool.send(msg)
 
             print(f"     📧 Email to {recipient_email}: Sent ✔️")
+            return True
         except Exception as e:
             logging.error(f"Error sending email to {recipient_email}: {e}")
+            return False
 
-    def send_pushbullet_notification(self, title: str, message: str) -> None:
+    def send_pushbullet_notification(self, title: str, message: str) -> bool:
         """
          Sends a Pushbullet notification.
 
          Args:
              title (str): Notification title
              message (str): Notification message.
+
+         Returns:
+             bool: False if the push was rejected or could not be sent (a missing API key is not a failure).
          """
 
         if not self.pushbullet_api_key:
             print("⚠️ Pushbullet API key missing. Skipping Pushbullet notification.")
-            return
+            return True
         try:
-            data = {"type": "note", "title": title, "body": message}
-            response = requests.post(
-                "https://api.pushbullet.com/v2/pushes",
-                data=json.dumps(data),
-                headers={
-                    "Access-Token": self.pushbullet_api_key,
-                    "Content-Type": "application/json",
-                },
-            )
+            response = self.pushbullet.push_note(title, message)
             if response.status_code == 200:
                 print(f"     🚀 Pushbullet notification: Sent ✔️")
-            else:
-                logging.error(f"Failed to send Pushbullet notification: {response.text}")
+                return True
+            logging.error(f"Failed to send Pushbullet notification: {response.text}")
+            return False
 
         except Exception as e:
             logging.error(f"Error sending Pushbullet notification: {e}")
+            return False
+
+    def send_digest(self, digest: Digest) -> bool:
+        """
+        Sends several due reminders to one address as a single email (see DigestCoalescer).
+
+        Args:
+            digest (Digest): The recipient and the occurrences it covers.
+
+        Returns:
+            bool: False if the email could not be sent.
+        """
+        subject, message = digest.render()
+        return self.send_email_notification(digest.recipient, subject, message)
 
     def notify_reminders(self, due_reminders: List[Dict]) -> None:
         """Sends notifications for due reminders.
@@ -157,4 +252,10 @@ class NotificationService:
             except Exception as e:
                 logging.error(f"Failed to send reminder '{reminder['title']}': {e}")
 
-        print("✅ All due reminders processed!")
\ No newline at end of file
+        print("✅ All due reminders processed!")
+
+    def close(self) -> None:
+        """Stops the fan-out workers, logs out of the pooled SMTP sessions and closes the Pushbullet connections."""
+        self.fanout.close()
+        self.smtp_pool.close()
+        self.pushbullet.close()
@@ -0,0 +1,246 @@
+# Vectorized expansion of recurring reminders into their occurrences within a time window
+
+import numpy as np
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from services.recurrence_rules import RecurrenceRule, compile_rule
+
+
+RECURRENCE_CODES = {"none": 0, "daily": 1, "weekly": 2, "monthly": 3, "yearly": 4}
+RULE_CODE = 5  # Weekday rules and multi-period months / years, stepped with their compiled rule
+FIXED_PERIOD_DAYS = {RECURRENCE_CODES["daily"]: 1, RECURRENCE_CODES["weekly"]: 7}
+
+ONE_SECOND = np.timedelta64(1, "s")
+ONE_DAY = np.timedelta64(1, "D")
+
+# After this many monthly steps the clamp has crossed two Februaries and is always 28
+MONTHLY_CLAMP_HORIZON = 24
+
+
+@dataclass
+class Occurrences:
+    """Array-backed expansion result, sorted by time (then reminder id)."""
+    reminder_ids: np.ndarray  # int64
+    times: np.ndarray         # datetime64[s], naive local time like reminder_time
+    steps: np.ndarray         # Periods after the stored reminder_time (0 = the stored occurrence itself)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def to_list(self) -> List[Tuple[int, datetime]]:
+        """(reminder id, occurrence) pairs as Python objects."""
+        return list(zip(self.reminder_ids.tolist(), self.times.astype("datetime64[us]").tolist()))
+
+    def formatted_times(self) -> np.ndarray:
+        """Occurrence times as 'YYYY-MM-DD HH:MM' strings."""
+        text = np.datetime_as_string(self.times, unit="m")
+        return np.char.replace(text, "T", " ") if len(text) else text
+
+
+def _ranges(first: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Flattens the ranges [first[i], first[i] + counts[i]) into (row index, value) arrays."""
+    rows = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return rows, first[rows] + offsets
+
+
+def _month_lengths(months: np.ndarray) -> np.ndarray:
+    """Days in each month, given months as integers counted from 1970-01."""
+    starts = months.astype("datetime64[M]")
+    return ((starts + 1).astype("datetime64[D]") - starts.astype("datetime64[D]")).astype(np.int64)
+
+
+def _month_parts(times: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Splits datetime64[s] values into (months since 1970-01, day of month, time of day)."""
+    months = times.astype("datetime64[M]")
+    days = times.astype("datetime64[D]")
+    day_of_month = (days - months.astype("datetime64[D]")).astype(np.int64) + 1
+    return months.astype(np.int64), day_of_month, times - days
+
+
+def _compose(months: np.ndarray, days: np.ndarray, time_of_day: np.ndarray) -> np.ndarray:
+    """Builds datetime64[s] values from months since 1970-01, day of month and time of day."""
+    dates = months.astype("datetime64[M]").astype("datetime64[D]") + (days - 1) * ONE_DAY
+    return dates.astype("datetime64[s]") + time_of_day
+
+
+class OccurrenceExpander:
+    """
+    Expands many reminders into every occurrence inside a window with NumPy array arithmetic.
+
+    - Daily and weekly rules are a start time plus a multiple of a fixed period.
+    - Monthly and yearly rules apply the same clamping as `ReminderScheduler.calculate_next_occurrence`
+      (a monthly reminder keeps the shortest day it was clamped to, a yearly Feb 29 becomes Feb 28),
+      so the expansion agrees with stepping one occurrence at a time.
+    - Daily and weekly rules with an interval stay vectorized (a longer fixed period); weekday
+      rules and monthly / yearly intervals are stepped with their compiled `RecurrenceRule`.
+    - Reminders are parsed once; `expand` can then be called for any number of windows.
+    """
+
+    def __init__(self, reminder_ids: Iterable[int], reminder_times: Iterable[str], recurrences: Iterable[str]) -> None:
+        """
+        Args:
+            reminder_ids (Iterable[int]): Reminder ids.
+            reminder_times (Iterable[str]): Stored reminder_time text (the next pending occurrence).
+            recurrences (Iterable[str]): Recurrence rules; unparseable values are treated as 'none'.
+        """
+        self.reminder_ids = np.fromiter(reminder_ids, dtype=np.int64)
+        self.starts = np.array(list(reminder_times), dtype=str).astype("datetime64[s]")
+        self.rules = [self._compile(recurrence) for recurrence in recurrences]
+        self.codes = np.array([self._code(rule) for rule in self.rules], dtype=np.int8)
+        self.intervals = np.array([rule.interval for rule in self.rules], dtype=np.int64)
+
+    @staticmethod
+    def _compile(recurrence: Optional[str]) -> RecurrenceRule:
+        try:
+            return compile_rule(recurrence)
+        except ValueError:
+            return RecurrenceRule()
+
+    @staticmethod
+    def _code(rule: RecurrenceRule) -> int:
+        """Which expansion path a rule takes."""
+        if rule.weekdays or (rule.freq in ("monthly", "yearly") and rule.interval != 1):
+            return RULE_CODE
+        return RECURRENCE_CODES[rule.freq]
+
+    @classmethod
+    def from_db(cls, db_manager: Any, before: Optional[int] = None) -> Tuple["OccurrenceExpander", dict]:
+        """
+        Loads every pending recurring reminder (optionally only those whose next occurrence
+        is before the epoch `before`).
+
+        Returns:
+            Tuple[OccurrenceExpander, dict]: The expander and an id -> title map.
+        """
+        query = """
+            SELECT id, title, reminder_time, recurrence FROM reminders
+            WHERE recurrence != 'none' AND notified = 0
+        """
+        params: Tuple[Any, ...] = ()
+        if before is not None:
+            query += " AND fire_at < ?"
+            params = (before,)
+
+        with db_manager.read() as conn:
+            rows = conn.execute(query, params).fetchall()
+        titles = {row[0]: row[1] for row in rows}
+        return cls((row[0] for row in rows), (row[2] for row in rows), (row[3] for row in rows)), titles
+
+    def __len__(self) -> int:
+        return len(self.reminder_ids)
+
+    def expand(self, start: datetime, end: datetime) -> Occurrences:
+        """
+        Every occurrence in the half-open window [start, end).
+
+        Args:
+            start (datetime): Window start (naive local time).
+            end (datetime): Window end (naive local time).
+
+        Returns:
+            Occurrences: Sorted by time, then reminder id.
+        """
+        low, high = np.datetime64(start, "s"), np.datetime64(end, "s")
+        parts = [self._expand_once(low, high)]
+        for code, days in FIXED_PERIOD_DAYS.items():
+            mask = self.codes == code
+            if mask.any():
+                parts.append(self._expand_fixed(mask, days, low, high))
+        for code, months in ((RECURRENCE_CODES["monthly"], 1), (RECURRENCE_CODES["yearly"], 12)):
+            mask = self.codes == code
+            if mask.any():
+                parts.append(self._expand_calendar(mask, months, low, high))
+        if (self.codes == RULE_CODE).any():
+            parts.append(self._expand_rules(low, high))
+
+        ids = np.concatenate([p[0] for p in parts])
+        times = np.concatenate([p[1] for p in parts])
+        steps = np.concatenate([p[2] for p in parts])
+
+        inside = (times >= low) & (times < high)
+        ids, times, steps = ids[inside], times[inside], steps[inside]
+        order = np.lexsort((ids, times))
+        return Occurrences(ids[order], times[order], steps[order])
+
+    def iter_expand(self, start: datetime, end: datetime, chunk: timedelta = timedelta(days=1)) -> Iterator[Occurrences]:
+        """Expands [start, end) one `chunk` at a time, so long windows never materialize at once."""
+        while start < end:
+            chunk_end = min(start + chunk, end)
+            yield self.expand(start, chunk_end)
+            start = chunk_end
+
+    def _expand_once(self, low: np.datetime64, high: np.datetime64) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """One-time reminders: just the stored occurrence."""
+        mask = self.codes == RECURRENCE_CODES["none"]
+        return self.reminder_ids[mask], self.starts[mask], np.zeros(mask.sum(), dtype=np.int64)
+
+    def _expand_fixed(self, mask: np.ndarray, period_days: int, low: np.datetime64,
+                      high: np.datetime64) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Daily / weekly: start + k * period for every k landing in the window."""
+        starts = self.starts[mask]
+        period = period_days * 86400 * self.intervals[mask]
+        to_low = (low - starts) // ONE_SECOND
+        to_high = (high - starts) // ONE_SECOND
+
+        first = np.maximum(0, -(-to_low // period))  # ceil division
+        last = -(-to_high // period) - 1              # last k with start + k * period < high
+        rows, steps = _ranges(first, np.maximum(0, last - first + 1))
+
+        times = starts[rows] + steps * period[rows] * ONE_SECOND
+        return self.reminder_ids[mask][rows], times, steps
+
+    def _expand_calendar(self, mask: np.ndarray, months_per_step: int, low: np.datetime64,
+                         high: np.datetime64) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Monthly (1 month per step) / yearly (12 months per step) with day-of-month clamping."""
+        starts = self.starts[mask]
+        month0, day0, time_of_day = _month_parts(starts)
+
+        low_month = low.astype("datetime64[M]").astype(np.int64)
+        high_month = (high - ONE_SECOND).astype("datetime64[M]").astype(np.int64)
+        first = np.maximum(0, -(-(low_month - month0) // months_per_step))
+        last = (high_month - month0) // months_per_step
+        rows, steps = _ranges(first, np.maximum(0, last - first + 1))
+
+        months = month0[rows] + steps * months_per_step
+        days = day0[rows]
+        if months_per_step == 12:
+            # Feb 29 -> Feb 28 on the first step, and it stays on the 28th after that
+            leap_day = (steps > 0) & (days == 29) & (months % 12 == 1)
+            days = np.where(leap_day, 28, days)
+        else:
+            days = np.minimum(days, self._monthly_clamp(month0, rows, steps))
+
+        return self.reminder_ids[mask][rows], _compose(months, days, time_of_day[rows]), steps
+
+    def _expand_rules(self, low: np.datetime64, high: np.datetime64) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Rules without a closed form over arrays: jump to the window with the rule, then step through it."""
+        window_start = low.astype(datetime)
+        window_end = high.astype(datetime)
+        ids, times, steps = [], [], []
+        for index in np.flatnonzero(self.codes == RULE_CODE).tolist():
+            rule, start = self.rules[index], self.starts[index].astype(datetime)
+            occurrence, step = start, 0
+            if start < window_start:
+                occurrence, step = rule.next_after(start, window_start - timedelta(seconds=1))
+            while occurrence < window_end:
+                ids.append(self.reminder_ids[index])
+                times.append(occurrence)
+                steps.append(step)
+                occurrence, step = rule.next(occurrence), step + 1
+
+        return (np.array(ids, dtype=np.int64), np.array(times, dtype="datetime64[s]"),
+                np.array(steps, dtype=np.int64))
+
+    @staticmethod
+    def _monthly_clamp(month0: np.ndarray, rows: np.ndarray, steps: np.ndarray) -> np.ndarray:
+        """Shortest month length crossed in `steps` monthly steps (31 for step 0, never clamping)."""
+        offsets = np.arange(1, MONTHLY_CLAMP_HORIZON)
+        shortest = np.minimum.accumulate(_month_lengths(month0[:, None] + offsets), axis=1)
+
+        clamp = np.full(len(steps), 28, dtype=np.int64)
+        clamp[steps == 0] = 31
+        near = (steps > 0) & (steps < MONTHLY_CLAMP_HORIZON)
+        clamp[near] = shortest[rows[near], steps[near] - 1]
+        return clamp
@@ -0,0 +1,502 @@
+# Durable delivery outbox: the checker queues sends, background workers drain them
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from config.settings import (
+    OUTBOX_WORKERS,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_POLL_INTERVAL,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_BACKOFF_BASE,
+    OUTBOX_BACKOFF_MAX,
+)
+from services.digest import Digest, DigestCoalescer
+from services.dispatch_scheduler import DispatchScheduler, DispatchStats
+from utils.clock import Clock, SYSTEM_CLOCK
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# (reminder_id, occurrence, channel, recipient, title, urgent)
+OutboxRow = Tuple[int, str, str, str, str, int]
+
+
+@dataclass
+class OutboxEntry:
+    """One queued send: a reminder occurrence on one channel (and recipient)."""
+    id: int
+    reminder_id: int
+    occurrence: str
+    channel: str
+    recipient: str
+    title: str
+    attempts: int = 0
+    urgent: bool = False
+
+    def as_item(self) -> Dict[str, Any]:
+        """The shape DigestCoalescer groups: an occurrence with its email address."""
+        return {"id": self.id, "title": self.title, "time": self.occurrence,
+                "email": self.recipient, "urgent": bool(self.urgent)}
+
+    def as_job(self) -> Dict[str, Any]:
+        """The shape DispatchScheduler paces: a single channel and recipient."""
+        return {"id": self.id, "title": self.title, "time": self.occurrence,
+                "channel": self.channel, "recipient": self.recipient or None}
+
+
+@dataclass
+class OutboxMetrics:
+    """Queue depth and outcome counts of the outbox table."""
+    ready: int = 0       # Pending and due now: the queue depth workers still have to drain
+    scheduled: int = 0   # Pending, waiting for a retry backoff to pass
+    in_flight: int = 0   # Claimed by a worker whose lease has not expired
+    sent: int = 0
+    dead: int = 0        # Gave up after OUTBOX_MAX_ATTEMPTS; see `replay`
+    oldest_ready_seconds: float = 0.0  # How long the oldest ready entry has waited
+
+    def __str__(self) -> str:
+        return (f"{self.ready} ready (oldest {self.oldest_ready_seconds:.0f}s), {self.scheduled} awaiting retry, "
+                f"{self.in_flight} in flight, {self.sent} sent, {self.dead} dead-lettered")
+
+
+class Outbox:
+    """
+    The `outbox` table: one row per (reminder, occurrence, channel, recipient) still to send.
+
+    - `enqueue` runs on the checker's cursor, so queued sends and the reminder's state
+      transition commit together: a crash leaves either both or neither.
+    - Workers `claim` ready rows under a lease, exactly like due reminders are claimed; a
+      worker that dies mid-send leaves rows that are picked up again once the lease expires.
+      Delivery is therefore at least once: a send that went out just before a crash is repeated.
+    - A failed send is retried with exponential backoff and dead-lettered after `max_attempts`;
+      `replay` puts dead (or already sent) rows back in the queue, e.g. after a provider outage.
+    """
+
+    def __init__(self, db_manager: Any, clock: Clock = SYSTEM_CLOCK, worker_id: Optional[str] = None,
+                 max_attempts: int = OUTBOX_MAX_ATTEMPTS, backoff_base: float = OUTBOX_BACKOFF_BASE,
+                 backoff_max: float = OUTBOX_BACKOFF_MAX) -> None:
+        """
+        Args:
+            db_manager (Any): Database holding the outbox table.
+            clock (Clock): Source of the current time.
+            worker_id (Optional[str]): Names this process in claimed rows (host:pid:random by default).
+            max_attempts (int): Failed sends before a row is dead-lettered.
+            backoff_base (float): Seconds before the first retry; doubled on every further attempt.
+            backoff_max (float): Longest wait between attempts.
+        """
+        self.db_manager = db_manager
+        self.clock = clock
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    @staticmethod
+    def rows_for(occurrences: Iterable[Dict[str, Any]],
+                 channels_for: Callable[[Dict[str, Any]], List[Tuple[str, Optional[str]]]]) -> List[OutboxRow]:
+        """
+        The outbox rows for due occurrences, one per channel.
+
+        Args:
+            occurrences (Iterable[Dict[str, Any]]): Occurrences to send (id, title, time, email, ...).
+            channels_for (Callable): (channel, recipient) pairs of one occurrence,
+                e.g. `NotificationService.channels_for`.
+
+        Returns:
+            List[OutboxRow]: (reminder_id, occurrence, channel, recipient, title, urgent) tuples.
+        """
+        return [(occurrence["id"], occurrence["time"], channel, recipient or "", occurrence["title"],
+                 int(bool(occurrence.get("urgent"))))
+                for occurrence in occurrences for channel, recipient in channels_for(occurrence)]
+
+    def enqueue(self, cursor: sqlite3.Cursor, rows: List[OutboxRow]) -> int:
+        """
+        Queues rows inside the caller's transaction; rows already queued are left alone.
+
+        Returns:
+            int: Number of rows added.
+        """
+        if not rows:
+            return 0
+        now = int(self.clock.time())
+        cursor.executemany("""
+            INSERT OR IGNORE INTO outbox (reminder_id, occurrence, channel, recipient, title, urgent,
+                                          next_attempt_at, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(*row, now, now) for row in rows])
+        return cursor.rowcount
+
+    def claim(self, limit: int = OUTBOX_BATCH_SIZE, lease_seconds: int = OUTBOX_LEASE_SECONDS) -> List[OutboxEntry]:
+        """
+        Claims up to `limit` ready rows for this worker, oldest first.
+
+        Returns:
+            List[OutboxEntry]: The claimed rows.
+        """
+        now = int(self.clock.time())
+        query = """
+        UPDATE outbox SET claimed_by = ?, lease_until = ?
+        WHERE id IN (
+            SELECT id FROM outbox
+            WHERE status = 'pending' AND next_attempt_at <= ? AND (lease_until IS NULL OR lease_until <= ?)
+            ORDER BY next_attempt_at, id LIMIT ?
+        )
+        RETURNING id, reminder_id, occurrence, channel, recipient, title, attempts, urgent
+        """
+        try:
+            with self.db_manager.transaction() as cursor:
+                rows = cursor.execute(query, (self.worker_id, now + lease_seconds, now, now, limit)).fetchall()
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (outbox claim): {e}")
+            return []
+        return [OutboxEntry(*row) for row in sorted(rows)]  # RETURNING has no defined order
+
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds to wait after the `attempts`-th failed send."""
+        return min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+
+    def complete(self, outcomes: List[Tuple[OutboxEntry, bool, Optional[str]]]) -> Tuple[int, int, int]:
+        """
+        Records the outcome of claimed sends in one transaction: successes are marked sent,
+        failures are rescheduled with backoff or dead-lettered once out of attempts.
+
+        Args:
+            outcomes (List[Tuple[OutboxEntry, bool, Optional[str]]]): (entry, ok, error) per send.
+
+        Returns:
+            Tuple[int, int, int]: Rows sent, rescheduled and dead-lettered.
+        """
+        now = int(self.clock.time())
+        sent, retried, dead = [], [], []
+        for entry, ok, error in outcomes:
+            if ok:
+                sent.append((now, entry.id, self.worker_id))
+                continue
+            attempts = entry.attempts + 1
+            if attempts >= self.max_attempts:
+                dead.append((attempts, error, entry.id, self.worker_id))
+            else:
+                retried.append((attempts, now + int(self.retry_delay(attempts)), error, entry.id, self.worker_id))
+
+        try:
+            with self.db_manager.transaction() as cursor:
+                # A row whose lease was taken over by another worker is no longer ours to finish
+                cursor.executemany(
+                    "UPDATE outbox SET status = 'sent', sent_at = ?, claimed_by = NULL, lease_until = NULL "
+                    "WHERE id = ? AND claimed_by = ?", sent)
+                cursor.executemany(
+                    "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, claimed_by = NULL, "
+                    "lease_until = NULL WHERE id = ? AND claimed_by = ?", retried)
+                cursor.executemany(
+                    "UPDATE outbox SET status = 'dead', attempts = ?, last_error = ?, claimed_by = NULL, "
+                    "lease_until = NULL WHERE id = ? AND claimed_by = ?", dead)
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (outbox complete): {e}")
+            return 0, 0, 0
+        return len(sent), len(retried), len(dead)
+
+    def renew(self, entry_ids: List[int], lease_seconds: int = OUTBOX_LEASE_SECONDS) -> set[int]:
+        """
+        Extends this worker's lease on claimed rows that are still pending.
+
+        Returns:
+            set[int]: The rows still held; the others were taken over after their lease expired.
+        """
+        if not entry_ids:
+            return set()
+        try:
+            with self.db_manager.transaction() as cursor:
+                rows = cursor.execute(
+                    f"UPDATE outbox SET lease_until = ? WHERE claimed_by = ? AND status = 'pending' "
+                    f"AND id IN ({', '.join('?' * len(entry_ids))}) RETURNING id",
+                    (int(self.clock.time()) + lease_seconds, self.worker_id, *entry_ids)).fetchall()
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (outbox renew): {e}")
+            return set(entry_ids)  # Keep going; `complete` still only finishes rows we hold
+        return {row[0] for row in rows}
+
+    def release(self, entry_ids: List[int]) -> None:
+        """Gives claimed rows back without sending them (e.g. on shutdown)."""
+        if not entry_ids:
+            return
+        self.db_manager.execute(
+            f"UPDATE outbox SET claimed_by = NULL, lease_until = NULL "
+            f"WHERE claimed_by = ? AND id IN ({', '.join('?' * len(entry_ids))})",
+            (self.worker_id, *entry_ids))
+
+    def replay(self, status: str = "dead", since: Optional[int] = None, reminder_id: Optional[int] = None) -> int:
+        """
+        Puts dead-lettered (or already sent) rows back in the queue with fresh attempts.
+
+        Args:
+            status (str): "dead" to retry what was given up on, "sent" to send again.
+            since (Optional[int]): Only rows queued at or after this epoch time.
+            reminder_id (Optional[int]): Only rows of this reminder.
+
+        Returns:
+            int: Number of rows queued again.
+
+        Raises:
+            ValueError: If `status` is not "dead" or "sent".
+        """
+        if status not in ("dead", "sent"):
+            raise ValueError("Only dead or sent outbox entries can be replayed")
+
+        where, params = ["status = ?"], [status]
+        if since is not None:
+            where.append("created_at >= ?")
+            params.append(since)
+        if reminder_id is not None:
+            where.append("reminder_id = ?")
+            params.append(reminder_id)
+
+        try:
+            with self.db_manager.transaction() as cursor:
+                cursor.execute(
+                    f"UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ?, last_error = NULL, "
+                    f"sent_at = NULL, claimed_by = NULL, lease_until = NULL WHERE {' AND '.join(where)}",
+                    (int(self.clock.time()), *params))
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (outbox replay): {e}")
+            return 0
+
+    def purge(self, before: int) -> int:
+        """
+        Deletes rows sent before `before` (epoch seconds); dead and pending rows are kept.
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        try:
+            with self.db_manager.transaction() as cursor:
+                cursor.execute("DELETE FROM outbox WHERE status = 'sent' AND sent_at < ?", (before,))
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (outbox purge): {e}")
+            return 0
+
+    def metrics(self) -> OutboxMetrics:
+        """Counts rows by state in one scan of the status index."""
+        now = int(self.clock.time())
+        query = """
+        SELECT
+            SUM(status = 'pending' AND next_attempt_at <= ? AND (lease_until IS NULL OR lease_until <= ?)),
+            SUM(status = 'pending' AND next_attempt_at > ?),
+            SUM(status = 'pending' AND lease_until > ?),
+            SUM(status = 'sent'),
+            SUM(status = 'dead'),
+            MIN(CASE WHEN status = 'pending' AND next_attempt_at <= ? AND (lease_until IS NULL OR lease_until <= ?)
+                     THEN next_attempt_at END)
+        FROM outbox
+        """
+        try:
+            row = self.db_manager.fetch_all(query, (now, now, now, now, now, now))[0]
+        except (sqlite3.Error, IndexError) as e:
+            print(f"❌ Database Error (outbox metrics): {e}")
+            return OutboxMetrics()
+        ready, scheduled, in_flight, sent, dead, oldest = (value or 0 for value in row)
+        return OutboxMetrics(ready, scheduled, in_flight, sent, dead, max(0.0, now - oldest) if oldest else 0.0)
+
+
+@dataclass
+class OutboxWorkerStats:
+    """What one worker did since start."""
+    batches: int = 0
+    sent: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+    dispatch: DispatchStats = field(default_factory=DispatchStats)  # Rate-limit queue waits
+
+
+class OutboxWorker:
+    """
+    Drains the outbox in the background.
+
+    - Claims a batch of ready rows, paces them through a DispatchScheduler (the same
+      per-channel / per-recipient token buckets as inline delivery) and sends up to
+      `workers` of them at once on a thread pool.
+    - A batch is no larger than the channel limits allow within half a lease (see
+      `claim_limit`), and the lease is renewed every half lease while the batch is paced,
+      so a slow per-recipient limit never lets another worker take over rows still queued here.
+    - Each row is sent on its own channel through `NotificationService.send`, except that
+      email rows of a batch for the same address are coalesced into digests (`send_digest`);
+      the outcomes of the batch are recorded in one transaction.
+    - Several workers, in threads or separate processes (`python main.py outbox work`),
+      can drain one database: claims keep them from sending the same row twice.
+    """
+
+    def __init__(self, outbox: Outbox, notification_service: Any, workers: int = OUTBOX_WORKERS,
+                 batch_size: int = OUTBOX_BATCH_SIZE, lease_seconds: int = OUTBOX_LEASE_SECONDS,
+                 poll_interval: float = OUTBOX_POLL_INTERVAL, dispatcher: Optional[DispatchScheduler] = None,
+                 coalescer: Optional[DigestCoalescer] = None) -> None:
+        """
+        Args:
+            outbox (Outbox): The queue to drain.
+            notification_service (Any): Sends one channel (`send`) and formats messages (`compose`).
+            workers (int): Sends in flight at once.
+            batch_size (int): Rows claimed per round trip.
+            lease_seconds (int): How long a claim is exclusive.
+            poll_interval (float): Seconds to wait when nothing is ready.
+            dispatcher (Optional[DispatchScheduler]): Rate limits; the configured ones when omitted.
+            coalescer (Optional[DigestCoalescer]): Email digest settings; the configured ones when omitted.
+        """
+        self.outbox = outbox
+        self.notification_service = notification_service
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.dispatcher = dispatcher or DispatchScheduler(clock=outbox.clock)
+        self.coalescer = coalescer or DigestCoalescer(outbox.db_manager)
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="outbox-worker")
+        self.stats = OutboxWorkerStats()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _send(self, entry: OutboxEntry) -> Tuple[bool, Optional[str]]:
+        title, message = self.notification_service.compose(entry.title, entry.occurrence)
+        try:
+            if self.notification_service.send(entry.channel, entry.recipient or None, title, message) is False:
+                return False, f"{entry.channel} send failed"
+            return True, None
+        except Exception as e:
+            logging.error(f"Error sending outbox entry {entry.id} ({entry.channel}): {e}")
+            return False, str(e)
+
+    def _send_digest(self, digest: Digest) -> Tuple[bool, Optional[str]]:
+        try:
+            if self.notification_service.send_digest(digest) is False:
+                return False, "email digest send failed"
+            return True, None
+        except Exception as e:
+            logging.error(f"Error sending email digest to {digest.recipient}: {e}")
+            return False, str(e)
+
+    def _coalesce(self, entries: List[OutboxEntry]) -> Tuple[List[OutboxEntry], List[Digest]]:
+        """Splits a batch into rows sent on their own and digests of email rows."""
+        emails = [entry for entry in entries if entry.channel == "email" and entry.recipient]
+        if not emails or not hasattr(self.notification_service, "send_digest"):
+            return entries, []
+        remaining, digests = self.coalescer.plan([entry.as_item() for entry in emails])
+        in_digest = {item["id"] for item in remaining if item["email"] is None}
+        return [entry for entry in entries if entry.id not in in_digest], digests
+
+    def claim_limit(self) -> int:
+        """
+        Rows to claim at once: `batch_size`, but no more than the rate limits let us send in
+        half a lease (as `ReminderScheduler.claim_limit`).
+        """
+        budget = self.dispatcher.budget(self.lease_seconds / 2)
+        return self.batch_size if budget is None else max(1, min(self.batch_size, budget))
+
+    def drain_once(self) -> int:
+        """
+        Claims one batch, sends it and records the outcomes.
+
+        Returns:
+            int: Number of rows processed (0 when nothing was ready).
+        """
+        entries = self.outbox.claim(self.claim_limit(), self.lease_seconds)
+        if not entries:
+            return 0
+
+        by_id = {entry.id: entry for entry in entries}
+        singles, digests = self._coalesce(entries)
+        pending, pending_digests = [], []
+        lease = {"held": set(by_id), "renewed_at": self.outbox.clock.time()}
+
+        def holding(entry_ids: List[int]) -> bool:
+            """Renews the batch's lease every half lease; False for rows another worker took over."""
+            now = self.outbox.clock.time()
+            if now - lease["renewed_at"] >= self.lease_seconds / 2:
+                lease["held"] = self.outbox.renew(sorted(lease["held"]), self.lease_seconds)
+                lease["renewed_at"] = now
+            return all(entry_id in lease["held"] for entry_id in entry_ids)
+
+        def submit(job: Dict[str, Any]) -> None:
+            if "digest" in job:
+                if holding([item["id"] for item in job["digest"].items]):
+                    pending_digests.append((job["digest"], self.pool.submit(self._send_digest, job["digest"])))
+                return
+            entry = by_id[job["id"]]
+            if holding([entry.id]):
+                pending.append((entry, self.pool.submit(self._send, entry)))
+
+        jobs = [entry.as_job() for entry in singles] + [digest.as_job() for digest in digests]
+        run = self.dispatcher.dispatch(jobs, submit, self.notification_service)
+        outcomes = []
+        for entry, future in pending:
+            ok, error = future.result()
+            outcomes.append((entry, ok, error))
+        for digest, future in pending_digests:
+            # Every row in the digest shares its outcome
+            ok, error = future.result()
+            outcomes.extend((by_id[item["id"]], ok, error) for item in digest.items)
+
+        # Rows skipped because part of their digest was taken over go back to the queue
+        self.outbox.release(sorted(lease["held"] - {entry.id for entry, _, _ in outcomes}))
+        sent, retried, dead = self.outbox.complete(outcomes)
+        self.stats.batches += 1
+        self.stats.sent += sent
+        self.stats.retried += retried
+        self.stats.dead_lettered += dead
+        self.stats.dispatch.sent += run.sent
+        self.stats.dispatch.failed += retried + dead
+        self.stats.dispatch.delayed += run.delayed
+        self.stats.dispatch.total_wait += run.total_wait
+        self.stats.dispatch.max_wait = max(self.stats.dispatch.max_wait, run.max_wait)
+        if retried or dead:
+            print(f"⚠️ Outbox: {sent} sent, {retried} rescheduled, {dead} dead-lettered")
+        return len(entries)
+
+    def drain(self) -> int:
+        """
+        Sends everything that is ready now (rows waiting for a retry backoff are left).
+
+        Returns:
+            int: Number of rows processed.
+        """
+        total = 0
+        while not self._stop.is_set():
+            processed = self.drain_once()
+            if not processed:
+                break
+            total += processed
+        return total
+
+    def run(self) -> None:
+        """Drains the outbox until `stop` is called, polling every `poll_interval` seconds when idle."""
+        while not self._stop.is_set():
+            if not self.drain():
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> threading.Thread:
+        """Runs the worker on a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="outbox-drain", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stops after the batch in progress and waits for it.
+
+        Returns:
+            bool: False if the batch was still running after `timeout`.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def close(self) -> None:
+        """Stops the worker and its send threads."""
+        self.stop()
+        self.pool.shutdown(wait=True)
@@ -0,0 +1,135 @@
+# Pushbullet API client: one keep-alive HTTP session with timeouts and retries
+
+import json
+import logging
+import requests
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from config.settings import (
+    PUSHBULLET_BASE_URL,
+    PUSHBULLET_CONNECT_TIMEOUT,
+    PUSHBULLET_READ_TIMEOUT,
+    PUSHBULLET_MAX_RETRIES,
+    PUSHBULLET_BACKOFF_BASE,
+    PUSHBULLET_BACKOFF_MAX,
+    PUSHBULLET_POOL_SIZE,
+)
+from utils.clock import Clock, SYSTEM_CLOCK
+from typing import Any, Dict, Optional
+
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class PushbulletClient:
+    """
+    Sends pushes over one pooled `requests.Session`.
+
+    - Connections are kept alive and reused across pushes (up to PUSHBULLET_POOL_SIZE per host).
+    - Every request has a connect and a read timeout, so a hung endpoint costs at most
+      PUSHBULLET_CONNECT_TIMEOUT + PUSHBULLET_READ_TIMEOUT per attempt instead of stalling the checker.
+    - 429 and 5xx responses and failed connections are retried up to PUSHBULLET_MAX_RETRIES
+      times with exponential backoff, waiting `Retry-After` instead when the server sends it
+      (a `Retry-After` longer than PUSHBULLET_BACKOFF_MAX gives up rather than block the checker).
+      Read timeouts are not retried: the push may have gone through.
+    - The base URL is configurable, so a local HTTP stub can stand in for api.pushbullet.com.
+    """
+
+    def __init__(self, api_key: str, base_url: str = PUSHBULLET_BASE_URL,
+                 connect_timeout: float = PUSHBULLET_CONNECT_TIMEOUT, read_timeout: float = PUSHBULLET_READ_TIMEOUT,
+                 max_retries: int = PUSHBULLET_MAX_RETRIES, backoff_base: float = PUSHBULLET_BACKOFF_BASE,
+                 backoff_max: float = PUSHBULLET_BACKOFF_MAX, clock: Clock = SYSTEM_CLOCK,
+                 session: Optional[requests.Session] = None) -> None:
+        """
+        Args:
+            api_key (str): Pushbullet access token.
+            base_url (str): API root, e.g. "https://api.pushbullet.com/v2".
+            connect_timeout (float): Seconds to wait for a connection.
+            read_timeout (float): Seconds to wait for the response.
+            max_retries (int): Retries after the first attempt.
+            backoff_base (float): First backoff delay; doubled on every retry.
+            backoff_max (float): Longest wait between attempts, `Retry-After` included.
+            clock (Clock): Sleeps between attempts.
+            session (Optional[requests.Session]): Session to use instead of a new one.
+        """
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PUSHBULLET_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self.retries = 0  # Retried attempts since start
+
+    def retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        Seconds to wait before retry number `attempt` (1-based): the server's `Retry-After`
+        (seconds or an HTTP date) when present, otherwise exponential backoff capped at `backoff_max`.
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - self.clock.time()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return max(delay, 0.0)
+        return min(self.backoff_base * 2 ** (attempt - 1), self.backoff_max)
+
+    def request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """
+        Calls the API, retrying throttled / failed attempts.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Path below the base URL, e.g. "/pushes".
+            payload (Optional[Dict[str, Any]]): JSON body.
+
+        Returns:
+            requests.Response: The last response (check `status_code`; retries may have run out).
+
+        Raises:
+            requests.RequestException: If the last attempt failed without a response.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        headers = {"Access-Token": self.api_key, "Content-Type": "application/json"}
+        data = json.dumps(payload) if payload is not None else None
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, data=data, headers=headers, timeout=self.timeout)
+            except requests.ConnectionError:  # Includes ConnectTimeout, not ReadTimeout
+                if attempt >= self.max_retries:
+                    raise
+                response = None
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+
+            delay = self.retry_delay(attempt + 1, response)
+            if delay > self.backoff_max:
+                logging.warning(f"Pushbullet {method} {path}: asked to retry in {delay:.0f}s, giving up")
+                return response
+            attempt += 1
+            self.retries += 1
+            reason = response.status_code if response is not None else "connection failed"
+            logging.warning(f"Pushbullet {method} {path}: {reason}, retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            self.clock.sleep(delay)
+
+    def push_note(self, title: str, body: str) -> requests.Response:
+        """Pushes a note to every device of the account."""
+        return self.request("POST", "/pushes", {"type": "note", "title": title, "body": body})
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,327 @@
+# Compiled recurrence rules: parsed once per rule text, evaluated without re-parsing
+
+import calendar
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from math import gcd
+from typing import Optional, Tuple
+from config.settings import RECURRENCE_CACHE_SIZE
+
+
+FREQUENCIES = ("none", "daily", "weekly", "monthly", "yearly")
+WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+WEEKDAY_NAMES = {
+    **{name: index for index, name in enumerate(("mon", "tue", "wed", "thu", "fri", "sat", "sun"))},
+    **{name: index for index, name in enumerate(("monday", "tuesday", "wednesday", "thursday",
+                                                  "friday", "saturday", "sunday"))},
+    "tues": 1, "wed": 2, "thur": 3, "thurs": 3,
+}
+WEEKDAY_GROUPS = {"weekdays": (0, 1, 2, 3, 4), "weekends": (5, 6)}
+ORDINALS = {"first": 1, "1st": 1, "second": 2, "2nd": 2, "third": 3, "3rd": 3, "fourth": 4, "4th": 4, "last": -1}
+UNITS = {"day": "daily", "week": "weekly", "month": "monthly", "year": "yearly"}
+MAX_INTERVAL = 999
+
+# Average period of each frequency, only used to estimate how many steps to jump
+MEAN_PERIOD_DAYS = {"daily": 1.0, "weekly": 7.0, "monthly": 30.436875, "yearly": 365.2425}
+
+EVERY_PATTERN = re.compile(r"every\s+(?:(\d+)\s+)?(day|week|month|year)s?(?:\s+on\s+(.+))?")
+NTH_WEEKDAY_PATTERN = re.compile(r"(\w+)\s+(\w+)\s+of\s+(?:the|each|every)\s+(?:(\d+)\s+)?months?")
+BYDAY_PATTERN = re.compile(r"([+-]?\d)?(MO|TU|WE|TH|FR|SA|SU)")
+
+
+MONTH_LENGTHS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _month_length(year: int, month: int) -> int:
+    """Days in a month (cheaper than calendar.monthrange in the clamping loop)."""
+    return 29 if month == 2 and calendar.isleap(year) else MONTH_LENGTHS[month - 1]
+
+
+def _add_months(year: int, month: int, months: int) -> Tuple[int, int]:
+    """(year, month) moved forward by `months`."""
+    year_offset, month_index = divmod(month - 1 + months, 12)
+    return year + year_offset, month_index + 1
+
+
+@lru_cache(maxsize=4096)
+def _shortest_visited_month(interval: int, year: int, month: int, steps: int) -> int:
+    """Length of the shortest month a monthly rule visits in `steps` steps of `interval` months after (year, month)."""
+    cycle = 12 // gcd(interval, 12)  # Steps until the visited month-of-year repeats
+    shortest = 31
+    for step in range(1, steps + 1):
+        shortest = min(shortest, _month_length(*_add_months(year, month, step * interval)))
+        # 28 cannot get shorter; after a full cycle without February nothing shorter than 30 is visited
+        if shortest == 28 or (step >= cycle and shortest >= 30):
+            break
+    return shortest
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """
+    A parsed recurrence rule. Instances are immutable and shared through `compile_rule`'s cache.
+
+    - daily / weekly / monthly / yearly every `interval` periods. Without weekdays the stored
+      reminder time is the anchor: monthly keeps the shortest day it was clamped to and a
+      yearly Feb 29 falls back to Feb 28, exactly like the original five recurrence types.
+    - weekly with `weekdays`: every listed day of every `interval`-th week, counted from the
+      week of the stored reminder time.
+    - monthly with one weekday and `nth`: the nth (1-4) or nth-from-last (-1 to -4) weekday
+      of every `interval`-th month.
+    """
+    freq: str = "none"
+    interval: int = 1
+    weekdays: Tuple[int, ...] = ()  # 0 = Monday, sorted
+    nth: int = 0  # Monthly only
+
+    def __post_init__(self) -> None:
+        if self.freq not in FREQUENCIES:
+            raise ValueError(f"unknown frequency '{self.freq}'")
+        if not 1 <= self.interval <= MAX_INTERVAL:
+            raise ValueError(f"interval must be between 1 and {MAX_INTERVAL}")
+        if list(self.weekdays) != sorted(set(self.weekdays)) or any(not 0 <= day <= 6 for day in self.weekdays):
+            raise ValueError("weekdays must be distinct days of the week")
+        if self.freq == "none" and (self.interval != 1 or self.weekdays):
+            raise ValueError("'none' takes no interval or weekdays")
+        if self.weekdays and self.freq not in ("weekly", "monthly"):
+            raise ValueError("weekdays only apply to weekly and monthly rules")
+        if self.freq == "monthly" and self.weekdays:
+            if len(self.weekdays) != 1 or self.nth not in (1, 2, 3, 4, -1, -2, -3, -4):
+                raise ValueError("monthly rules take one weekday with a position of 1-4 or -1 (last) to -4")
+        elif self.nth:
+            raise ValueError("a weekday position only applies to monthly rules")
+
+    def serialize(self) -> str:
+        """Compact stored form: the plain frequency name when that says everything, RRULE text otherwise."""
+        if self.freq == "none" or (self.interval == 1 and not self.weekdays):
+            return self.freq
+        return self.to_rrule()
+
+    def to_rrule(self) -> str:
+        """iCalendar RRULE value (without the 'RRULE:' prefix); empty for 'none'."""
+        if self.freq == "none":
+            return ""
+        parts = [f"FREQ={self.freq.upper()}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.weekdays:
+            position = str(self.nth) if self.nth else ""
+            parts.append("BYDAY=" + ",".join(position + WEEKDAY_CODES[day] for day in self.weekdays))
+        return ";".join(parts)
+
+    def _nth_weekday(self, anchor: datetime, year: int, month: int) -> datetime:
+        """The rule's weekday of (year, month), at the anchor's time of day."""
+        first_weekday, length = date(year, month, 1).weekday(), _month_length(year, month)
+        weekday = self.weekdays[0]
+        if self.nth > 0:
+            day = 1 + (weekday - first_weekday) % 7 + 7 * (self.nth - 1)
+        else:
+            last_weekday = (first_weekday + length - 1) % 7
+            day = length - (last_weekday - weekday) % 7 + 7 * (self.nth + 1)
+        return anchor.replace(year=year, month=month, day=day)
+
+    def _on_rule(self, reminder_time: datetime) -> bool:
+        """True if `reminder_time` is itself one of the rule's weekdays."""
+        if self.freq == "weekly":
+            return reminder_time.weekday() in self.weekdays
+        return self._nth_weekday(reminder_time, reminder_time.year, reminder_time.month) == reminder_time
+
+    def next(self, reminder_time: datetime) -> Optional[datetime]:
+        """
+        The occurrence following `reminder_time`.
+
+        Args:
+            reminder_time (datetime): The current occurrence.
+
+        Returns:
+            Optional[datetime]: The next occurrence, or None for 'none'.
+        """
+        return self.advance(reminder_time, 1)
+
+    def advance(self, reminder_time: datetime, steps: int) -> Optional[datetime]:
+        """
+        The occurrence `steps` occurrences after `reminder_time`, in constant time for fixed periods
+        and weekday rules (monthly clamping looks at no more than a few years of months).
+
+        Args:
+            reminder_time (datetime): The current occurrence.
+            steps (int): Number of occurrences to move forward (0 returns `reminder_time`).
+
+        Returns:
+            Optional[datetime]: The occurrence, or None for 'none'.
+        """
+        if steps == 0:
+            return reminder_time
+        if self.freq == "none":
+            return None
+        if self.freq == "daily":
+            return reminder_time + timedelta(days=self.interval * steps)
+        if self.freq == "weekly" and not self.weekdays:
+            return reminder_time + timedelta(weeks=self.interval * steps)
+
+        if self.weekdays and not self._on_rule(reminder_time):
+            # A stored time off the rule counts as part of its period; its first occurrence anchors the rest
+            reminder_time, steps = self._first_on_rule(reminder_time), steps - 1
+            if steps == 0:
+                return reminder_time
+
+        if self.freq == "weekly":
+            weeks, index = divmod(self.weekdays.index(reminder_time.weekday()) + steps, len(self.weekdays))
+            monday = reminder_time - timedelta(days=reminder_time.weekday())
+            return monday + timedelta(days=7 * self.interval * weeks + self.weekdays[index])
+
+        if self.freq == "monthly":
+            year, month = _add_months(reminder_time.year, reminder_time.month, self.interval * steps)
+            if self.weekdays:
+                return self._nth_weekday(reminder_time, year, month)
+            day = min(reminder_time.day, _shortest_visited_month(self.interval, reminder_time.year, reminder_time.month, steps))
+            return reminder_time.replace(year=year, month=month, day=day)
+
+        # Yearly: Feb 29 moves to Feb 28 (for good) at the first non-leap year visited
+        day = reminder_time.day
+        if (reminder_time.month, day) == (2, 29):
+            if any(not calendar.isleap(reminder_time.year + step * self.interval) for step in range(1, steps + 1)):
+                day = 28
+        return reminder_time.replace(year=reminder_time.year + self.interval * steps, day=day)
+
+    def _first_on_rule(self, reminder_time: datetime) -> datetime:
+        """First occurrence after an off-rule `reminder_time`, looking in its own week / month first."""
+        if self.freq == "weekly":
+            later = [day for day in self.weekdays if day > reminder_time.weekday()]
+            if later:
+                return reminder_time + timedelta(days=later[0] - reminder_time.weekday())
+            monday = reminder_time - timedelta(days=reminder_time.weekday())
+            return monday + timedelta(days=7 * self.interval + self.weekdays[0])
+
+        candidate = self._nth_weekday(reminder_time, reminder_time.year, reminder_time.month)
+        if candidate > reminder_time:
+            return candidate
+        return self._nth_weekday(reminder_time, *_add_months(reminder_time.year, reminder_time.month, self.interval))
+
+    def next_after(self, reminder_time: datetime, now: datetime) -> Tuple[Optional[datetime], int]:
+        """
+        Jump straight to the first occurrence later than `now` (at least one step past `reminder_time`).
+
+        Args:
+            reminder_time (datetime): The occurrence that came due.
+            now (datetime): Current time.
+
+        Returns:
+            Tuple[Optional[datetime], int]: The occurrence (None for 'none') and the number of steps taken.
+        """
+        if self.freq == "none":
+            return None, 0
+
+        period = timedelta(days=MEAN_PERIOD_DAYS[self.freq] * self.interval / max(1, len(self.weekdays)))
+        steps = max(1, int((now - reminder_time) / period))
+        # The estimate is within a step or two; walk to the exact answer with constant-time jumps
+        while steps > 1 and self.advance(reminder_time, steps - 1) > now:
+            steps -= 1
+        while (occurrence := self.advance(reminder_time, steps)) <= now:
+            steps += 1
+        return occurrence, steps
+
+
+def _parse_weekdays(text: str) -> Tuple[int, ...]:
+    """'mon, thu', 'tue and fri' or 'weekdays' -> sorted weekday numbers."""
+    days = set()
+    for token in re.split(r"[\s,/&]+|\band\b", text):
+        if not token:
+            continue
+        if token in WEEKDAY_GROUPS:
+            days.update(WEEKDAY_GROUPS[token])
+        elif token in WEEKDAY_NAMES:
+            days.add(WEEKDAY_NAMES[token])
+        else:
+            raise ValueError(f"unknown weekday '{token}'")
+    return tuple(sorted(days))
+
+
+def _parse_rrule(text: str) -> RecurrenceRule:
+    """FREQ=...;INTERVAL=...;BYDAY=... (case-insensitive, optional 'RRULE:' prefix)."""
+    fields = {}
+    for part in text.upper().removeprefix("RRULE:").split(";"):
+        key, _, value = part.partition("=")
+        if key not in ("FREQ", "INTERVAL", "BYDAY") or not value:
+            raise ValueError(f"unsupported rule part '{part}'")
+        fields[key] = value
+
+    freq = fields.get("FREQ", "").lower()
+    interval = fields.get("INTERVAL", "1")
+    if not interval.isdigit():
+        raise ValueError("INTERVAL must be a positive number")
+
+    weekdays, positions = [], set()
+    for item in filter(None, fields.get("BYDAY", "").split(",")):
+        match = BYDAY_PATTERN.fullmatch(item)
+        if not match:
+            raise ValueError(f"unknown BYDAY value '{item}'")
+        positions.add(int(match.group(1) or 0))
+        weekdays.append(WEEKDAY_CODES.index(match.group(2)))
+    if len(positions) > 1:
+        raise ValueError("all BYDAY values must share one position")
+
+    return RecurrenceRule(freq, int(interval), tuple(sorted(set(weekdays))), positions.pop() if positions else 0)
+
+
+def _parse_phrase(text: str) -> RecurrenceRule:
+    """'every 2 weeks on mon,thu', 'every 3 days', 'last fri of every month', '2nd tue of every 2 months'."""
+    text = " ".join(text.split())
+    if match := EVERY_PATTERN.fullmatch(text):
+        count, unit, days = match.groups()
+        freq = UNITS[unit]
+        weekdays = _parse_weekdays(days) if days else ()
+        if weekdays and freq == "daily":
+            if count:
+                raise ValueError("use weeks with weekdays, e.g. 'every 2 weeks on mon'")
+            freq = "weekly"  # "every day on weekdays" is every week on those days
+        return RecurrenceRule(freq, int(count or 1), weekdays)
+
+    if match := NTH_WEEKDAY_PATTERN.fullmatch(text):
+        position, day, count = match.groups()
+        if position not in ORDINALS or day not in WEEKDAY_NAMES:
+            raise ValueError(f"cannot read '{text}'")
+        return RecurrenceRule("monthly", int(count or 1), (WEEKDAY_NAMES[day],), ORDINALS[position])
+
+    raise ValueError(f"cannot read '{text}'")
+
+
+@lru_cache(maxsize=RECURRENCE_CACHE_SIZE)
+def compile_rule(text: Optional[str]) -> RecurrenceRule:
+    """
+    Parses a recurrence into a shared, immutable rule. Results are cached by the exact text,
+    so scheduling passes over the whole table parse each distinct rule once.
+
+    Accepted forms:
+        - none / daily / weekly / monthly / yearly
+        - RRULE text: "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH", "FREQ=MONTHLY;BYDAY=-1FR"
+        - Phrases: "every 2 weeks on mon,thu", "every 3 days", "last fri of every month"
+
+    Args:
+        text (Optional[str]): The rule text; empty or None means 'none'.
+
+    Returns:
+        RecurrenceRule: The compiled rule.
+
+    Raises:
+        ValueError: If the text is not a supported rule.
+    """
+    source = (text or "none").strip()
+    lowered = source.lower()
+    if lowered in FREQUENCIES:
+        return RecurrenceRule(lowered)
+    if "=" in source:
+        return _parse_rrule(source)
+    return _parse_phrase(lowered)
+
+
+def normalize_recurrence(text: Optional[str]) -> str:
+    """
+    The stored form of a recurrence (see `RecurrenceRule.serialize`).
+
+    Raises:
+        ValueError: If the text is not a supported rule.
+    """
+    return compile_rule(text).serialize()
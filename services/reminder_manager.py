@@ -1,11 +1,37 @@
 # Core logic for handling reminders CRUD
 
-from pushbullet import Pushbullet
-from config.settings import EMAIL_SENDER, EMAIL_PASSWORD
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+import numpy as np
+from config.settings import EMAIL_SENDER, EMAIL_PASSWORD, IMPORT_CHUNK_SIZE, DB_PAGE_SIZE, MISSED_FIRE_POLICY
 from utils.validation_utils import *
+from utils.time_utils import parse_reminder_time, to_epoch, from_epoch, day_range, month_range, year_range
 from database.db_manager import DBManager
-from typing import Optional
+from typing import Optional, Iterable, Any, List, Tuple, Callable
 from services.scheduler_service import ReminderScheduler
+from services.occurrence_expander import OccurrenceExpander
+from services.recurrence_rules import normalize_recurrence
+from services.upcoming_window import UpcomingWindow
+from services.pushbullet_client import PushbulletClient
+
+
+@dataclass
+class ImportReport:
+    """Outcome of a bulk import: counts, per-row errors and throughput."""
+    rows_read: int = 0
+    rows_inserted: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)  # (row number, message)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.rows_inserted}/{self.rows_read} rows imported, {len(self.errors)} rejected "
+                f"in {self.seconds:.2f}s ({self.rows_per_second:,.0f} rows/sec)")
 
 
 class ReminderManager:
@@ -16,19 +42,39 @@ class ReminderManager:
 
         self.db_manager = db_manager
         self.scheduler = scheduler
-
-        # Initialize Pushbullet
-        try:
-            self.pb = Pushbullet(pushbullet_api_key) if pushbullet_api_key else None
-        except Exception as e:
-            print(f"❌ Error initializing Pushbullet: {e}")
-            self.pb = None
+        self.page_size = DB_PAGE_SIZE  # Reminders per page in the CLI listings
+        self.listeners: List[Callable[[str, Optional[int]], None]] = []  # See add_listener
+        if scheduler is not None:
+            self.add_listener(scheduler.upcoming_window.on_reminder_event)
+
+        # Pushbullet: reuse the notification service's client (one keep-alive session) when there is one
+        notification_service = getattr(scheduler, "notification_service", None)
+        if notification_service is not None and notification_service.pushbullet_api_key == pushbullet_api_key:
+            self.pb = notification_service.pushbullet
+        else:
+            self.pb = PushbulletClient(pushbullet_api_key) if pushbullet_api_key else None
 
         # Email Credentials
         self.email_address = EMAIL_SENDER
         self.email_password = EMAIL_PASSWORD
 
-    def add_reminder(self, title: str, description: str, reminder_time: str, email: Optional[str] = None, recurrence: str ="none") -> None:
+    def add_listener(self, listener: Callable[[str, Optional[int]], None]) -> None:
+        """
+        Registers a callback run after every committed change, e.g. EventScheduler.on_reminder_event.
+
+        Args:
+            listener (Callable[[str, Optional[int]], None]): Called with the event ("added", "updated",
+                "deleted" or "bulk_added") and the reminder id (None for bulk changes).
+        """
+        self.listeners.append(listener)
+
+    def _emit(self, event: str, reminder_id: Optional[int] = None) -> None:
+        """Tells every listener about a committed change."""
+        for listener in self.listeners:
+            listener(event, reminder_id)
+
+    def add_reminder(self, title: str, description: str, reminder_time: str, email: Optional[str] = None, recurrence: str ="none",
+                     missed_fire_policy: str = MISSED_FIRE_POLICY, urgent: bool = False) -> bool:
         """
         Adds a new reminder.
 
@@ -37,22 +83,223 @@ class ReminderManager:
             description (str): Reminder description.
             reminder_time (str): Date and time of the reminder (format: "%Y-%m-%d %H:%M").
             email (Optional[str]): Email for sending the reminder. Defaults to None.
-            recurrence (str): Recurrence pattern. Defaults to "none".
+            recurrence (str): Recurrence type or rule (see `compile_rule`), stored in its normalized form.
+                Defaults to "none".
+            missed_fire_policy (str): What to send for occurrences missed while nothing was running:
+                "once", "all" or "skip".
+            urgent (bool): Mark as urgent; addresses that opted out of digests for urgent
+                reminders get it as its own email.
 
-        Raises:
-            Exception: If date-time format validation or database insertion fails.
+        Returns:
+            bool: True if the reminder was stored. A duplicate title (case-insensitive) is rejected
+            by the unique index and reported as a validation error.
         """
 
         try:
-            datetime.strptime(reminder_time, "%Y-%m-%d %H:%M")  # Validate format
+            recurrence = normalize_recurrence(recurrence)
+        except ValueError as e:
+            print(f"❌ Invalid recurrence ({e}).")
+            return False
+
+        try:
+            reminder_dt = datetime.strptime(reminder_time, "%Y-%m-%d %H:%M")  # Validate format
             query = """
-                INSERT INTO reminders (title, description, reminder_time, email, recurrence)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO reminders (title, description, reminder_time, email, recurrence, fire_at, missed_fire_policy, urgent)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """
-            self.db_manager.execute(query, (title, description, reminder_time, email, recurrence))
+            with self.db_manager.transaction() as cursor:
+                cursor.execute(query, (title, description, reminder_time, email, recurrence, to_epoch(reminder_dt),
+                                       missed_fire_policy, int(urgent)))
+                reminder_id = cursor.lastrowid
+            self._emit("added", reminder_id)
             print(f"✅ Reminder added: {title} at {reminder_time} {'for ' + email if email else ''} (Recurrence: {recurrence})")
+            return True
         except ValueError:
             print("❌ Invalid date-time format. Use YYYY-MM-DD HH:MM.")
+        except sqlite3.IntegrityError:
+            print("❌ Title must be unique. This title is already in use.")
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (add_reminder): {e}")
+        return False
+
+    def add_reminders(self, records: Iterable[Any], chunk_size: int = IMPORT_CHUNK_SIZE) -> ImportReport:
+        """
+        Bulk-adds reminders without prompting.
+
+        Records are validated as they stream in and written one chunk at a time with
+        `executemany` inside a single transaction. Titles already in use are found with
+        one indexed lookup per chunk. Invalid rows are skipped and listed in the report
+        together with their 1-based row number.
+
+        Args:
+            records (Iterable[Any]): Mappings with title, description, reminder_time, email, recurrence
+                and optional missed_fire_policy / urgent.
+            chunk_size (int): Rows per transaction.
+
+        Returns:
+            ImportReport: Counts, per-row errors, and rows per second.
+        """
+        report = ImportReport()
+        started = time.perf_counter()
+        query = """
+            INSERT INTO reminders (title, description, reminder_time, email, recurrence, fire_at, missed_fire_policy, urgent)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+
+        numbered = enumerate(records, start=1)
+        while chunk := list(islice(numbered, chunk_size)):
+            batch, batch_rows = [], []
+            parsed = [(row_number, *parse_reminder_record(record)) for row_number, record in chunk]
+            report.rows_read += len(parsed)
+            # Titles in use, plus those taken by earlier rows of this chunk
+            taken = self.taken_titles([reminder["title"] for _, reminder, errors in parsed if not errors])
+            for row_number, reminder, errors in parsed:
+                if not errors and fold_title(reminder["title"]) in taken:
+                    errors = ["Title must be unique. This title is already in use."]
+                if errors:
+                    report.errors.append((row_number, " ".join(errors)))
+                    continue
+
+                taken.add(fold_title(reminder["title"]))
+                batch_rows.append(row_number)
+                batch.append((reminder["title"], reminder["description"], reminder["reminder_time"],
+                              reminder["email"], reminder["recurrence"], to_epoch(reminder["reminder_dt"]),
+                              reminder["missed_fire_policy"], int(reminder["urgent"])))
+
+            if not batch:
+                continue
+            try:
+                with self.db_manager.transaction() as cursor:
+                    cursor.executemany(query, batch)
+                report.rows_inserted += len(batch)
+            except sqlite3.IntegrityError:
+                # A concurrent writer took one of the titles; insert row by row to pinpoint it
+                self._insert_rows_individually(query, batch, batch_rows, report)
+            except sqlite3.Error as e:
+                report.errors.extend((row_number, f"Database error: {e}") for row_number in batch_rows)
+
+        if report.rows_inserted:
+            self._emit("bulk_added")
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _insert_rows_individually(self, query: str, batch: List[Tuple[Any, ...]], batch_rows: List[int],
+                                  report: ImportReport) -> None:
+        """Insert a chunk one savepoint per row, recording unique-title violations per row."""
+        with self.db_manager.transaction() as cursor:
+            for row_number, values in zip(batch_rows, batch):
+                try:
+                    with self.db_manager.transaction():
+                        cursor.execute(query, values)
+                    report.rows_inserted += 1
+                except sqlite3.IntegrityError:
+                    report.errors.append((row_number, "Title must be unique. This title is already in use."))
+
+    def taken_titles(self, titles: List[str]) -> set[str]:
+        """
+        Which of `titles` are already in use, with one lookup on the NOCASE title indexes.
+
+        Returns:
+            set[str]: The titles in use, folded with `fold_title`.
+        """
+        if not titles:
+            return set()
+        query = (f"SELECT title FROM {self.db_manager.range_source()} "
+                 f"WHERE title COLLATE NOCASE IN ({', '.join('?' * len(titles))})")
+        return {fold_title(row[0]) for row in self.db_manager.fetch_all(query, tuple(titles))}
+
+    def title_exists(self, title: str, exclude_id: Optional[int] = None) -> bool:
+        """
+        Case-insensitive title lookup served by the NOCASE title indexes. With partitioned
+        storage the finished reminders in month partitions keep their titles too.
+
+        Args:
+            title (str): Title to look up.
+            exclude_id (Optional[int]): Ignore this reminder (the one being edited).
+
+        Returns:
+            bool: True if another reminder already uses the title.
+        """
+        query = f"SELECT 1 FROM {self.db_manager.range_source()} WHERE title = ? COLLATE NOCASE AND id IS NOT ? LIMIT 1"
+        return bool(self.db_manager.fetch_all(query, (title.strip(), exclude_id)))
+
+    def _update_reminder(self, reminder_id: int, title: str, description: str, reminder_time: str,
+                         email: Optional[str], recurrence: str) -> bool:
+        """
+        Writes edited values, resetting 'notified' when the new time is in the future.
+
+        Returns:
+            bool: True on success, False if the new title is already taken.
+        """
+        try:
+            recurrence = normalize_recurrence(recurrence)
+        except ValueError as e:
+            print(f"❌ Invalid recurrence ({e}).")
+            return False
+
+        query = """
+            UPDATE reminders
+            SET title = ?, description = ?, reminder_time = ?, email = ?, recurrence = ?
+            WHERE id = ?
+        """
+        try:
+            with self.db_manager.transaction() as cursor:
+                cursor.execute(query, (title, description, reminder_time, email, recurrence, reminder_id))
+
+                # Reset notified status if reminder_time is updated to a future time
+                if parse_reminder_time(reminder_time) > datetime.now():
+                    cursor.execute("UPDATE reminders SET notified = 0 WHERE id = ?", (reminder_id,))
+        except sqlite3.IntegrityError:
+            print("❌ Title must be unique. This title is already in use.")
+            return False
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (edit_reminder): {e}")
+            return False
+
+        self._emit("updated", reminder_id)
+        print(f"✅ Reminder {reminder_id} updated successfully!")
+        return True
+
+    def choose_reminder_id(self, action: str, line_format: str, source: str = "reminders") -> Optional[int]:
+        """
+        Lists reminders one page at a time and asks the user to pick one by ID.
+
+        Only the first page is queried up front; the next page is fetched when the user types 'n'.
+
+        Args:
+            action (str): What the ID is for ("edit" or "delete"), shown in the prompt.
+            line_format (str): Format for one reminder line, filled with (id, title, reminder_time).
+            source (str): Table or subquery to list (see `DBManager.range_source`).
+
+        Returns:
+            Optional[int]: The chosen ID, or None if there are no reminders or the user returned to the menu.
+        """
+        pages = self.db_manager.paginate("id, title, reminder_time", page_size=self.page_size, source=source)
+        reminders = next(pages, [])
+
+        if not reminders:
+            print("❌ No reminders found.")
+            return None
+
+        print("\n📋 Available Reminders:")
+        while True:
+            for reminder in reminders:
+                print(line_format.format(*reminder))
+
+            has_more = len(reminders) == self.page_size
+            next_hint = ", 'n' for more" if has_more else ""
+            reminder_id = get_valid_input(
+                f"\nEnter Reminder ID to {action} (or type 'menu' to go back{next_hint}): ",
+                lambda value: (has_more and value.lower() == "n") or validate_reminder_id(value)
+            )
+            if reminder_id == "MENU_EXIT":
+                return None
+            if reminder_id.lower() != "n":
+                return int(reminder_id)  # ✅ Convert to int after validation
+
+            reminders = next(pages, [])
+            if not reminders:
+                print("📭 No more reminders.")
 
     def get_reminder_by_id(self, reminder_id: int) -> Optional[dict]:
         """
@@ -81,23 +328,11 @@ class ReminderManager:
         - For programmatic editing (used in tests), see `edit_reminder`.
         - Test cases for editing reminders directly use `edit_reminder` instead of simulating CLI input.
         """
-        # Fetch and display all reminders ordering them by time
-        reminders = self.db_manager.fetch_all("SELECT id, title, reminder_time FROM reminders ORDER BY reminder_time ASC;")
-
-        if not reminders:
-            print("❌ No reminders found.")
-            return
-
-        print("\n📋 Available Reminders:")
-        for reminder in reminders:
-            print(f"  ID: [{reminder[0]}] | {reminder[1]} | {reminder[2]}")
-
-        # Ask for Reminder ID
-        reminder_id = get_valid_input("\nEnter Reminder ID to edit (or type 'menu' to go back): ", validate_reminder_id)
-        if reminder_id == "MENU_EXIT":
+        # Display reminders page by page (ordered by time) and ask for Reminder ID
+        reminder_id = self.choose_reminder_id("edit", "  ID: [{0}] | {1} | {2}")
+        if reminder_id is None:
             return
 
-        reminder_id = int(reminder_id)  # ✅ Convert to int after validation
         reminder_data = self.get_reminder_by_id(reminder_id)
 
         if not reminder_data:
@@ -109,7 +344,7 @@ class ReminderManager:
         # Get new values with validation, keeping old values if input is empty
         new_title = input(f"New title (current: {reminder_data[1]}): ").strip()
         if new_title:
-            while not validate_title(new_title):
+            while not validate_title(new_title, title_exists=lambda t: self.title_exists(t, reminder_id)):
                 new_title = input(f"Enter a new title (current: {reminder_data[1]}): ").strip()
         else:
             new_title = reminder_data[1]
@@ -135,7 +370,7 @@ class ReminderManager:
         else:
             new_email = reminder_data[4]
 
-        new_recurrence = input(f"New recurrence (none/daily/weekly/monthly, current: {reminder_data[5]}): ").strip()
+        new_recurrence = input(f"New recurrence (e.g. {RECURRENCE_EXAMPLES}; current: {reminder_data[5]}): ").strip()
         if new_recurrence:
             while not validate_recurrence(new_recurrence):
                 new_recurrence = input(f"Enter a new recurrence (current: {reminder_data[5]}): ").strip()
@@ -153,49 +388,37 @@ class ReminderManager:
             print("🙃 Looks like you changed your mind! Your reminder is unchanged!")
             return
         else:
-            query = """
-                    UPDATE reminders
-                    SET title = ?, description = ?, reminder_time = ?, email = ?, recurrence = ?
-                    WHERE id = ?
-                    """
-            self.db_manager.execute(query,
-                                    (new_title, new_description, new_reminder_time, new_email, new_recurrence,
-                                     reminder_id))
-
-            # Reset notified status if user updates the reminder_time
-            if datetime.strptime(new_reminder_time, '%Y-%m-%d %H:%M') > datetime.now():
-                self.db_manager.update_reminder_status(reminder_id, False)  # Reset notified to False
-
-            print(f"✅ Reminder {reminder_id} updated successfully!")
+            self._update_reminder(reminder_id, new_title, new_description, new_reminder_time, new_email,
+                                  new_recurrence)
 
     def delete_reminder(self) -> None:
         """Delete a reminder after confirming its existence.
 
         Displays available reminders and prompts the user to select one for deletion.
+        With partitioned storage, finished reminders moved to month partitions are listed
+        and deleted too.
         """
 
-        # Fetch and display all reminders and ordering them by time
-        reminders = self.db_manager.fetch_all("SELECT id, title, reminder_time FROM reminders ORDER BY reminder_time ASC;")
-
-        if not reminders:
-            print("❌ No reminders found.")
+        # Display reminders page by page (ordered by time) and ask for Reminder ID
+        reminder_id = self.choose_reminder_id("delete", "  [{0}] {1} - {2}", source=self.db_manager.range_source())
+        if reminder_id is None:
             return
 
-        print("\n📋 Available Reminders:")
-        for reminder in reminders:
-            print(f"  [{reminder[0]}] {reminder[1]} - {reminder[2]}")
-
-        reminder_id = get_valid_input("\nEnter Reminder ID to edit (or type 'menu' to go back): ", validate_reminder_id)
-        if reminder_id == "MENU_EXIT":
+        # Ids are never reused (AUTOINCREMENT), so at most one table holds this one
+        partitions = self.db_manager.partitions
+        tables = ["reminders"] if partitions is None else partitions.route()
+        try:
+            with self.db_manager.transaction() as cursor:
+                deleted = sum(cursor.execute(f"DELETE FROM {table} WHERE id = ?", (reminder_id,)).rowcount
+                              for table in tables)
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (delete): {e}")
             return
-        reminder_id = int(reminder_id)  # ✅ Convert to int after validation
-
-        if not self.get_reminder_by_id(reminder_id):
+        if not deleted:
             print("❌ Reminder ID not found.")
             return
 
-        query = "DELETE FROM reminders WHERE id = ?"
-        self.db_manager.execute(query, (reminder_id,))
+        self._emit("deleted", reminder_id)
         print(f"✅ Reminder {reminder_id} deleted successfully!")
 
     def display_reminders(self, filter_type: str = "all") -> None:
@@ -209,54 +432,95 @@ class ReminderManager:
                 - "year": Display reminders for a specific year.
         """
 
-        # query = "SELECT id, title, description, reminder_time, email, recurrence, notified FROM reminders ORDER BY reminder_time ASC;"
-        query = "SELECT id, title, description, reminder_time, email, recurrence, notified FROM reminders"
+        where = ""
         params = ()
 
+        # Every filter is a half-open [start, end) range on the indexed fire_at column
         if filter_type == "date":
             date_input = get_valid_input("Enter date (YYYY-MM-DD) or type 'menu' to return to menu): ", validate_date)
             if date_input == "MENU_EXIT":
                 return
             print(f"Reminders for {date_input}")
-            query += " WHERE reminder_time LIKE ?"
-            params = (f"{date_input}%",)
-            # Add ORDER BY after constructing the WHERE clause
-            query += " ORDER BY reminder_time ASC"
+            where = "fire_at >= ? AND fire_at < ?"
+            params = day_range(date_input)
 
         elif filter_type == "month":
             month_input = get_valid_input("Enter month (YYYY-MM) or type 'menu' to return to menu): ", validate_month)
             if month_input == "MENU_EXIT":
                 return
-            query += " WHERE strftime('%Y-%m', reminder_time) = ?"
-            params = (month_input,)
-            query += " ORDER BY reminder_time ASC"
+            where = "fire_at >= ? AND fire_at < ?"
+            params = month_range(month_input)
 
         elif filter_type == "year":
             year_input = get_valid_input("Enter year (YYYY) or type 'menu' to return to menu): ", validate_year)
             if year_input == "MENU_EXIT":
                 return
-            query += " WHERE strftime('%Y', reminder_time) = ?"
-            params = (year_input,)
-            query += " ORDER BY reminder_time ASC"
+            where = "fire_at >= ? AND fire_at < ?"
+            params = year_range(year_input)
+
+        # Finished reminders may live in month partitions; read only the ones the range overlaps
+        source = self.db_manager.range_source(*params) if params else self.db_manager.range_source()
+
+        # Pages are fetched lazily, so the first one renders immediately
+        pages = self.db_manager.paginate("id, title, description, reminder_time, email, recurrence, notified",
+                                         where, params, self.page_size, source)
+        shown = 0
+
+        for reminders in pages:
+            if not shown:
+                print("_" * 40)
+            for reminder in reminders:
+                print("\n🔔 Reminder ID:", reminder[0])
+                print("📌 Title:", reminder[1])
+                print("📝 Description:", reminder[2])
+                print("📅 Time:", reminder[3])
+                print("📧 Email:", reminder[4] if reminder[4] else "Not Set")
+                print("🔁 Recurrence:", reminder[5])
+                print("✅ Notified:", "Yes" if reminder[6] else "No")
+                print("-" * 40)
+            shown += len(reminders)
+
+            if len(reminders) == self.page_size:
+                more = input(f"Shown {shown} reminders. Press Enter for more (or type 'q' to stop): ").strip().lower()
+                if more == "q":
+                    return
+
+        if params:
+            shown += self._display_recurrences(*params)
+
+        if not shown:
+            print("❌ No reminders found.")
 
-        # Add ORDER BY after constructing the WHERE clause
-        query += " ORDER BY reminder_time ASC"
-        reminders = self.db_manager.fetch_all(query, params)
+    def _display_recurrences(self, start: int, end: int) -> int:
+        """
+        Summarizes the later occurrences of recurring reminders inside [start, end):
+        one line per reminder with its count and first / last occurrence.
 
-        if not reminders:
-            print("❌ No reminders found.")
-            return
+        Args:
+            start (int): Window start (epoch seconds).
+            end (int): Window end (epoch seconds).
 
-        print("_" * 40)
-        for reminder in reminders:
-            print("\n🔔 Reminder ID:", reminder[0])
-            print("📌 Title:", reminder[1])
-            print("📝 Description:", reminder[2])
-            print("📅 Time:", reminder[3])
-            print("📧 Email:", reminder[4] if reminder[4] else "Not Set")
-            print("🔁 Recurrence:", reminder[5])
-            print("✅ Notified:", "Yes" if reminder[6] else "No")
-            print("-" * 40)
+        Returns:
+            int: Number of occurrences summarized.
+        """
+        expander, titles = OccurrenceExpander.from_db(self.db_manager, before=end)
+        if not len(expander):
+            return 0
+
+        occurrences = expander.expand(from_epoch(start), from_epoch(end))
+        later = occurrences.steps > 0  # Step 0 is the stored time, already listed above
+        ids, times = occurrences.reminder_ids[later], occurrences.formatted_times()[later]
+        if not len(ids):
+            return 0
+
+        print("\n🔁 Recurring occurrences in this period:")
+        # Occurrences are sorted by time, so each reminder's first / last index bound its span
+        order = np.argsort(ids, kind="stable")
+        reminder_ids, first, counts = np.unique(ids[order], return_index=True, return_counts=True)
+        for reminder_id, index, count in zip(reminder_ids.tolist(), first.tolist(), counts.tolist()):
+            span = times[order][index] if count == 1 else f"{times[order][index]} → {times[order][index + count - 1]}"
+            print(f"  - [{reminder_id}] {titles[reminder_id]}: {count} × ({span})")
+        return len(ids)
 
     def view_reminders(self) -> None:
         """
@@ -267,7 +531,8 @@ class ReminderManager:
         2. Month-wise
         3. Yearly-wise
         4. All Reminders
-        5. Return to Main Menu
+        5. Upcoming (next 24 hours)
+        6. Return to Main Menu
         """
 
         options = {
@@ -283,30 +548,32 @@ class ReminderManager:
             print("2. Month-wise")
             print("3. Yearly-wise")
             print("4. All Reminders")
-            print("5. Main Menu")
+            print("5. Upcoming (next 24 hours)")
+            print("6. Main Menu")
 
-            choice = input("Enter your choice (1-5): ")
+            choice = input("Enter your choice (1-6): ")
 
             if choice in options:
                 self.display_reminders(options[choice])
             elif choice == "5":
+                self.display_upcoming()
+            elif choice == "6":
                 print("Returning to Menu...")
                 break
             else:
-                print("⚠️ Invalid choice. Please enter a number between 1 and 5.")
-
-    def get_all_titles(self) -> set[str]:
-        """
-        Fetch all existing reminder titles from the database.
+                print("⚠️ Invalid choice. Please enter a number between 1 and 6.")
+
+    def display_upcoming(self) -> None:
+        """Lists the occurrences due in the next 24 hours, read from the scheduler's upcoming window."""
+        window = self.scheduler.upcoming_window if self.scheduler else UpcomingWindow(self.db_manager)
+        entries = window.entries()
+        if not entries:
+            print("❌ No reminders in the next 24 hours.")
+            return
 
-        Returns:
-            set[str]: A set of existing reminder titles.
-        """
-        query = "SELECT title FROM reminders"
-        result = self.db_manager.fetch_all(query)
-        if result is None:
-            return set()
-        return {row[0] for row in result}
+        print("\n📌 Upcoming Reminders in the Next 24 Hours:")
+        for entry in entries:
+            print(f"  - [{entry.reminder_id}] {entry.title} at {entry.reminder_time}")
 
     def edit_reminder(self, reminder_id: int, title: str, description: str, reminder_time: str, email: Optional[str],
                       recurrence: str) -> None:
@@ -332,15 +599,4 @@ class ReminderManager:
             return
 
         # Update in DB
-        query = """
-            UPDATE reminders
-            SET title = ?, description = ?, reminder_time = ?, email = ?, recurrence = ?
-            WHERE id = ?
-        """
-        self.db_manager.execute(query, (title, description, reminder_time, email, recurrence, reminder_id))
-
-        # Reset notified status if reminder_time is updated to a future time
-        if datetime.strptime(reminder_time, '%Y-%m-%d %H:%M') > datetime.now():
-            self.db_manager.update_reminder_status(reminder_id, False)
-
-        print(f"✅ Reminder {reminder_id} updated successfully!")
+        self._update_reminder(reminder_id, title, description, reminder_time, email, recurrence)
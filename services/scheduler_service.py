@@ -1,26 +1,84 @@
 # Handles recurrence, due reminders, upcoming reminders
 
+import logging
+import os
+import socket
+import sqlite3
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import calendar
+from config.settings import (
+    PARTITION_ACTIVE_DAYS,
+    ARCHIVE_RETENTION_DAYS,
+    ARCHIVE_CHUNK_SIZE,
+    ARCHIVE_INTERVAL_SECONDS,
+    CLAIM_BATCH_SIZE,
+    CLAIM_LEASE_SECONDS,
+    MISSED_FIRE_GRACE_SECONDS,
+    DELIVERY_MAX_IN_FLIGHT,
+    DELIVERY_MODE,
+    OUTBOX_RETENTION_DAYS,
+)
+from database.archive import ArchiveManager, ArchiveReport
+from services.occurrence_expander import OccurrenceExpander
+from services.recurrence_rules import RecurrenceRule, compile_rule
+from services.upcoming_window import UpcomingWindow
+from services.dispatch_scheduler import DispatchScheduler
+from services.digest import DigestCoalescer
+from services.fanout import ChannelResult, DeliveryReport
+from services.outbox import Outbox, OutboxRow
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.time_utils import parse_reminder_time, format_reminder_time, to_epoch
+
+
+DELIVERY_MODES = ("inline", "outbox")
 
 
 class ReminderScheduler:
 
-    def __init__(self, db_manager) -> None:
+    def __init__(self, db_manager, notification_service=None, worker_id: str | None = None,
+                 clock: Clock = SYSTEM_CLOCK, delivery_mode: str = DELIVERY_MODE) -> None:
         """
-            Initialize ReminderScheduler with a database manager.
+        Args:
+            db_manager: The DBManager holding the reminders.
+            notification_service: NotificationService to reuse; one is built on the first check otherwise.
+            worker_id (str | None): Names this process in claimed rows (host:pid:random by default).
+            clock (Clock): Source of every time read and sleep (a SimulatedClock fast-forwards a schedule).
+            delivery_mode (str): "inline" sends during the check; "outbox" only queues sends for OutboxWorkers.
         """
+        if delivery_mode not in DELIVERY_MODES:
+            raise ValueError(f"Delivery mode must be one of {', '.join(DELIVERY_MODES)}")
         self.db_manager = db_manager
+        self.notification_service = notification_service
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.clock = clock
+        self.lease_seconds = CLAIM_LEASE_SECONDS  # How long a claim is exclusive unless renewed
+        self.last_archive_run: float | None = None  # clock.time() of the last archival job
+        self.upcoming_window = UpcomingWindow(db_manager, clock=clock)  # Next 24 hours, built on first read
+        self.dispatcher = DispatchScheduler(clock=clock)
+        self.coalescer = DigestCoalescer(db_manager)
+        self.delivery_pool: ThreadPoolExecutor | None = None  # Built by the first inline delivery
+        self.delivery_mode = delivery_mode
+        self.outbox = Outbox(db_manager, clock=clock, worker_id=self.worker_id)
+
+    @staticmethod
+    def recurrence_rule(recurrence: str | None) -> RecurrenceRule | None:
+        """The compiled (cached) rule for a stored recurrence, or None if it cannot be parsed."""
+        try:
+            return compile_rule(recurrence)
+        except ValueError:
+            return None
 
     @staticmethod
     def calculate_next_occurrence(reminder_time: datetime, recurrence: str) -> datetime | None:
         """
-        Calculate the next occurrence of a reminder based on the recurrence type.
+        Calculate the next occurrence of a reminder based on its recurrence rule.
 
         Args:
             reminder_time (datetime): The original reminder time.
-            recurrence (str): The recurrence type ('none', 'daily', 'weekly', 'monthly', 'yearly').
+            recurrence (str): The recurrence ('none', 'daily', 'weekly', 'monthly', 'yearly'
+                or a rule such as 'every 2 weeks on mon,thu', see `compile_rule`).
 
         Returns:
             datetime | None: The next occurrence datetime or None if no recurrence.
@@ -28,33 +86,89 @@ class ReminderScheduler:
         if not reminder_time or recurrence == "none":
             return None
 
-        next_time = None
+        rule = ReminderScheduler.recurrence_rule(recurrence)
+        next_time = rule.next(reminder_time) if rule else None
 
-        if recurrence == "daily":
-            next_time = reminder_time + timedelta(days=1)
+        logging.debug(f"Recurrence: {recurrence} | Old: {reminder_time} | Next: {next_time}")
 
-        elif recurrence == "weekly":
-            next_time = reminder_time + timedelta(weeks=1)
+        return next_time
 
-        elif recurrence == "monthly":
-            # Handle month transition safely
-            month = reminder_time.month + 1 if reminder_time.month < 12 else 1
-            year = reminder_time.year + 1 if month == 1 else reminder_time.year
-            day = min(reminder_time.day, calendar.monthrange(year, month)[1])  # Ensure valid day
-            next_time = reminder_time.replace(year=year, month=month, day=day)
+    @staticmethod
+    def occurrence_at(reminder_time: datetime, recurrence: str, steps: int) -> datetime | None:
+        """
+        The occurrence `steps` periods after `reminder_time`, without stepping through the ones in between.
 
-        # elif recurrence == "yearly":
-        #     next_time = reminder_time.replace(year=reminder_time.year + 1)
-        elif recurrence == "yearly":
-            try:
-                next_time = reminder_time.replace(year=reminder_time.year + 1)
-            except ValueError:
-                # Handle Feb 29 to Feb 28 for non-leap years
-                next_time = reminder_time.replace(year=reminder_time.year + 1, day=28)
+        Gives exactly what `steps` calls of `calculate_next_occurrence` would, including its
+        clamping: a monthly reminder on the 31st keeps the shortest day it was clamped to
+        (Jan 31 -> Feb 28 -> Mar 28), and a yearly Feb 29 reminder stays on Feb 28.
 
-        print(f"🔄 Recurrence: {recurrence} | Old: {reminder_time} | Next: {next_time}")
+        Args:
+            reminder_time (datetime): The current occurrence.
+            recurrence (str): The recurrence rule.
+            steps (int): Number of periods to advance (0 returns `reminder_time`).
 
-        return next_time
+        Returns:
+            datetime | None: The occurrence, or None for 'none' / unknown recurrences.
+        """
+        if steps == 0:
+            return reminder_time
+        rule = ReminderScheduler.recurrence_rule(recurrence)
+        return rule.advance(reminder_time, steps) if rule else None
+
+    @staticmethod
+    def next_occurrence_after(reminder_time: datetime, recurrence: str, now: datetime) -> tuple[datetime | None, int]:
+        """
+        Jump straight to the first occurrence later than `now`.
+
+        Args:
+            reminder_time (datetime): The occurrence that came due.
+            recurrence (str): The recurrence rule.
+            now (datetime): Current time.
+
+        Returns:
+            tuple[datetime | None, int]: The next occurrence (None without recurrence) and the
+            number of periods advanced; `steps - 1` occurrences were missed in between.
+        """
+        rule = ReminderScheduler.recurrence_rule(recurrence)
+        return rule.next_after(reminder_time, now) if rule else (None, 0)
+
+    @staticmethod
+    def reminder_from_row(row: tuple) -> dict:
+        """Turn a claimed row (id, title, reminder_time, recurrence, email, missed_fire_policy, urgent) into a dict."""
+        return {"id": row[0], "title": row[1], "time": row[2], "recurrence": row[3], "email": row[4],
+                "missed_fire_policy": row[5] if len(row) > 5 else "once", "urgent": bool(row[6]) if len(row) > 6 else False}
+
+    @staticmethod
+    def due_occurrences(reminder: dict, now: datetime) -> list[dict]:
+        """
+        The notifications a due reminder should produce under its missed-fire policy.
+
+        - "once": one notification, however many occurrences were missed.
+        - "all": one notification per missed occurrence, oldest first, all in this pass.
+        - "skip": nothing unless the latest due occurrence is within MISSED_FIRE_GRACE_SECONDS.
+
+        Args:
+            reminder (dict): A due reminder (see `reminder_from_row`).
+            now (datetime): Current time.
+
+        Returns:
+            list[dict]: Copies of the reminder, one per notification, with "time" set to the occurrence.
+        """
+        policy = reminder.get("missed_fire_policy") or "once"
+        first = parse_reminder_time(reminder["time"])
+        _, steps = ReminderScheduler.next_occurrence_after(first, reminder["recurrence"], now)
+        due_steps = max(steps, 1)  # Occurrences at or before now, counting the one stored
+
+        if policy == "all":
+            occurrences = [ReminderScheduler.occurrence_at(first, reminder["recurrence"], step) for step in range(due_steps)]
+        else:
+            latest = ReminderScheduler.occurrence_at(first, reminder["recurrence"], due_steps - 1) or first
+            if policy == "skip" and (now - latest).total_seconds() > MISSED_FIRE_GRACE_SECONDS:
+                print(f"⏭️ Skipping missed reminder \"{reminder['title']}\" (due {format_reminder_time(latest)})")
+                return []
+            occurrences = [latest]
+
+        return [{**reminder, "time": format_reminder_time(occurrence)} for occurrence in occurrences]
 
     def get_due_reminders(self) -> list[tuple[int, str, str, str, str]]:
         """
@@ -66,39 +180,407 @@ class ReminderScheduler:
         query = """
         SELECT id, title, reminder_time, recurrence, email
         FROM reminders 
-        WHERE reminder_time <= ? AND notified = 0
+        WHERE notified = 0 AND fire_at <= ?
+        ORDER BY fire_at
+        """
+        return self.db_manager.fetch_all(query, (to_epoch(self.clock.now()),))
+
+    def claim_due_reminders(self, limit: int = CLAIM_BATCH_SIZE, lease_seconds: int | None = None,
+                            reminder_ids: list[int] | None = None) -> list[tuple[int, str, str, str, str, str, int]]:
+        """
+        Atomically claim due reminders for this worker, so concurrent checkers never send the same one.
+
+        One `UPDATE ... RETURNING` inside a `BEGIN IMMEDIATE` transaction takes up to `limit`
+        due rows that are unclaimed or whose lease has expired (a crashed worker's rows are
+        picked up again after `lease_seconds`).
+
+        Args:
+            limit (int): Maximum reminders to claim.
+            lease_seconds (int | None): How long the claim is exclusive; `self.lease_seconds` when omitted.
+            reminder_ids (list[int] | None): Only consider these reminders.
+
+        Returns:
+            list[tuple[int, str, str, str, str, str, int]]: Claimed reminders (id, title, reminder_time, recurrence,
+            email, missed_fire_policy, urgent), oldest first.
         """
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return self.db_manager.fetch_all(query, (current_time,))
+        now = to_epoch(self.clock.now())
+        lease_seconds = self.lease_seconds if lease_seconds is None else lease_seconds
+        id_filter, id_params = "", ()
+        if reminder_ids is not None:
+            if not reminder_ids:
+                return []
+            id_filter = f"AND id IN ({', '.join('?' * len(reminder_ids))})"
+            id_params = tuple(reminder_ids)
+
+        query = f"""
+        UPDATE reminders SET claimed_by = ?, lease_until = ?
+        WHERE id IN (
+            SELECT id FROM reminders
+            WHERE notified = 0 AND fire_at <= ? AND (lease_until IS NULL OR lease_until <= ?) {id_filter}
+            ORDER BY fire_at LIMIT ?
+        )
+        RETURNING fire_at, id, title, reminder_time, recurrence, email, missed_fire_policy, urgent
+        """
+        params = (self.worker_id, now + lease_seconds, now, now, *id_params, limit)
+        try:
+            with self.db_manager.transaction() as cursor:
+                rows = cursor.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (claim_due_reminders): {e}")
+            return []
+
+        return [row[1:] for row in sorted(rows)]  # RETURNING has no defined order
 
-    def fetch_upcoming_reminders(self) -> list[tuple[str, str]]:
+    def renew_claims(self, reminder_ids: list[int], lease_seconds: int | None = None) -> set[int]:
         """
-        Fetch reminders scheduled within the next 24 hours.
+        Extends this worker's lease on claimed reminders that are still due.
 
         Returns:
-            list[tuple[str, str]]: List of upcoming reminders (title, reminder_time).
+            set[int]: The reminders still held; the others were taken over after their lease expired.
+        """
+        if not reminder_ids:
+            return set()
+        lease_seconds = self.lease_seconds if lease_seconds is None else lease_seconds
+        try:
+            with self.db_manager.transaction() as cursor:
+                rows = cursor.execute(
+                    f"UPDATE reminders SET lease_until = ? WHERE claimed_by = ? AND notified = 0 "
+                    f"AND id IN ({', '.join('?' * len(reminder_ids))}) RETURNING id",
+                    (to_epoch(self.clock.now()) + lease_seconds, self.worker_id, *reminder_ids)).fetchall()
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (renew_claims): {e}")
+            return set(reminder_ids)  # Keep going; the next renewal tries again
+        return {row[0] for row in rows}
+
+    def release_claims(self, reminder_ids: list[int]) -> None:
+        """Give claimed reminders back without sending them (e.g. on shutdown)."""
+        if not reminder_ids:
+            return
+        self.db_manager.execute(
+            f"UPDATE reminders SET claimed_by = NULL, lease_until = NULL "
+            f"WHERE claimed_by = ? AND id IN ({', '.join('?' * len(reminder_ids))})",
+            (self.worker_id, *reminder_ids))
+
+    def fetch_upcoming_reminders(self, hours: int = 24) -> list[tuple[str, str]]:
+        """
+        Fetch reminders scheduled within the next `hours` hours (24 by default),
+        including later occurrences of recurring reminders inside the window.
+
+        Returns:
+            list[tuple[str, str]]: List of upcoming reminders (title, reminder_time), in time order.
         """
         query = """
-        SELECT title, reminder_time 
+        SELECT title, reminder_time, fire_at
         FROM reminders 
-        WHERE reminder_time > ? AND reminder_time <= ?
+        WHERE fire_at > ? AND fire_at <= ?
+        ORDER BY fire_at
+        """
+        now = self.clock.now()
+        end = now + timedelta(hours=hours)
+        rows = self.db_manager.fetch_all(query, (to_epoch(now), to_epoch(end)))
+        upcoming = [(fire_at, title, reminder_time) for title, reminder_time, fire_at in rows]
+
+        # The stored time is only the next occurrence; expand the rest of the window in one vectorized pass
+        expander, titles = OccurrenceExpander.from_db(self.db_manager, before=to_epoch(end))
+        occurrences = expander.expand(now + timedelta(seconds=1), end + timedelta(seconds=1))
+        later = occurrences.steps > 0
+        for reminder_id, when, text in zip(occurrences.reminder_ids[later].tolist(),
+                                           occurrences.times[later].astype("datetime64[us]").tolist(),
+                                           occurrences.formatted_times()[later].tolist()):
+            upcoming.append((to_epoch(when), titles[reminder_id], text))
+
+        upcoming.sort(key=lambda item: item[0])
+        return [(title, reminder_time) for _, title, reminder_time in upcoming]
+
+    def clean_old_reminders(self, retention_days: int = ARCHIVE_RETENTION_DAYS,
+                            chunk_size: int = ARCHIVE_CHUNK_SIZE) -> ArchiveReport:
         """
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        next_24_hours = (datetime.now() + timedelta(hours=24)).strftime("%Y-%m-%d %H:%M:%S")
-        return self.db_manager.fetch_all(query, (current_time, next_24_hours))
+        Archive reminders that were notified, have no recurrence,
+        and are older than `retention_days`, then shrink the database file.
 
-    def clean_old_reminders(self) -> None:
+        Rows are moved to the archive file in chunks of `chunk_size`, one short
+        transaction each, followed by an incremental vacuum.
+
+        Args:
+            retention_days (int): Age (in days) after which finished reminders are archived.
+            chunk_size (int): Rows moved per transaction.
+
+        Returns:
+            ArchiveReport: Rows archived and bytes reclaimed.
         """
-        Delete reminders that were notified, have no recurrence,
-        and are older than 7 days.
+        started = time.perf_counter()
+        report = ArchiveReport()
+        cutoff = to_epoch(self.clock.now() - timedelta(days=retention_days))
+
+        try:
+            report.rows_archived = ArchiveManager(self.db_manager).archive(cutoff, chunk_size)
+            if report.rows_archived:
+                report.bytes_reclaimed = self.db_manager.incremental_vacuum()
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (clean_old_reminders): {e}")
+
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def run_archival_if_due(self) -> ArchiveReport | None:
         """
-        query = """
-        DELETE FROM reminders 
-        WHERE notified = 1 AND recurrence = 'none' 
-        AND reminder_time <= ?
+        Run `clean_old_reminders` if ARCHIVE_INTERVAL_SECONDS have passed since the last run.
+
+        Returns:
+            ArchiveReport | None: The report of this run, or None if it was not due yet.
+        """
+        now = self.clock.time()
+        if self.last_archive_run is not None and now - self.last_archive_run < ARCHIVE_INTERVAL_SECONDS:
+            return None
+
+        self.last_archive_run = now
+        report = self.clean_old_reminders()
+        if report.rows_archived:
+            print(f"🗄️ {report}")
+        if self.delivery_mode == "outbox":
+            purged = self.outbox.purge(int(now) - OUTBOX_RETENTION_DAYS * 86400)
+            if purged:
+                print(f"🗄️ Purged {purged} sent outbox entries.")
+        return report
+
+    def rotate_partitions(self) -> int:
+        """
+        Move finished one-time reminders older than PARTITION_ACTIVE_DAYS into month partitions,
+        so due and upcoming scans only touch the active window. No-op without partitioned storage.
+
+        Returns:
+            int: Number of reminders moved.
+        """
+        partitions = getattr(self.db_manager, "partitions", None)
+        if partitions is None:
+            return 0
+
+        try:
+            moved = partitions.rotate(to_epoch(self.clock.now() - timedelta(days=PARTITION_ACTIVE_DAYS)))
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (rotate_partitions): {e}")
+            return 0
+
+        if moved:
+            print(f"🗄️ Moved {moved} finished reminders into month partitions.")
+        return moved
+
+    def apply_due_transitions(self, due_reminders: list[dict], now: datetime | None = None,
+                              outbox_rows: list[OutboxRow] | None = None) -> bool:
+        """
+        Apply the state transitions of a processed due batch as one transaction.
+
+        - One-time reminders are marked as notified.
+        - Recurring reminders jump straight to their first occurrence after `now`
+          (however long the checker was down) and are reset to not notified.
+        - `outbox_rows` are queued in the same transaction, so a reminder is never marked
+          without its sends being queued, or queued twice.
+
+        Args:
+            due_reminders (list[dict]): Processed reminders (id, title, time, recurrence, email).
+            now (datetime | None): Current time; defaults to the scheduler's clock.
+            outbox_rows (list[OutboxRow] | None): Sends to queue (see `Outbox.rows_for`).
+
+        Returns:
+            bool: False if the transaction failed (the claims expire and the batch is retried).
+        """
+        now = now or self.clock.now()
+        notified_rows = []
+        advanced_rows = []
+
+        for reminder in due_reminders:
+            next_time = None
+            if reminder["recurrence"] != "none":
+                next_time, _ = self.next_occurrence_after(parse_reminder_time(reminder["time"]),
+                                                          reminder["recurrence"], now)
+                if next_time is None:
+                    print(
+                        f"⚠️ No next occurrence calculated for reminder ID {reminder['id']}. Recurrence type: {reminder['recurrence']}")
+
+            if next_time is None:
+                notified_rows.append((reminder["id"],))
+            else:
+                advanced_rows.append((format_reminder_time(next_time), to_epoch(next_time), reminder["id"]))
+
+        try:
+            with self.db_manager.transaction() as cursor:
+                if outbox_rows:
+                    self.outbox.enqueue(cursor, outbox_rows)
+                cursor.executemany(
+                    "UPDATE reminders SET notified = 1, claimed_by = NULL, lease_until = NULL WHERE id = ?",
+                    notified_rows)
+                cursor.executemany(
+                    "UPDATE reminders SET reminder_time = ?, fire_at = ?, notified = 0, claimed_by = NULL, "
+                    "lease_until = NULL WHERE id = ?", advanced_rows)
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (apply_due_transitions): {e}")
+            return False
+
+        # Fired occurrences leave the upcoming window; recurring ones re-enter at their next time
+        self.upcoming_window.refresh(reminder["id"] for reminder in due_reminders)
+        return True
+
+    def enqueue_due(self, due_reminders: list[dict], notification_service, now: datetime) -> int:
+        """
+        Outbox mode: queue one outbox row per channel of every occurrence the missed-fire policy
+        asks for, and apply the batch's transitions in the same transaction. Nothing is sent
+        here, so a check takes as long as one write however slow the providers are.
+
+        Args:
+            due_reminders (list[dict]): Claimed reminders (see `reminder_from_row`).
+            notification_service: Tells which channels each occurrence goes to (`channels_for`).
+            now (datetime): Current time.
+
+        Returns:
+            int: Number of sends queued (0 if the transaction failed).
+        """
+        occurrences = [occurrence for reminder in due_reminders for occurrence in self.due_occurrences(reminder, now)]
+        rows = self.outbox.rows_for(occurrences, notification_service.channels_for)
+        return len(rows) if self.apply_due_transitions(due_reminders, now, outbox_rows=rows) else 0
+
+    def process_due(self, due_reminders: list[dict], notification_service, now: datetime) -> DeliveryReport | None:
         """
-        past_7_days = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")
-        self.db_manager.execute(query, (past_7_days,))
+        Sends (inline mode) or queues (outbox mode) a claimed batch and applies its transitions.
+
+        Returns:
+            DeliveryReport | None: The inline delivery report; None in outbox mode.
+        """
+        if self.delivery_mode == "outbox":
+            queued = self.enqueue_due(due_reminders, notification_service, now)
+            print(f"📥 Queued {queued} sends for {len(due_reminders)} reminders in the outbox.")
+            return None
+
+        report = self.deliver(due_reminders, notification_service, now)
+        # Mark notified / advance recurrence for the whole batch in one commit, except for
+        # reminders another worker took over (it applies their transitions itself)
+        lost = set(report.lost_claims)
+        self.apply_due_transitions([reminder for reminder in due_reminders if reminder["id"] not in lost], now)
+        return report
+
+    def claim_limit(self, lease_seconds: int | None = None) -> int:
+        """
+        How many reminders to claim at once: no more than the channel rate limits let us send
+        in half a lease. Per-recipient limits and catch-up occurrences can still make a batch
+        take longer, so `deliver` also renews the claims while it is paced.
+        """
+        budget = self.dispatcher.budget((self.lease_seconds if lease_seconds is None else lease_seconds) / 2)
+        return CLAIM_BATCH_SIZE if budget is None else max(1, min(CLAIM_BATCH_SIZE, budget))
+
+    def deliver(self, due_reminders: list[dict], notification_service, now: datetime) -> DeliveryReport:
+        """
+        Sends what each due reminder's missed-fire policy asks for. The dispatcher releases
+        occurrences as the rate limits allow (oldest first) and each one is delivered on the
+        delivery pool, so a batch takes about as long as its slowest channel needs, not the
+        sum of every round trip. The pool (up to DELIVERY_MAX_IN_FLIGHT threads) is built on the
+        first call, so outbox-mode and async schedulers never start it. Emails for the same
+        address are coalesced into digests (one email, and one email token, each) when the
+        notifier can send them (`send_digest`). Status is left to `apply_due_transitions`.
+
+        While the dispatcher paces the batch, the claims are renewed every half lease, so
+        another checker cannot take them over; occurrences of a reminder whose claim was
+        lost anyway (e.g. a long stall) are skipped and listed in `lost_claims`.
+
+        Args:
+            due_reminders (list[dict]): Claimed reminders (see `reminder_from_row`).
+            notification_service: Sends one occurrence on every channel (`check_reminder`).
+            now (datetime): Current time.
+
+        Returns:
+            DeliveryReport: Per-reminder, per-channel results and the batch's queue waits.
+        """
+        started = time.perf_counter()
+        occurrences = [occurrence for reminder in due_reminders for occurrence in self.due_occurrences(reminder, now)]
+        digests = []
+        if hasattr(notification_service, "send_digest"):
+            occurrences, digests = self.coalescer.plan(occurrences)
+        pending, pending_digests = [], []
+        lease = {"held": {reminder["id"] for reminder in due_reminders}, "renewed_at": self.clock.time()}
+        if self.delivery_pool is None:
+            self.delivery_pool = ThreadPoolExecutor(max_workers=DELIVERY_MAX_IN_FLIGHT,
+                                                    thread_name_prefix="reminder-delivery")
+
+        def holding(reminder_ids: list) -> bool:
+            """Renews the batch's claims every half lease; False for reminders another checker took over."""
+            now = self.clock.time()
+            if now - lease["renewed_at"] >= self.lease_seconds / 2:
+                lease["held"] = self.renew_claims(sorted(lease["held"]))
+                lease["renewed_at"] = now
+            return all(reminder_id in lease["held"] for reminder_id in reminder_ids)
+
+        def submit(job: dict) -> None:
+            if not holding([item["id"] for item in job["digest"].items] if "digest" in job else [job["id"]]):
+                return
+            if "digest" in job:
+                # The digest email goes out on the email channel's own pool
+                pending_digests.append((job["digest"], notification_service.fanout.submit(
+                    "email", notification_service.send_digest, job["digest"])))
+                return
+            pending.append((job, self.delivery_pool.submit(
+                notification_service.check_reminder, job, update_status=False)))
+
+        jobs = occurrences + [digest.as_job() for digest in digests]
+        report = DeliveryReport(dispatch_stats=self.dispatcher.dispatch(jobs, submit, notification_service))
+        for occurrence, future in pending:
+            try:
+                report.add(occurrence, future.result())
+            except Exception as e:
+                report.add(occurrence, e)
+        for digest, future in pending_digests:
+            try:
+                report.add_digest(digest.items, future.result())
+            except Exception as e:
+                # Every reminder in the digest missed its email
+                report.add_digest(digest.items, ChannelResult("email", False, error=str(e)))
+
+        report.lost_claims = sorted({reminder["id"] for reminder in due_reminders} - lease["held"])
+        failed = len(report.failed)
+        report.dispatch_stats.failed += failed
+        self.dispatcher.stats.failed += failed
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def check_due(self) -> int:
+        """
+        One check: claim what is due (a rate-limit budget at a time, so other checker processes
+        skip it), deliver it and apply the transitions, until nothing due is left.
+
+        Returns:
+            int: Number of reminders processed.
+        """
+        if self.notification_service is None:
+            # Lazy import to avoid circular dependencies
+            from services.notification_service import NotificationService
+            self.notification_service = NotificationService(self.db_manager, clock=self.clock)
+
+        limit = self.claim_limit()
+        due_reminders = self.claim_due_reminders(limit)
+        if not due_reminders:
+            print("✅ No due reminders.")
+
+        processed = 0
+        while due_reminders:
+            now = self.clock.now()
+            due_batch = [self.reminder_from_row(reminder) for reminder in due_reminders]
+
+            print(f"\n✅ Sending Notifications:")
+            report = self.process_due(due_batch, self.notification_service, now)
+            if report is not None and report.dispatch_stats.delayed:
+                print(f"⏱️ {report.dispatch_stats}")
+            if report is not None and report.digests:
+                print(f"📨 {report.digest_items} emails sent as {report.digests} digests")
+            if report is not None and report.failed:
+                print(f"⚠️ {report}")
+                for delivery in report.failed:
+                    print(f"  - {delivery.title} at {delivery.time}: {', '.join(delivery.failed_channels)} failed")
+            processed += len(due_batch)
+            due_reminders = self.claim_due_reminders(limit) if len(due_reminders) == limit else []
+        return processed
+
+    def close(self) -> None:
+        """Waits for deliveries in flight and stops the delivery threads."""
+        if self.delivery_pool is not None:
+            self.delivery_pool.shutdown(wait=True)
+            self.delivery_pool = None
 
     def run_reminder_checker(self, check_interval: int = 10, max_checks: int = 2, duration_minutes: int = 1) -> None:
         """
@@ -118,84 +600,58 @@ class ReminderScheduler:
         print("🔄 REMINDER CHECKER STARTED".center(50))
         print("=" * 50)
 
-        # Lazy import to avoid circular dependencies
-        from services.notification_service import NotificationService
-        notification_service = NotificationService(self.db_manager)
+        # Keep the active table down to the hot window (partitioned storage only)
+        self.rotate_partitions()
+
+        # Archive finished reminders and give the space back (at most once per interval)
+        self.run_archival_if_due()
 
         # Choose ONE method by commenting/uncommenting
 
-        ### 🔹 Method 1: Using datetime.now()
-        # end_time = datetime.now() + timedelta(minutes=duration_minutes)
+        ### 🔹 Method 1: Using clock.now()
+        # end_time = self.clock.now() + timedelta(minutes=duration_minutes)
 
-        ### 🔹 Method 2: Using time.time()
-        start_time = time.time()
+        ### 🔹 Method 2: Using clock.time()
+        start_time = self.clock.time()
         end_time = start_time + (duration_minutes * 60)
 
         check_count = 0
 
         while check_count < max_checks:  # Stop after max_checks
-            print(f"\n🔎 [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Checking reminders...")
+            print(f"\n🔎 [{self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}] Checking reminders...")
 
-            # Fetch and display upcoming reminders in the next 24 hours
-            upcoming_reminders = self.fetch_upcoming_reminders()
-            if upcoming_reminders:
+            # Show only what entered or left the next 24 hours since the previous check
+            changes = self.upcoming_window.slide()
+            if changes.entered:
                 print("\n📌 Upcoming Reminders in the Next 24 Hours:")
-                for title, reminder_time in upcoming_reminders:
-                    print(f"  - {title} at {reminder_time} \n")
+                for entry in changes.entered:
+                    print(f"  - {entry.title} at {entry.reminder_time} \n")
+            if changes.left:
+                print("\n📤 No longer upcoming:")
+                for entry in changes.left:
+                    print(f"  - {entry.title} at {entry.reminder_time}")
 
-            # Fetch due reminders
-            due_reminders = self.get_due_reminders()
-
-            if not due_reminders:
-                print("✅ No due reminders.")
-            else:
-                for reminder in due_reminders:
-                    reminder_dict = {
-                        "id": reminder[0],
-                        "title": reminder[1],
-                        "time": reminder[2],
-                        "recurrence": reminder[3],
-                        "email": reminder[4]
-                    }
-
-                    print(f"\n✅ Sending Notifications:")
-
-                    # Send notification
-                    notification_service.check_reminder(reminder_dict)
-
-                    # Mark reminder as notified
-                    self.db_manager.update_reminder_status(reminder_dict["id"])
-
-                    # Handle recurrence
-                    if reminder_dict["recurrence"] != "none":
-                        reminder_time_dt = datetime.strptime(reminder_dict["time"], "%Y-%m-%d %H:%M")
-                        next_time = self.calculate_next_occurrence(reminder_time_dt, reminder_dict["recurrence"])
-                        if next_time is not None:
-                            query = "UPDATE reminders SET reminder_time = ?, notified = 0 WHERE id = ?"
-                            self.db_manager.execute(query, (next_time.strftime("%Y-%m-%d %H:%M"), reminder_dict["id"]))
-                        else:
-                            print(
-                                f"⚠️ No next occurrence calculated for reminder ID {reminder_dict['id']}. Recurrence type: {reminder_dict['recurrence']}")
+            self.check_due()
 
             check_count += 1
             print(f"🔄 Check {check_count}/{max_checks} completed.")
 
             # Stop based on chosen method:
 
-            ## Method 1: Using datetime.now()
-            # if datetime.now() >= end_time:
+            ## Method 1: Using clock.now()
+            # if self.clock.now() >= end_time:
             #     print("⏳ Time limit reached. Stopping reminder checker.")
             #     break
 
-            ## Method 2: Using time.time()
-            if time.time() >= end_time:
+            ## Method 2: Using clock.time()
+            if self.clock.time() >= end_time:
                 print("⏳ Time limit reached. Stopping reminder checker.")
                 break
 
             print("-" * 40)
             print(f"⏳ Sleeping for {check_interval} seconds...\n")
-            time.sleep(check_interval)
+            self.clock.sleep(check_interval)
 
         print("=" * 50)
         print("✅ REMINDER CHECKER STOPPED".center(50))
-        print("=" * 50)
\ No newline at end of file
+        print("=" * 50)
@@ -0,0 +1,238 @@
+# Fast-forward simulation: replays a schedule on a simulated clock against stub channels
+
+import contextlib
+import io
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from database.db_manager import DBManager
+from services.fanout import ReminderDelivery
+from services.notification_service import NotificationService
+from services.occurrence_expander import OccurrenceExpander
+from services.recurrence_rules import normalize_recurrence
+from services.scheduler_service import ReminderScheduler
+from utils.clock import SimulatedClock
+from utils.time_utils import format_reminder_time, parse_reminder_time, to_epoch
+from typing import Any, Dict, List, Optional, Tuple
+
+
+SIMULATION_RECURRENCES = [
+    "none", "daily", "weekly", "monthly", "yearly",
+    "every 2 weeks on mon,thu", "every day on weekdays", "last fri of every month", "every 3 days",
+]
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silences the checker's prints and the notification log (late-delivery warnings included)."""
+    logging.disable(logging.WARNING)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+class StubNotificationService(NotificationService):
+    """NotificationService whose channels only record what would have been sent, and when."""
+
+    def __init__(self, db_manager: Any, clock: SimulatedClock, pushbullet: bool = False) -> None:
+        super().__init__(db_manager, clock=clock)
+        self.pushbullet_api_key = "simulated" if pushbullet else ""
+        self.deliveries: List[Tuple[int, str, float]] = []  # (reminder id, occurrence time, sent at)
+        self.channel_counts: Counter = Counter()
+        self._lock = threading.Lock()  # Deliveries run on several threads
+
+    def check_reminder(self, reminder: Dict[str, Any], update_status: bool = True) -> ReminderDelivery:
+        with self._lock:
+            self.deliveries.append((reminder["id"], reminder["time"], self.clock.time()))
+        return super().check_reminder(reminder, update_status)
+
+    def _record(self, channel: str) -> bool:
+        with self._lock:
+            self.channel_counts[channel] += 1
+        return True
+
+    def send_desktop_notification(self, title: str, message: str) -> bool:
+        return self._record("desktop")
+
+    def send_email_notification(self, recipient_email: Optional[str], subject: str, message: str) -> bool:
+        return self._record("email")
+
+    def send_pushbullet_notification(self, title: str, message: str) -> bool:
+        return self._record("pushbullet")
+
+
+@dataclass
+class SimulationReport:
+    """What a simulated run delivered compared with what the recurrence rules say should fire."""
+    reminders: int = 0
+    simulated_days: float = 0.0
+    checks: int = 0
+    expected: int = 0        # Occurrences due inside the simulated span
+    delivered: int = 0       # Notifications sent
+    duplicates: int = 0      # Extra sends of an occurrence that was already sent
+    missed: int = 0          # Expected occurrences never sent
+    unexpected: int = 0      # Sends of an occurrence no rule produced
+    late: int = 0            # Sends later than the tolerance
+    max_lateness: float = 0.0
+    average_lateness: float = 0.0
+    channel_counts: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0     # Wall-clock duration of the run
+    missed_examples: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.duplicates or self.missed or self.unexpected or self.late)
+
+    def __str__(self) -> str:
+        return (f"{self.reminders} reminders over {self.simulated_days:.0f} simulated days in {self.seconds:.1f}s "
+                f"({self.checks} checks): {self.delivered}/{self.expected} delivered, {self.duplicates} duplicates, "
+                f"{self.missed} missed, {self.unexpected} unexpected, {self.late} late "
+                f"(lateness avg {self.average_lateness:.1f}s / max {self.max_lateness:.1f}s)")
+
+
+class Simulation:
+    """
+    Runs the real checker (claims, pacing, missed-fire policies, recurrence transitions) on a
+    SimulatedClock, so a year of reminders replays in seconds.
+
+    - Reminders are seeded into an in-memory database with a mix of recurrence rules.
+    - The checker wakes on its normal `check_interval` grid, but idle stretches are skipped
+      by jumping straight to the check that follows the next due reminder.
+    - Every notification goes to StubNotificationService; afterwards the sends are compared
+      with an independent expansion of the same rules (OccurrenceExpander) to count
+      lateness, duplicates and missed fires.
+    """
+
+    def __init__(self, reminder_count: int = 100, days: float = 365, check_interval: float = 60,
+                 seed: int = 0, start: Optional[datetime] = None, email_share: float = 0.3,
+                 pushbullet: bool = False, late_tolerance: Optional[float] = None) -> None:
+        """
+        Args:
+            reminder_count (int): Reminders to seed.
+            days (float): Simulated span.
+            check_interval (float): Seconds between checks, as in `run_reminder_checker`.
+            seed (int): Random seed for the generated reminders.
+            start (Optional[datetime]): Simulated start (local time); next midnight by default.
+            email_share (float): Fraction of reminders that also send an email.
+            pushbullet (bool): Simulate a configured Pushbullet key.
+            late_tolerance (Optional[float]): Seconds after which a send counts as late
+                (one check interval by default).
+        """
+        self.reminder_count = reminder_count
+        self.days = days
+        self.check_interval = check_interval
+        self.seed = seed
+        self.start = start or (datetime.now() + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.email_share = email_share
+        self.pushbullet = pushbullet
+        self.late_tolerance = check_interval if late_tolerance is None else late_tolerance
+
+        self.clock = SimulatedClock(to_epoch(self.start))
+        self.db_manager = DBManager(":memory:")
+        self.notifier = StubNotificationService(self.db_manager, self.clock, pushbullet)
+        self.scheduler = ReminderScheduler(self.db_manager, self.notifier, worker_id="simulation", clock=self.clock)
+
+    def seed_reminders(self) -> List[Tuple[int, str, str]]:
+        """
+        Inserts `reminder_count` generated reminders spread over the simulated span.
+
+        Returns:
+            List[Tuple[int, str, str]]: (id, reminder_time, recurrence) of every seeded reminder.
+        """
+        rng = random.Random(self.seed)
+        span_minutes = max(1, int(self.days * 1440))
+        rows = []
+        for number in range(1, self.reminder_count + 1):
+            recurrence = normalize_recurrence(rng.choice(SIMULATION_RECURRENCES))
+            # Recurring reminders start early so they fire many times; one-time ones land anywhere
+            first_minutes = rng.randrange(min(span_minutes, 14 * 1440) if recurrence != "none" else span_minutes)
+            reminder_time = format_reminder_time(self.start + timedelta(minutes=first_minutes))
+            email = f"user{rng.randrange(max(1, self.reminder_count // 4))}@example.com" \
+                if rng.random() < self.email_share else None
+            rows.append((f"Simulated {number}", "Generated by the simulation", reminder_time, email, recurrence,
+                         to_epoch(parse_reminder_time(reminder_time)), "once"))
+
+        with self.db_manager.transaction() as cursor:
+            cursor.executemany("""
+                INSERT INTO reminders (title, description, reminder_time, email, recurrence, fire_at, missed_fire_policy)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        return self.db_manager.fetch_all("SELECT id, reminder_time, recurrence FROM reminders ORDER BY id")
+
+    def _next_fire_at(self) -> Optional[int]:
+        rows = self.db_manager.fetch_all("SELECT MIN(fire_at) FROM reminders WHERE notified = 0")
+        return rows[0][0] if rows else None
+
+    def _next_check(self, now: float, end: float) -> float:
+        """The next tick of the check grid, skipping ticks before anything is due."""
+        next_check = now + self.check_interval
+        fire_at = self._next_fire_at()
+        if fire_at is not None and fire_at > next_check:
+            ticks = -(-(fire_at - now) // self.check_interval)  # ceil: first tick at or after fire_at
+            next_check = now + ticks * self.check_interval
+        return min(next_check, end)
+
+    def run(self, quiet: bool = True) -> SimulationReport:
+        """
+        Seeds the reminders, runs checks until the end of the span and scores the deliveries.
+
+        Args:
+            quiet (bool): Swallow the checker's per-reminder output and log messages.
+
+        Returns:
+            SimulationReport: Lateness, duplicates and missed fires.
+        """
+        started = time.perf_counter()
+        seeded = self.seed_reminders()
+        end = self.clock.time() + self.days * 86400
+
+        report = SimulationReport(reminders=len(seeded), simulated_days=self.days)
+        with _quiet() if quiet else contextlib.nullcontext():
+            while True:
+                self.scheduler.check_due()
+                report.checks += 1
+                now = self.clock.time()
+                if now >= end:
+                    break
+                self.clock.sleep(self._next_check(now, end) - now)
+
+        # The final check ran at `end`, so everything due at or before it should have fired
+        expander = OccurrenceExpander((row[0] for row in seeded), (row[1] for row in seeded), (row[2] for row in seeded))
+        last = datetime.fromtimestamp(end) + timedelta(seconds=1)
+        occurrences = expander.expand(self.start, last)
+        expected = set(zip(occurrences.reminder_ids.tolist(), occurrences.formatted_times().tolist()))
+        self._score(report, expected)
+        report.channel_counts = dict(self.notifier.channel_counts)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _score(self, report: SimulationReport, expected: set) -> None:
+        sent = Counter()
+        lateness = []
+        for reminder_id, occurrence, sent_at in self.notifier.deliveries:
+            key = (reminder_id, occurrence)
+            sent[key] += 1
+            if key in expected and sent[key] == 1:
+                lateness.append(sent_at - to_epoch(parse_reminder_time(occurrence)))
+
+        missed = sorted(expected - sent.keys())
+        report.expected = len(expected)
+        report.delivered = len(self.notifier.deliveries)
+        report.duplicates = sum(count - 1 for count in sent.values())
+        report.missed = len(missed)
+        report.missed_examples = missed[:10]
+        report.unexpected = sum(1 for key in sent if key not in expected)
+        report.late = sum(1 for seconds in lateness if seconds > self.late_tolerance)
+        report.max_lateness = max(lateness, default=0.0)
+        report.average_lateness = sum(lateness) / len(lateness) if lateness else 0.0
+
+    def close(self) -> None:
+        self.scheduler.close()
+        self.notifier.close()
+        self.db_manager.close()
@@ -0,0 +1,266 @@
+# Pool of authenticated SMTP sessions reused across emails and checker cycles
+
+import smtplib
+import ssl
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.message import EmailMessage
+from config.settings import (
+    SMTP_HOST,
+    SMTP_PORT,
+    SMTP_SECURITY,
+    SMTP_TIMEOUT,
+    SMTP_POOL_SIZE,
+    SMTP_IDLE_TIMEOUT,
+    SMTP_NOOP_AFTER_SECONDS,
+    SMTP_MAX_MESSAGES_PER_SESSION,
+)
+from utils.clock import Clock, SYSTEM_CLOCK
+from typing import Callable, Iterable, Iterator, List, Optional
+
+
+SMTP_SECURITY_MODES = ("ssl", "starttls", "none")
+SERVICE_CLOSING = 421  # Reply code of a server that is about to drop the connection
+
+
+def _is_dead_session(error: BaseException) -> bool:
+    """
+    True for errors after which the connection cannot be used any more (the message was not
+    accepted), as opposed to the server rejecting this one message.
+    """
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == SERVICE_CLOSING
+    # Socket-level failures; every other SMTPException is also an OSError but leaves the session usable
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+@dataclass
+class _Session:
+    server: smtplib.SMTP
+    created_at: float
+    last_used: float
+    messages: int = 0
+
+
+class SMTPSessionPool:
+    """
+    Keeps up to `size` logged-in SMTP connections open and lends them out one send at a time.
+
+    - The TLS handshake and login happen once per session instead of once per email; a due
+      batch, and the next checker cycle, reuse the warm sessions.
+    - A session idle longer than SMTP_IDLE_TIMEOUT is closed instead of reused (servers drop
+      idle clients), one idle longer than SMTP_NOOP_AFTER_SECONDS is probed with NOOP first,
+      and one that served SMTP_MAX_MESSAGES_PER_SESSION emails is retired.
+    - A send that fails because the session died is retried once on a fresh connection.
+    - Host, port and security ("ssl", "starttls" or "none") come from the settings, so a
+      local test server (e.g. `python -m aiosmtpd -n`) can stand in for the real provider.
+    """
+
+    def __init__(self, username: str = "", password: str = "", host: str = SMTP_HOST, port: int = SMTP_PORT,
+                 security: str = SMTP_SECURITY, size: int = SMTP_POOL_SIZE, timeout: float = SMTP_TIMEOUT,
+                 idle_timeout: float = SMTP_IDLE_TIMEOUT, noop_after: float = SMTP_NOOP_AFTER_SECONDS,
+                 max_messages: int = SMTP_MAX_MESSAGES_PER_SESSION, clock: Clock = SYSTEM_CLOCK) -> None:
+        """
+        Args:
+            username (str): Login user; no login when empty.
+            password (str): Login password.
+            host (str): SMTP server host.
+            port (int): SMTP server port.
+            security (str): "ssl" (implicit TLS), "starttls" or "none".
+            size (int): Most sessions open at once; further senders wait for a free one.
+            timeout (float): Socket timeout in seconds.
+            idle_timeout (float): Close sessions idle longer than this.
+            noop_after (float): Probe sessions idle longer than this with NOOP before reuse.
+            max_messages (int): Retire a session after this many emails.
+            clock (Clock): Source of time for idle tracking.
+
+        Raises:
+            ValueError: If `security` is not one of SMTP_SECURITY_MODES.
+        """
+        if security not in SMTP_SECURITY_MODES:
+            raise ValueError(f"SMTP security must be one of {', '.join(SMTP_SECURITY_MODES)}")
+        self.username = username
+        self.password = password
+        self.host = host
+        self.port = port
+        self.security = security
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.noop_after = noop_after
+        self.max_messages = max_messages
+        self.clock = clock
+
+        self._condition = threading.Condition()
+        self._idle: List[_Session] = []  # Most recently used last
+        self._open = 0  # Sessions created and not yet closed (idle or lent out)
+        self._closed = False
+        self.connects = 0  # Sessions opened since start (handshake + login each)
+        self.sent = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        """Opens and authenticates a new connection."""
+        if self.security == "ssl":
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout, context=ssl.create_default_context())
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == "starttls":
+                server.starttls(context=ssl.create_default_context())
+        try:
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            self._close_server(server)
+            raise
+        self.connects += 1
+        return server
+
+    @staticmethod
+    def _close_server(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _discard(self, session: _Session) -> None:
+        self._close_server(session.server)
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    def _usable(self, session: _Session, now: float) -> bool:
+        """False for sessions that are stale, worn out or fail a NOOP probe."""
+        idle = now - session.last_used
+        if idle > self.idle_timeout or session.messages >= self.max_messages:
+            return False
+        if idle > self.noop_after:
+            try:
+                return session.server.noop()[0] == 250
+            except Exception:
+                return False
+        return True
+
+    def _acquire(self) -> _Session:
+        """Lends an idle session, or opens a new one while under `size`, or waits for one."""
+        while True:
+            with self._condition:
+                while not self._idle and self._open >= self.size:
+                    self._condition.wait()
+                session = self._idle.pop() if self._idle else None
+                if session is None:
+                    self._open += 1  # Reserve the slot before connecting outside the lock
+
+            if session is None:
+                now = self.clock.time()
+                try:
+                    return _Session(self._connect(), now, now)
+                except Exception:
+                    with self._condition:
+                        self._open -= 1
+                        self._condition.notify()
+                    raise
+
+            if self._usable(session, self.clock.time()):
+                return session
+            self._discard(session)
+
+    def _release(self, session: _Session) -> None:
+        session.last_used = self.clock.time()
+        with self._condition:
+            if not self._closed:
+                self._idle.append(session)
+                self._condition.notify()
+                return
+        self._discard(session)
+
+    @contextmanager
+    def _borrow(self) -> Iterator[_Session]:
+        session = self._acquire()
+        try:
+            yield session
+        except BaseException as e:
+            if _is_dead_session(e):
+                self._discard(session)
+            else:
+                self._release(session)
+            raise
+        self._release(session)
+
+    @contextmanager
+    def session(self) -> Iterator[smtplib.SMTP]:
+        """
+        Borrows a logged-in connection. It goes back to the pool afterwards, unless the block
+        raised an error that means the connection is dead.
+        """
+        with self._borrow() as session:
+            yield session.server
+
+    def send(self, message: EmailMessage) -> None:
+        """
+        Sends one email on a pooled session, reconnecting once if the session turns out to be dead.
+
+        Raises:
+            smtplib.SMTPException | OSError: If the send fails on a fresh session too, or the
+                server rejected the message.
+        """
+        self.send_many([message])
+
+    def send_many(self, messages: Iterable[EmailMessage],
+                  on_sent: Optional[Callable[[EmailMessage], None]] = None) -> int:
+        """
+        Sends messages back to back on one session (smtplib has no ESMTP PIPELINING, so this is
+        the closest equivalent: one handshake and login for the whole run).
+
+        Args:
+            messages (Iterable[EmailMessage]): Emails to send, in order.
+            on_sent (Optional[Callable[[EmailMessage], None]]): Called after each accepted email.
+
+        Returns:
+            int: Number of emails sent.
+
+        Raises:
+            smtplib.SMTPException | OSError: As for `send`; emails before the failing one were sent.
+        """
+        pending = list(messages)
+        sent = 0
+        retried = False
+        while sent < len(pending):
+            borrowed = False
+            try:
+                with self._borrow() as session:
+                    borrowed = True
+                    # Stop at the per-session limit; the next round takes a fresh session
+                    while sent < len(pending) and session.messages < self.max_messages:
+                        session.server.send_message(pending[sent])
+                        session.messages += 1
+                        with self._condition:
+                            self.sent += 1
+                        if on_sent:
+                            on_sent(pending[sent])
+                        sent += 1
+                        retried = False
+            except Exception as e:
+                # The session died under us; one more try on a new one (a failed connect is final)
+                if retried or not borrowed or not _is_dead_session(e):
+                    raise
+                retried = True
+        return sent
+
+    @property
+    def idle_sessions(self) -> int:
+        with self._condition:
+            return len(self._idle)
+
+    def close(self) -> None:
+        """Logs out of every idle session; sessions lent out are closed when they come back."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._discard(session)
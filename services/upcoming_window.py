@@ -0,0 +1,323 @@
+# Materialized window of upcoming occurrences, maintained incrementally instead of re-queried
+
+import heapq
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from config.settings import UPCOMING_WINDOW_HOURS, UPCOMING_SHADOW_TABLE
+from services.occurrence_expander import OccurrenceExpander
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.time_utils import to_epoch, from_epoch
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+SHADOW_TABLE = "upcoming_window"
+
+
+@dataclass(frozen=True, order=True)
+class UpcomingEntry:
+    """One occurrence inside the window, ordered by fire time."""
+    fire_at: int
+    reminder_id: int
+    title: str = field(compare=False)
+    reminder_time: str = field(compare=False)  # Local time, as stored in reminder_time
+
+
+@dataclass
+class WindowDelta:
+    """Entries that entered or left the window since the previous `changes()` call, each in time order."""
+    entered: List[UpcomingEntry] = field(default_factory=list)
+    left: List[UpcomingEntry] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.entered or self.left)
+
+
+class UpcomingWindow:
+    """
+    Every occurrence (recurrences expanded) due in (now, now + hours], kept in memory.
+
+    - Built with one query on first use, then updated from ReminderManager events
+      (`on_reminder_event`) and from fired reminders (`refresh`), one reminder at a time.
+    - `slide` moves the window forward: passed occurrences drop out and only the newly
+      covered stretch is expanded. Writes by other processes are noticed through
+      `PRAGMA data_version` and trigger a rebuild.
+    - `changes` reports only what entered or left since it was last called.
+    - With `shadow=True` the entries are mirrored into the `upcoming_window` table, so
+      other processes can read the window (`read_shadow`) without expanding anything.
+    """
+
+    def __init__(self, db_manager: Any, hours: float = UPCOMING_WINDOW_HOURS,
+                 shadow: bool = UPCOMING_SHADOW_TABLE, clock: Clock = SYSTEM_CLOCK) -> None:
+        """
+        Args:
+            db_manager (Any): The DBManager owning the reminders table.
+            hours (float): Length of the window.
+            shadow (bool): Mirror the window into the `upcoming_window` table.
+            clock (Clock): Source of the current time when none is passed.
+        """
+        self.db_manager = db_manager
+        self.clock = clock
+        self.span = int(hours * 3600)
+        self.shadow = shadow
+
+        self._lock = threading.RLock()  # Events may arrive from the daemon's scheduler thread
+        self._start: Optional[int] = None  # Window is (start, end]; None until built
+        self._end = 0
+        self._entries: Dict[Tuple[int, int], UpcomingEntry] = {}  # (reminder id, fire_at) -> entry
+        self._by_reminder: Dict[int, Set[Tuple[int, int]]] = {}
+        self._expiry: List[Tuple[int, int]] = []  # Min-heap of entry keys by fire_at (stale keys skipped)
+        self._sources: Dict[int, Tuple[str, str, str]] = {}  # Pending reminders due by `end`: title, time, rule
+        self._expander: Optional[Tuple[OccurrenceExpander, Dict[int, str]]] = None  # Rebuilt when sources change
+        self._entered: Dict[Tuple[int, int], UpcomingEntry] = {}
+        self._left: Dict[Tuple[int, int], UpcomingEntry] = {}
+        self._shadow_ops: List[Tuple[bool, UpcomingEntry]] = []  # (added?, entry) not yet written
+        self._data_version: Optional[int] = None
+
+    @property
+    def built(self) -> bool:
+        return self._start is not None
+
+    def _add(self, entry: UpcomingEntry) -> None:
+        key = (entry.reminder_id, entry.fire_at)
+        if key in self._entries:
+            return
+        self._entries[key] = entry
+        self._by_reminder.setdefault(entry.reminder_id, set()).add(key)
+        heapq.heappush(self._expiry, (entry.fire_at, entry.reminder_id))
+        if self._left.pop(key, None) is None:  # Left and came back: no net change
+            self._entered[key] = entry
+        self._shadow_ops.append((True, entry))
+
+    def _remove(self, key: Tuple[int, int]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_reminder[entry.reminder_id]
+        keys.discard(key)
+        if not keys:
+            del self._by_reminder[entry.reminder_id]
+        if self._entered.pop(key, None) is None:
+            self._left[key] = entry
+        self._shadow_ops.append((False, entry))
+
+    def _fetch_sources(self, where: str, params: Tuple[Any, ...]) -> Dict[int, Tuple[str, str, str]]:
+        """Pending reminders matching `where`, as id -> (title, reminder_time, recurrence)."""
+        with self.db_manager.read() as conn:
+            rows = conn.execute(
+                f"SELECT id, title, reminder_time, recurrence FROM reminders WHERE notified = 0 AND {where}",
+                params).fetchall()
+        return {reminder_id: (title, reminder_time, recurrence) for reminder_id, title, reminder_time, recurrence in rows}
+
+    def _expand(self, start: int, end: int, sources: Optional[Dict[int, Tuple[str, str, str]]] = None) -> None:
+        """Adds every occurrence in (start, end] of `sources` (all known sources by default)."""
+        if sources is None:
+            if self._expander is None:
+                self._expander = self._build_expander(self._sources)
+            expander, titles = self._expander
+        else:
+            expander, titles = self._build_expander(sources)
+        if not len(expander):
+            return
+
+        # The expander's window is half-open [low, high); shift by a second for (start, end]
+        occurrences = expander.expand(from_epoch(start + 1), from_epoch(end + 1))
+        for reminder_id, when, text in zip(occurrences.reminder_ids.tolist(),
+                                           occurrences.times.astype("datetime64[us]").tolist(),
+                                           occurrences.formatted_times().tolist()):
+            self._add(UpcomingEntry(to_epoch(when), reminder_id, titles[reminder_id], text))
+
+    @staticmethod
+    def _build_expander(sources: Dict[int, Tuple[str, str, str]]) -> Tuple[OccurrenceExpander, Dict[int, str]]:
+        expander = OccurrenceExpander(sources.keys(), (source[1] for source in sources.values()),
+                                      [source[2] for source in sources.values()])
+        return expander, {reminder_id: source[0] for reminder_id, source in sources.items()}
+
+    def build(self, now: Optional[float] = None) -> int:
+        """
+        (Re)loads the whole window with one query. Differences from the previous contents
+        are recorded as changes, so a rebuild after an outside write reports only what moved.
+
+        Returns:
+            int: Number of entries in the window.
+        """
+        with self._lock:
+            start = int(self.clock.time() if now is None else now)
+            self._data_version = self.db_manager.data_version()
+            # What the last `changes()` call left the caller with
+            reported = {key: entry for key, entry in self._entries.items() if key not in self._entered}
+            reported.update(self._left)
+            self._entries, self._by_reminder, self._expiry = {}, {}, []
+
+            self._start, self._end = start, start + self.span
+            self._sources = self._fetch_sources("fire_at <= ?", (self._end,))
+            self._expander = None
+            self._expand(self._start, self._end)
+
+            # Report only the difference against what the caller has already seen
+            self._entered = {key: entry for key, entry in self._entries.items() if key not in reported}
+            self._left = {key: entry for key, entry in reported.items() if key not in self._entries}
+            if self.shadow:
+                self._shadow_ops.clear()
+                self._rewrite_shadow()
+            return len(self._entries)
+
+    def slide(self, now: Optional[float] = None) -> WindowDelta:
+        """
+        Moves the window to (now, now + hours] and returns the changes since the last call.
+        Builds the window on first use and rebuilds it after writes by other processes.
+
+        Returns:
+            WindowDelta: Entries that entered or left the window.
+        """
+        with self._lock:
+            now = int(self.clock.time() if now is None else now)
+            if not self.built or self._external_change():
+                self.build(now)
+                return self.changes()
+
+            if now > self._start:
+                # Occurrences that are no longer in the future drop out
+                while self._expiry and self._expiry[0][0] <= now:
+                    fire_at, reminder_id = heapq.heappop(self._expiry)
+                    self._remove((reminder_id, fire_at))
+
+                old_end, self._start, self._end = self._end, now, now + self.span
+                if self._end > old_end:
+                    # Only the newly covered stretch is read and expanded
+                    new_sources = self._fetch_sources("fire_at > ? AND fire_at <= ?", (old_end, self._end))
+                    if new_sources:
+                        self._sources.update(new_sources)
+                        self._expander = None
+                    self._expand(old_end, self._end)
+
+            self._flush_shadow()
+            return self.changes()
+
+    def refresh(self, reminder_ids: Iterable[int]) -> None:
+        """Re-reads the given reminders (added, edited, deleted or fired) and replaces their entries."""
+        reminder_ids = list(reminder_ids)
+        if not reminder_ids:
+            return
+        with self._lock:
+            if not self.built:
+                return  # Nothing to keep in step yet; the first read builds from the database
+
+            for reminder_id in reminder_ids:
+                for key in list(self._by_reminder.get(reminder_id, ())):
+                    self._remove(key)
+                self._sources.pop(reminder_id, None)
+
+            placeholders = ", ".join("?" * len(reminder_ids))
+            sources = self._fetch_sources(f"fire_at <= ? AND id IN ({placeholders})", (self._end, *reminder_ids))
+            self._sources.update(sources)
+            self._expander = None
+            if sources:
+                self._expand(self._start, self._end, sources)
+            self._flush_shadow()
+
+    def on_reminder_event(self, event: str, reminder_id: Optional[int]) -> None:
+        """
+        ReminderManager listener: keeps the window in step with add / edit / delete.
+
+        Args:
+            event (str): "added", "updated", "deleted" or "bulk_added".
+            reminder_id (Optional[int]): The reminder concerned; None for bulk changes.
+        """
+        if not self.built:
+            return
+        if reminder_id is None:
+            self.build()
+        else:
+            self.refresh([reminder_id])
+
+    def _external_change(self) -> bool:
+        """True if another connection committed since the window was built."""
+        try:
+            return self.db_manager.data_version() != self._data_version
+        except sqlite3.Error:
+            return False
+
+    def entries(self, now: Optional[float] = None) -> List[UpcomingEntry]:
+        """
+        Everything in the window, in time order (slides the window to `now` first).
+
+        Returns:
+            List[UpcomingEntry]: The upcoming occurrences.
+        """
+        with self._lock:
+            delta = self.slide(now)
+            # Reading does not consume the changes; they stay for the next `changes()` call
+            self._entered.update(((e.reminder_id, e.fire_at), e) for e in delta.entered)
+            self._left.update(((e.reminder_id, e.fire_at), e) for e in delta.left)
+            return sorted(self._entries.values())
+
+    def changes(self) -> WindowDelta:
+        """Entries that entered or left since the previous call, then starts a new delta."""
+        with self._lock:
+            delta = WindowDelta(sorted(self._entered.values()), sorted(self._left.values()))
+            self._entered, self._left = {}, {}
+            return delta
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _ensure_shadow(cursor: sqlite3.Cursor) -> None:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {SHADOW_TABLE} (
+                reminder_id INTEGER NOT NULL,
+                fire_at INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                reminder_time TEXT NOT NULL,
+                PRIMARY KEY (reminder_id, fire_at)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{SHADOW_TABLE}_fire_at ON {SHADOW_TABLE} (fire_at)")
+
+    def _rewrite_shadow(self) -> None:
+        try:
+            with self.db_manager.transaction() as cursor:
+                self._ensure_shadow(cursor)
+                cursor.execute(f"DELETE FROM {SHADOW_TABLE}")
+                cursor.executemany(
+                    f"INSERT INTO {SHADOW_TABLE} (reminder_id, fire_at, title, reminder_time) VALUES (?, ?, ?, ?)",
+                    [(e.reminder_id, e.fire_at, e.title, e.reminder_time) for e in self._entries.values()])
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (upcoming window): {e}")
+
+    def _flush_shadow(self) -> None:
+        """Writes the entry changes made since the last flush in one transaction."""
+        ops, self._shadow_ops = self._shadow_ops, []
+        if not self.shadow or not ops:
+            return
+        try:
+            with self.db_manager.transaction() as cursor:
+                self._ensure_shadow(cursor)
+                for added, e in ops:
+                    if added:
+                        cursor.execute(f"INSERT OR REPLACE INTO {SHADOW_TABLE} (reminder_id, fire_at, title, reminder_time) "
+                                       f"VALUES (?, ?, ?, ?)", (e.reminder_id, e.fire_at, e.title, e.reminder_time))
+                    else:
+                        cursor.execute(f"DELETE FROM {SHADOW_TABLE} WHERE reminder_id = ? AND fire_at = ?",
+                                       (e.reminder_id, e.fire_at))
+        except sqlite3.Error as e:
+            print(f"❌ Database Error (upcoming window): {e}")
+
+    @staticmethod
+    def read_shadow(db_manager: Any, now: Optional[float] = None) -> List[UpcomingEntry]:
+        """
+        Reads the window another process maintains in the shadow table.
+
+        Returns:
+            List[UpcomingEntry]: Entries still in the future, in time order (empty without a shadow table).
+        """
+        now = int(SYSTEM_CLOCK.time() if now is None else now)
+        try:
+            with db_manager.read() as conn:
+                rows = conn.execute(
+                    f"SELECT fire_at, reminder_id, title, reminder_time FROM {SHADOW_TABLE} "
+                    f"WHERE fire_at > ? ORDER BY fire_at, reminder_id", (now,)).fetchall()
+        except sqlite3.OperationalError:
+            return []
+        return [UpcomingEntry(*row) for row in rows]
@@ -1,7 +1,17 @@
+import os
 import pytest
+from config.settings import DB_NAME
 from database.db_manager import DBManager
 
 
+@pytest.fixture(scope="session", autouse=True)
+def real_database_untouched():
+    """Fails the run if any test (or import) created the real database file."""
+    existed = os.path.exists(DB_NAME)
+    yield
+    assert existed or not os.path.exists(DB_NAME), f"The test suite created {DB_NAME}"
+
+
 @pytest.fixture
 def db_manager():
     manager = DBManager(db_name=":memory:", create_table=True)
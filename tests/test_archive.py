@@ -0,0 +1,107 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from database.db_manager import DBManager
+from database.archive import ArchiveManager, archive_path_for
+from services.scheduler_service import ReminderScheduler
+
+
+def _insert(db_manager, count, days_ago, recurrence="none", notified=1):
+    when = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d %H:%M")
+    with db_manager.transaction() as cursor:
+        cursor.executemany(
+            "INSERT INTO reminders (title, description, reminder_time, recurrence, notified) VALUES (?, ?, ?, ?, ?)",
+            [(f"{recurrence} {days_ago} #{i}", "x" * 400, when, recurrence, notified) for i in range(count)],
+        )
+
+
+def test_archive_path_for():
+    assert archive_path_for("reminders_app.db") == "reminders_app_archive.db"
+    assert archive_path_for(":memory:") == ":memory:"
+
+
+def test_archive_moves_rows_in_chunks(tmp_path):
+    db_manager = DBManager(db_name=str(tmp_path / "reminders.db"))
+    _insert(db_manager, 25, days_ago=30)
+    _insert(db_manager, 3, days_ago=30, recurrence="daily")
+    _insert(db_manager, 4, days_ago=1)
+
+    cutoff = int((datetime.now() - timedelta(days=7)).timestamp())
+    manager = ArchiveManager(db_manager)
+    assert manager.archive(cutoff, chunk_size=10) == 25
+    assert db_manager.fetch_all("SELECT COUNT(*) FROM reminders") == [(7,)]
+
+    archived = sqlite3.connect(manager.path).execute("SELECT COUNT(*) FROM reminders").fetchone()
+    assert archived == (25,)
+    db_manager.close()
+
+
+def test_archive_without_candidates_creates_no_file(tmp_path):
+    db_manager = DBManager(db_name=str(tmp_path / "reminders.db"))
+    _insert(db_manager, 2, days_ago=1, notified=0)
+
+    manager = ArchiveManager(db_manager)
+    assert manager.archive(int(datetime.now().timestamp())) == 0
+    assert not os.path.exists(manager.path)
+    db_manager.close()
+
+
+def _file_size(db_path):
+    wal_path = f"{db_path}-wal"
+    return os.path.getsize(db_path) + (os.path.getsize(wal_path) if os.path.exists(wal_path) else 0)
+
+
+def test_clean_old_reminders_reports_reclaimed_bytes(tmp_path):
+    db_path = tmp_path / "reminders.db"
+    db_manager = DBManager(db_name=str(db_path))
+    _insert(db_manager, 2000, days_ago=30)
+    size_before = _file_size(db_path)
+
+    report = ReminderScheduler(db_manager).clean_old_reminders(retention_days=7, chunk_size=500)
+
+    assert report.rows_archived == 2000
+    assert report.bytes_reclaimed > 0
+    assert _file_size(db_path) < size_before
+    db_manager.close()
+
+
+def test_archival_runs_once_per_interval(db_manager):
+    scheduler = ReminderScheduler(db_manager)
+
+    assert scheduler.run_archival_if_due() is not None
+    assert scheduler.run_archival_if_due() is None
+
+
+def test_archive_keeps_one_copy_per_reminder(tmp_path):
+    db_manager = DBManager(db_name=str(tmp_path / "reminders.db"))
+    _insert(db_manager, 3, days_ago=30)
+    manager = ArchiveManager(db_manager)
+    # An archive written before ids were unique, holding a chunk that was copied twice
+    with db_manager.attached(manager.path, "archive") as cursor:
+        cursor.execute("CREATE TABLE archive.reminders (archive_id INTEGER PRIMARY KEY, id INTEGER NOT NULL, "
+                       "title TEXT NOT NULL, description TEXT NOT NULL, reminder_time DATETIME NOT NULL, email TEXT, "
+                       "recurrence TEXT DEFAULT 'none', notified INTEGER DEFAULT 0, fire_at INTEGER)")
+        for _ in range(2):
+            cursor.execute("INSERT INTO archive.reminders (id, title, description, reminder_time) VALUES (1, 't', 'x', '2020-01-01 09:00')")
+
+    assert manager.archive(int(datetime.now().timestamp()), chunk_size=2) == 3
+
+    ids = sqlite3.connect(manager.path).execute("SELECT id FROM reminders ORDER BY id").fetchall()
+    assert ids == [(1,), (2,), (3,)]
+    db_manager.close()
+
+
+def test_archive_includes_month_partitions(tmp_path):
+    db_manager = DBManager(db_name=str(tmp_path / "reminders.db"), partitioned=True)
+    _insert(db_manager, 4, days_ago=60)
+    _insert(db_manager, 2, days_ago=30)
+    db_manager.partitions.rotate(int((datetime.now() - timedelta(days=45)).timestamp()))
+    assert db_manager.partitions.partitions()
+
+    manager = ArchiveManager(db_manager)
+    assert manager.archive(int((datetime.now() - timedelta(days=7)).timestamp())) == 6
+
+    assert db_manager.partitions.partitions() == []
+    assert db_manager.fetch_all("SELECT COUNT(*) FROM reminders") == [(0,)]
+    assert sqlite3.connect(manager.path).execute("SELECT COUNT(*) FROM reminders").fetchone() == (6,)
+    db_manager.close()
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from services.async_notification_service import AsyncNotificationService
+from services.async_scheduler import AsyncReminderScheduler
+from services.dispatch_scheduler import DispatchScheduler
+from services.notification_service import NotificationService
+from services.scheduler_service import ReminderScheduler
+from utils.clock import SimulatedClock
+
+
+class SlowNotifier:
+    """Blocking senders that take a while, like a real SMTP login."""
+
+    pushbullet_api_key = ""
+    compose = staticmethod(NotificationService.compose)
+    channels_for = NotificationService.channels_for
+    send = NotificationService.send
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.emails = []
+
+    def send_desktop_notification(self, title, message):
+        pass
+
+    def send_email_notification(self, recipient_email, subject, message):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.emails.append(recipient_email)
+
+
+def _insert_due(db_manager, count, recurrence="none"):
+    when = (datetime.now() - timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M")
+    with db_manager.transaction() as cursor:
+        cursor.executemany(
+            "INSERT INTO reminders (title, description, reminder_time, email, recurrence) VALUES (?, ?, ?, ?, ?)",
+            [(f"Due {recurrence} {i}", "x", when, f"user{i}@example.com", recurrence) for i in range(count)],
+        )
+
+
+def test_deliveries_run_concurrently_within_channel_limit(db_manager):
+    _insert_due(db_manager, 20)
+    slow = SlowNotifier(delay=0.1)
+    scheduler = ReminderScheduler(db_manager)
+    scheduler.dispatcher = DispatchScheduler({}, {})  # No rate limits: only the channel's concurrency cap applies
+    checker = AsyncReminderScheduler(scheduler, AsyncNotificationService(slow, channel_limits={"email": 5}))
+
+    started = time.perf_counter()
+    delivered = asyncio.run(checker.check_once())
+    elapsed = time.perf_counter() - started
+    checker.close()
+
+    assert delivered == 20
+    assert len(slow.emails) == 20
+    assert slow.peak == 5
+    assert elapsed < 1.0  # 20 x 0.1s one at a time would take 2s
+    assert db_manager.fetch_all("SELECT COUNT(*) FROM reminders WHERE notified = 0") == [(0,)]
+
+
+def test_recurring_reminders_advance(db_manager):
+    _insert_due(db_manager, 1, recurrence="daily")
+    checker = AsyncReminderScheduler(ReminderScheduler(db_manager), AsyncNotificationService(SlowNotifier(0)))
+
+    asyncio.run(checker.check_once())
+    checker.close()
+
+    (fire_at, notified), = db_manager.fetch_all("SELECT fire_at, notified FROM reminders")
+    assert notified == 0
+    assert fire_at > time.time()
+
+
+def test_checker_loop_stops_after_max_checks(db_manager):
+    checker = AsyncReminderScheduler(ReminderScheduler(db_manager), AsyncNotificationService(SlowNotifier(0)))
+
+    started = time.perf_counter()
+    asyncio.run(checker.run_reminder_checker(check_interval=0, max_checks=3, duration_minutes=None))
+    checker.close()
+
+    assert time.perf_counter() - started < 1.0
+
+
+def test_batches_are_claimed_within_the_budget_and_paced(db_manager):
+    _insert_due(db_manager, 40)
+    clock = SimulatedClock(time.time())
+    slow = SlowNotifier(0)
+    scheduler = ReminderScheduler(db_manager, clock=clock)
+    scheduler.dispatcher = DispatchScheduler({"email": (0.1, 2)}, {}, clock=clock)
+    claims = []
+    claim = scheduler.claim_due_reminders
+    scheduler.claim_due_reminders = lambda limit: claims.append(limit) or claim(limit)
+    checker = AsyncReminderScheduler(scheduler, AsyncNotificationService(slow))
+
+    delivered = asyncio.run(checker.check_once())
+    checker.close()
+
+    assert delivered == 40
+    assert len(slow.emails) == 40
+    assert claims == [17] * 3  # 2 + 0.1/s over half a 300s lease
+    assert clock.slept >= 380  # 40 emails at 0.1/s after a burst of 2
+    assert db_manager.fetch_all("SELECT COUNT(*) FROM reminders WHERE notified = 0") == [(0,)]
+
+
+def test_async_notifier_uses_the_shared_message_and_channels():
+    slow = SlowNotifier(0)
+    slow.pushbullet_api_key = "key"
+    sent = []
+    slow.send_pushbullet_notification = lambda title, message: sent.append(("pushbullet", title, message)) or True
+    notifier = AsyncNotificationService(slow)
+
+    reminder = {"id": 1, "title": "Dentist", "time": "2025-06-02 09:00", "email": "me@example.com"}
+    delivery = asyncio.run(notifier.check_reminder(reminder))
+    notifier.close()
+
+    assert [result.channel for result in delivery.results] == [channel for channel, _ in slow.channels_for(reminder)]
+    assert sent == [("pushbullet", *NotificationService.compose("Dentist", "2025-06-02 09:00"))]
+    assert slow.emails == ["me@example.com"]
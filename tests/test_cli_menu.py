@@ -17,7 +17,7 @@ from datetime import datetime, timedelta
 # ------------------------------ Test validate_title ------------------------------
 
 def test_validate_title_valid():
-    assert validate_title("Morning Workout", {"meeting", "doctor"}) is True
+    assert validate_title("Morning Workout", lambda t: t.lower() in {"meeting", "doctor"}) is True
 
 def test_validate_title_empty():
     assert validate_title("") is False
@@ -30,7 +30,7 @@ def test_validate_title_too_long():
     assert validate_title(long_title) is False
 
 def test_validate_title_duplicate():
-    assert validate_title("Meeting", {"meeting", "doctor"}) is False
+    assert validate_title("Meeting", lambda t: t.lower() in {"meeting", "doctor"}) is False
 
 def test_validate_title_non_alpha_start_user_rejects(monkeypatch):
     monkeypatch.setattr('builtins.input', lambda _: 'n')
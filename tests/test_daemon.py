@@ -0,0 +1,51 @@
+import json
+import os
+import threading
+import time
+import pytest
+from services.daemon import ReminderDaemon
+
+
+@pytest.fixture
+def daemon(db_manager, tmp_path):
+    return ReminderDaemon(db_manager, pidfile=str(tmp_path / "daemon.pid"),
+                          heartbeat_file=str(tmp_path / "daemon.heartbeat"), heartbeat_interval=0.05)
+
+
+def test_daemon_writes_heartbeat_and_stops_cleanly(daemon):
+    thread = threading.Thread(target=daemon.run)
+    thread.start()
+
+    deadline = time.time() + 3
+    while not os.path.exists(daemon.heartbeat_file) and time.time() < deadline:
+        time.sleep(0.02)
+    with open(daemon.pidfile, encoding="utf-8") as handle:
+        assert int(handle.read()) == os.getpid()
+
+    daemon.request_stop()
+    thread.join(timeout=3)
+
+    assert not thread.is_alive()
+    assert not os.path.exists(daemon.pidfile)
+    with open(daemon.heartbeat_file, encoding="utf-8") as handle:
+        status = json.load(handle)
+    assert status["pid"] == os.getpid()
+    assert status["reminders_sent"] == 0
+
+
+def test_refuses_to_start_twice(daemon):
+    with open(daemon.pidfile, "w", encoding="utf-8") as handle:
+        handle.write("1")  # init is always alive
+
+    with pytest.raises(RuntimeError):
+        daemon.write_pidfile()
+
+
+def test_replaces_stale_pidfile(daemon):
+    with open(daemon.pidfile, "w", encoding="utf-8") as handle:
+        handle.write("999999999")
+
+    daemon.write_pidfile()
+
+    with open(daemon.pidfile, encoding="utf-8") as handle:
+        assert int(handle.read()) == os.getpid()
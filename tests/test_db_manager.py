@@ -1,3 +1,11 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime
+import pytest
+from database.db_manager import DBManager
+
 
 def test_create_table(db_manager):
     query = "SELECT name FROM sqlite_master WHERE type='table' AND name='reminders';"
@@ -90,3 +98,117 @@ def test_update_reminder_status_invalid_id(db_manager):
 
     # Should return an empty result since ID does not exist
     assert result == []
+
+
+def test_memory_database_is_isolated_per_instance(db_manager):
+    other = DBManager(db_name=":memory:")
+    db_manager.execute(
+        "INSERT INTO reminders (title, description, reminder_time) VALUES (?, ?, ?)",
+        ("Only Here", "Lives in the fixture database", "2025-03-25 10:00"),
+    )
+
+    assert len(db_manager.fetch_all("SELECT * FROM reminders")) == 1
+    assert other.fetch_all("SELECT * FROM reminders") == []
+
+
+def test_transaction_rolls_back_on_error(db_manager):
+    with pytest.raises(RuntimeError):
+        with db_manager.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO reminders (title, description, reminder_time) VALUES (?, ?, ?)",
+                ("Rolled Back", "Should never be committed", "2025-03-25 10:00"),
+            )
+            raise RuntimeError("boom")
+
+    assert db_manager.fetch_all("SELECT * FROM reminders") == []
+
+
+def test_file_database_uses_wal_and_reader_pool(tmp_path):
+    manager = DBManager(db_name=str(tmp_path / "pooled.db"), reader_pool_size=2)
+    manager.execute(
+        "INSERT INTO reminders (title, description, reminder_time) VALUES (?, ?, ?)",
+        ("Pooled", "Read back through a reader", "2025-03-25 10:00"),
+    )
+
+    assert manager.fetch_all("PRAGMA journal_mode") == [("wal",)]
+    assert manager.fetch_all("SELECT title FROM reminders") == [("Pooled",)]
+    with manager.read() as first, manager.read() as second:
+        assert first is not second
+    manager.close()
+
+
+@pytest.mark.parametrize("reminder_time", ["2025-03-25 10:00", "2025-03-25 10:00:00", "2025-03-25T10:00:00.123456"])
+def test_fire_at_is_derived_from_reminder_time(db_manager, reminder_time):
+    db_manager.execute(
+        "INSERT INTO reminders (title, description, reminder_time) VALUES (?, ?, ?)",
+        ("Epoch", "Normalized fire time", reminder_time),
+    )
+    expected = int(datetime(2025, 3, 25, 10, 0).timestamp())
+
+    assert db_manager.fetch_all("SELECT fire_at FROM reminders") == [(expected,)]
+
+    db_manager.execute("UPDATE reminders SET reminder_time = ?", ("2025-03-26 10:00",))
+    assert db_manager.fetch_all("SELECT fire_at FROM reminders") == [(expected + 86400,)]
+
+
+def test_due_query_uses_index(db_manager):
+    plan = db_manager.fetch_all(
+        "EXPLAIN QUERY PLAN SELECT id FROM reminders WHERE notified = 0 AND fire_at <= ?", (0,)
+    )
+    assert any("idx_reminders_due" in row[-1] for row in plan)
+
+
+def test_create_table_migrates_legacy_table(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+            CREATE TABLE reminders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, description TEXT NOT NULL,
+                reminder_time DATETIME NOT NULL, email TEXT, recurrence TEXT DEFAULT 'none', notified INTEGER DEFAULT 0
+            )
+        """)
+        conn.execute(
+            "INSERT INTO reminders (title, description, reminder_time) VALUES (?, ?, ?)",
+            ("Legacy", "Created before fire_at existed", "2025-03-25 10:00"),
+        )
+    conn.close()
+
+    manager = DBManager(db_name=path)
+
+    expected = int(datetime(2025, 3, 25, 10, 0).timestamp())
+    assert manager.fetch_all("SELECT fire_at FROM reminders") == [(expected,)]
+    manager.close()
+
+
+def test_paginate_walks_pages_in_time_order(db_manager):
+    for number, day in enumerate((3, 1, 2, 1, 5)):
+        db_manager.execute(
+            "INSERT INTO reminders (title, description, reminder_time) VALUES (?, ?, ?)",
+            (f"Day {day} #{number}", "Paged reminder", f"2025-03-0{day} 10:00"),
+        )
+
+    pages = db_manager.paginate("id, title", page_size=2)
+
+    assert [[title for _, title in page] for page in pages] == [
+        ["Day 1 #1", "Day 1 #3"],
+        ["Day 2 #2", "Day 3 #0"],
+        ["Day 5 #4"],
+    ]
+
+
+def test_paginate_is_lazy(db_manager, mocker):
+    spy = mocker.spy(db_manager, "read")
+    pages = db_manager.paginate("id", page_size=2)
+
+    assert spy.call_count == 0
+    assert next(pages, []) == []
+    assert spy.call_count == 1
+
+
+def test_importing_the_app_does_not_open_the_database(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    modules = "main, views.cli_menu, services.reminder_manager, services.daemon, utils.validation_utils"
+    subprocess.run([sys.executable, "-c", f"import {modules}"], cwd=tmp_path, check=True,
+                   env={**os.environ, "PYTHONPATH": root})
+
+    assert not (tmp_path / "reminders_app.db").exists()
@@ -0,0 +1,136 @@
+from concurrent.futures import Future
+from datetime import datetime
+from unittest.mock import MagicMock
+from services.digest import Digest, DigestCoalescer
+from services.dispatch_scheduler import DispatchScheduler
+from services.notification_service import NotificationService
+from services.outbox import OutboxWorker
+from services.scheduler_service import ReminderScheduler
+from utils.clock import SimulatedClock
+from utils.time_utils import to_epoch
+from utils.validation_utils import parse_reminder_record
+
+
+def _item(reminder_id, time, email="me@example.com", urgent=False):
+    return {"id": reminder_id, "title": f"R{reminder_id}", "time": time, "email": email, "urgent": urgent}
+
+
+def test_groups_per_address_within_the_window(db_manager):
+    coalescer = DigestCoalescer(db_manager, window=900)
+    items = [_item(1, "2025-06-02 09:00"), _item(2, "2025-06-02 09:05", email="ME@example.com "),
+             _item(3, "2025-06-02 09:10", email="other@example.com"), _item(4, "2025-06-02 11:00"),
+             _item(5, "2025-06-02 09:10", email=None)]
+
+    remaining, digests = coalescer.plan(items)
+
+    digest, = digests
+    assert digest.recipient == "me@example.com"
+    assert [item["id"] for item in digest.items] == [1, 2]
+    # Order is kept; only the email part of coalesced items moved into the digest
+    assert [item["id"] for item in remaining] == [1, 2, 3, 4, 5]
+    assert [item["email"] for item in remaining] == [None, None, "other@example.com", "me@example.com", None]
+
+
+def test_preferences_opt_out_of_digests_and_of_urgent_coalescing(db_manager):
+    coalescer = DigestCoalescer(db_manager)
+    items = [_item(1, "2025-06-02 09:00", urgent=True), _item(2, "2025-06-02 09:00"), _item(3, "2025-06-02 09:00")]
+
+    coalescer.set_preferences("Me@Example.com", urgent_separately=True)
+    remaining, digests = coalescer.plan(items)
+    assert [item["id"] for item in digests[0].items] == [2, 3]
+    assert remaining[0]["email"] == "me@example.com"  # The urgent one is still its own email
+
+    preferences = coalescer.set_preferences("me@example.com", digest=False)
+    assert (preferences.digest, preferences.urgent_separately) == (False, True)
+    assert coalescer.plan(items) == (items, [])
+
+
+def test_render_lists_urgent_items_first():
+    subject, body = Digest("me@example.com", [_item(1, "2025-06-02 09:00"), _item(2, "2025-06-02 09:30", urgent=True)]).render()
+
+    assert subject == "Reminder Digest: 2 reminders"
+    assert body.splitlines()[2:] == ["  - [URGENT] R2 at 2025-06-02 09:30", "  - R1 at 2025-06-02 09:00"]
+
+
+def test_inline_delivery_sends_one_email_per_address(db_manager):
+    service = NotificationService(db_manager)
+    service.pushbullet_api_key = ""
+    service.send_desktop_notification = MagicMock(return_value=True)
+    service.send_email_notification = MagicMock(return_value=True)
+    scheduler = ReminderScheduler(db_manager, service)
+    scheduler.dispatcher = DispatchScheduler({}, {})
+    due = [{**_item(i, "2025-06-02 09:00"), "recurrence": "none"} for i in range(40)]
+
+    report = scheduler.deliver(due, service, datetime(2025, 6, 2, 9, 1))
+
+    service.send_email_notification.assert_called_once()
+    recipient, subject, _ = service.send_email_notification.call_args.args
+    assert (recipient, subject) == ("me@example.com", "Reminder Digest: 40 reminders")
+    assert service.send_desktop_notification.call_count == 40
+    assert (report.delivered, report.digests, report.digest_items) == (40, 1, 40)
+    assert report.by_channel()["email"] == (40, 0)
+    scheduler.close()
+    service.close()
+
+
+def test_failed_digest_fails_every_reminder_in_it(db_manager):
+    service = NotificationService(db_manager)
+    service.pushbullet_api_key = ""
+    service.send_desktop_notification = MagicMock(return_value=True)
+    service.send_email_notification = MagicMock(return_value=False)
+    scheduler = ReminderScheduler(db_manager, service)
+    scheduler.dispatcher = DispatchScheduler({}, {})
+    due = [{**_item(i, "2025-06-02 09:00"), "recurrence": "none"} for i in range(3)]
+
+    report = scheduler.deliver(due, service, datetime(2025, 6, 2, 9, 1))
+
+    assert [delivery.failed_channels for delivery in report.failed] == [["email"]] * 3
+    scheduler.close()
+    service.close()
+
+
+def test_digest_that_raises_fails_every_reminder_in_it(db_manager):
+    service = NotificationService(db_manager)
+    service.pushbullet_api_key = ""
+    service.send_desktop_notification = MagicMock(return_value=True)
+    scheduler = ReminderScheduler(db_manager, service)
+    scheduler.dispatcher = DispatchScheduler({}, {})
+    broken = Future()
+    broken.set_exception(RuntimeError("email pool shut down"))
+    submit = service.fanout.submit
+    service.fanout.submit = lambda channel, sender, *args: broken if sender == service.send_digest else submit(channel, sender, *args)
+    due = [{**_item(i, "2025-06-02 09:00"), "recurrence": "none"} for i in range(3)]
+
+    report = scheduler.deliver(due, service, datetime(2025, 6, 2, 9, 1))
+
+    assert [delivery.failed_channels for delivery in report.failed] == [["email"]] * 3
+    assert {result.error for delivery in report.failed for result in delivery.results
+            if not result.ok} == {"email pool shut down"}
+    scheduler.close()
+    service.close()
+
+
+def test_outbox_worker_coalesces_email_rows(db_manager):
+    clock = SimulatedClock(to_epoch(datetime(2025, 6, 2, 9, 1)))
+    service = NotificationService(db_manager, clock=clock)
+    service.pushbullet_api_key = ""
+    service.send_desktop_notification = MagicMock(return_value=True)
+    service.send_email_notification = MagicMock(return_value=True)
+    scheduler = ReminderScheduler(db_manager, service, clock=clock, delivery_mode="outbox")
+    scheduler.enqueue_due([{**_item(i, "2025-06-02 09:00"), "recurrence": "none"} for i in range(5)],
+                          service, clock.now())
+
+    worker = OutboxWorker(scheduler.outbox, service, dispatcher=DispatchScheduler({}, {}, clock=clock))
+    assert worker.drain() == 10
+
+    service.send_email_notification.assert_called_once()
+    assert scheduler.outbox.metrics().sent == 10
+    worker.close()
+    scheduler.close()
+    service.close()
+
+
+def test_import_reads_the_urgent_flag():
+    record = {"title": "Dentist", "description": "Check-up", "reminder_time": "2999-01-01 09:00", "urgent": "yes"}
+    assert parse_reminder_record(record)[0]["urgent"] is True
+    assert parse_reminder_record({**record, "urgent": "maybe"})[1] == ["Invalid urgent flag (yes or no)."]
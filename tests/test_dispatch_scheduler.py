@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from services.dispatch_scheduler import DispatchScheduler, TokenBucket
+from services.scheduler_service import ReminderScheduler
+from utils.clock import Clock
+
+
+class ManualClock(Clock):
+    """Time only moves when the code under test sleeps."""
+
+    def __init__(self, start=1_000_000.0):
+        self.current = start
+
+    def time(self):
+        return self.current
+
+    def sleep(self, seconds):
+        self.current += max(seconds, 0)
+
+
+class PushbulletConfigured:
+    pushbullet_api_key = "key"
+
+
+def _reminder(reminder_id, minutes_ago, email=None):
+    when = datetime(2025, 6, 2, 9, 0) - timedelta(minutes=minutes_ago)
+    return {"id": reminder_id, "title": f"R{reminder_id}", "time": when.strftime("%Y-%m-%d %H:%M"), "email": email}
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(rate=2.0, burst=2, now=0.0)
+    bucket.take(0.0)
+    bucket.take(0.0)
+    assert not bucket.available(0.0)
+    assert bucket.wait_time(0.0) == 0.5
+    assert bucket.available(0.5)
+    assert bucket.full(10.0)
+
+
+def test_burst_is_spread_over_the_channel_rate():
+    clock = ManualClock()
+    dispatcher = DispatchScheduler({"email": (2.0, 3)}, {}, clock=clock)
+    sent_at = []
+
+    reminders = [_reminder(i, 0, email=f"user{i}@example.com") for i in range(9)]
+    stats = dispatcher.dispatch(reminders, lambda r: sent_at.append(clock.time() - 1_000_000.0))
+
+    # Burst of 3 right away, then one every half second
+    assert sent_at == [0, 0, 0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0]
+    assert stats.sent == 9 and stats.delayed == 6
+    assert stats.max_wait == 3.0
+
+
+def test_oldest_due_first_and_recipient_limits_do_not_block_others():
+    clock = ManualClock()
+    dispatcher = DispatchScheduler({"email": (10.0, 10)}, {"email": (1.0, 1)}, clock=clock)
+    order = []
+
+    reminders = [
+        _reminder(1, 1, email="busy@example.com"),
+        _reminder(2, 5, email="busy@example.com"),   # Oldest
+        _reminder(3, 2, email="other@example.com"),
+        _reminder(4, 0),                             # Desktop only, never limited
+    ]
+    dispatcher.dispatch(reminders, lambda r: order.append((r["id"], clock.time() - 1_000_000.0)))
+
+    assert order == [(2, 0), (3, 0), (4, 0), (1, 1.0)]
+
+
+def test_pushbullet_is_limited_only_when_configured():
+    clock = ManualClock()
+    dispatcher = DispatchScheduler({"pushbullet": (1.0, 1)}, {}, clock=clock)
+
+    dispatcher.dispatch([_reminder(i, 0) for i in range(3)], lambda r: True)
+    assert clock.time() == 1_000_000.0
+
+    dispatcher.dispatch([_reminder(i, 0) for i in range(3)], lambda r: True, PushbulletConfigured())
+    assert clock.time() == 1_000_002.0
+
+
+def test_failed_sends_are_counted_not_retried():
+    dispatcher = DispatchScheduler({}, {}, clock=ManualClock())
+
+    def send(reminder):
+        if reminder["id"] == 1:
+            raise RuntimeError("SMTP down")
+        return reminder["id"] != 2
+
+    stats = dispatcher.dispatch([_reminder(i, 0) for i in range(3)], send)
+    assert (stats.sent, stats.failed) == (3, 2)
+    assert dispatcher.stats.failed == 2
+
+
+def test_claim_limit_follows_the_tightest_channel(db_manager):
+    scheduler = ReminderScheduler(db_manager)
+    scheduler.dispatcher = DispatchScheduler({"email": (1.0, 10), "pushbullet": (0.5, 5)}, {})
+    assert scheduler.claim_limit(lease_seconds=100) == 30
+
+    scheduler.dispatcher = DispatchScheduler({}, {})
+    assert scheduler.claim_limit() == 500
@@ -0,0 +1,127 @@
+import threading
+import time
+from datetime import datetime
+from database.db_manager import DBManager
+from services.event_scheduler import EventScheduler
+from services.reminder_manager import ReminderManager
+from services.scheduler_service import ReminderScheduler
+from utils.clock import SimulatedClock
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.sent = []
+
+    def check_reminder(self, reminder, update_status=True):
+        self.sent.append((reminder["id"], time.time()))
+        return True
+
+
+def _insert(db_manager, title, fire_at, recurrence="none"):
+    reminder_time = datetime.fromtimestamp(fire_at).strftime("%Y-%m-%d %H:%M")
+    with db_manager.transaction() as cursor:
+        cursor.execute(
+            "INSERT INTO reminders (title, description, reminder_time, recurrence, fire_at) VALUES (?, ?, ?, ?, ?)",
+            (title, "x", reminder_time, recurrence, fire_at),
+        )
+        return cursor.lastrowid
+
+
+def _start(events):
+    thread = threading.Thread(target=events.run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_load_orders_by_fire_time_and_skips_stale_entries(db_manager):
+    now = int(time.time())
+    late = _insert(db_manager, "Late", now + 600)
+    early = _insert(db_manager, "Early", now + 60)
+    _insert(db_manager, "Beyond horizon", now + 7200)
+
+    events = EventScheduler(ReminderScheduler(db_manager), RecordingNotifier(), horizon=3600)
+    assert events.load() == 2
+    assert events.next_fire_at() == now + 60
+
+    db_manager.execute("UPDATE reminders SET fire_at = ? WHERE id = ?", (now + 900, early))
+    events.refresh([early])
+    assert events.next_fire_at() == now + 600
+
+    events.cancel(late)
+    assert events.next_fire_at() == now + 900
+
+
+def test_fires_on_time_and_reschedules_recurring(db_manager):
+    notifier = RecordingNotifier()
+    events = EventScheduler(ReminderScheduler(db_manager), notifier)
+    fire_at = int(time.time()) + 1
+    once = _insert(db_manager, "Once", fire_at)
+    daily = _insert(db_manager, "Daily", fire_at, recurrence="daily")
+
+    thread = _start(events)
+    deadline = time.time() + 5
+    while len(notifier.sent) < 2 and time.time() < deadline:
+        time.sleep(0.05)
+    events.stop()
+    thread.join(timeout=2)
+
+    assert sorted(reminder_id for reminder_id, _ in notifier.sent) == [once, daily]
+    assert all(sent_at - fire_at < 0.5 for _, sent_at in notifier.sent)
+    assert db_manager.fetch_all("SELECT notified FROM reminders WHERE id = ?", (once,)) == [(1,)]
+    assert not thread.is_alive()
+
+
+def test_reminder_manager_events_adjust_the_heap(db_manager):
+    events = EventScheduler(ReminderScheduler(db_manager), RecordingNotifier())
+    events.load()
+    manager = ReminderManager(db_manager)
+    manager.add_listener(events.on_reminder_event)
+
+    soon = datetime.fromtimestamp(time.time() + 120).strftime("%Y-%m-%d %H:%M")
+    assert manager.add_reminder("Soon", "x", soon)
+    assert events.next_fire_at() is not None
+
+    reminder_id = db_manager.fetch_all("SELECT id FROM reminders WHERE title = 'Soon'")[0][0]
+    events.on_reminder_event("deleted", reminder_id)
+    assert events.next_fire_at() is None
+
+
+def test_picks_up_writes_from_other_processes(tmp_path):
+    db_path = str(tmp_path / "reminders.db")
+    db_manager = DBManager(db_name=db_path)
+    other = DBManager(db_name=db_path)
+    notifier = RecordingNotifier()
+    events = EventScheduler(ReminderScheduler(db_manager), notifier, max_sleep=0.1)
+
+    thread = _start(events)
+    time.sleep(0.2)
+    reminder_id = _insert(other, "From elsewhere", int(time.time()))
+
+    deadline = time.time() + 3
+    while not notifier.sent and time.time() < deadline:
+        time.sleep(0.05)
+    events.stop()
+    thread.join(timeout=2)
+
+    assert [sent_id for sent_id, _ in notifier.sent] == [reminder_id]
+    other.close()
+    db_manager.close()
+
+
+def test_reminder_held_by_a_crashed_peer_is_retried_when_its_lease_ends(db_manager):
+    now = int(time.time())
+    clock = SimulatedClock(now)
+    notifier = RecordingNotifier()
+    events = EventScheduler(ReminderScheduler(db_manager, clock=clock), notifier)
+    reminder_id = _insert(db_manager, "Held", now - 10)
+    crashed = ReminderScheduler(db_manager, clock=clock, worker_id="crashed")
+    assert crashed.claim_due_reminders(lease_seconds=30)  # Claimed, then the process died
+
+    events.load()
+    assert events.dispatch(events.wait_for_due()) == 0
+    assert events.next_fire_at() == now + 30  # Back in the heap for when the lease ends
+
+    clock.advance(30)
+    assert events.wait_for_due() == [reminder_id]
+    assert events.dispatch([reminder_id]) == 1
+    assert [sent_id for sent_id, _ in notifier.sent] == [reminder_id]
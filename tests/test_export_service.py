@@ -0,0 +1,73 @@
+import csv
+import gzip
+import json
+import pytest
+from datetime import datetime
+from services.export_service import export_reminders, detect_format
+
+
+SAMPLE_ROWS = [
+    ("Doctor Appointment", "Visit Dr. Smith", "2025-06-15 10:00", "test@example.com", "none", 1),
+    ("Meeting", "Project status update, room 4", "2025-06-20 15:00", None, "weekly", 0),
+    ("Gym", "Leg day", "2025-07-10 18:00", "gym@example.com", "daily", 0),
+]
+
+
+@pytest.fixture
+def populated_db(db_manager):
+    for row in SAMPLE_ROWS:
+        db_manager.execute(
+            "INSERT INTO reminders (title, description, reminder_time, email, recurrence, notified) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            row,
+        )
+    return db_manager
+
+
+def test_export_csv(populated_db, tmp_path):
+    path = tmp_path / "reminders.csv"
+
+    assert export_reminders(populated_db, str(path)) == 3
+
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["title"] for row in rows] == ["Doctor Appointment", "Meeting", "Gym"]
+
+
+def test_export_jsonl_gzip_with_filters(populated_db, tmp_path):
+    path = tmp_path / "reminders.jsonl.gz"
+    start = int(datetime(2025, 6, 1).timestamp())
+    end = int(datetime(2025, 7, 1).timestamp())
+
+    assert export_reminders(populated_db, str(path), start=start, end=end, notified=False) == 1
+
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        records = [json.loads(line) for line in handle]
+    assert records[0]["title"] == "Meeting"
+    assert records[0]["email"] is None
+
+
+def test_export_ics(populated_db, tmp_path):
+    path = tmp_path / "reminders.ics"
+
+    assert export_reminders(populated_db, str(path)) == 3
+
+    content = path.read_bytes().decode("utf-8")
+    assert content.startswith("BEGIN:VCALENDAR\r\n")
+    assert content.count("BEGIN:VEVENT") == 3
+    assert "SUMMARY:Meeting\r\n" in content
+    assert "DESCRIPTION:Project status update\\, room 4\r\n" in content
+    assert "RRULE:FREQ=WEEKLY\r\n" in content
+
+
+def test_iter_query_streams_in_batches(populated_db):
+    rows = populated_db.iter_query("SELECT title FROM reminders ORDER BY id", batch_size=2)
+    assert next(rows) == ("Doctor Appointment",)
+    assert list(rows) == [("Meeting",), ("Gym",)]
+
+
+def test_detect_format():
+    assert detect_format("out.ics") == "ics"
+    assert detect_format("out.csv.gz") == "csv"
+    with pytest.raises(ValueError):
+        detect_format("out.txt")
@@ -0,0 +1,106 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from services.dispatch_scheduler import DispatchScheduler
+from services.fanout import ChannelFanout, DeliveryReport
+from services.notification_service import NotificationService
+from services.scheduler_service import ReminderScheduler
+
+
+class SlowChannels(NotificationService):
+    """Every channel takes `latency` seconds; email to fail@ fails."""
+
+    def __init__(self, db_manager, latency):
+        super().__init__(db_manager)
+        self.fanout = ChannelFanout({"desktop": 50, "email": 50, "pushbullet": 50})
+        self.pushbullet_api_key = "key"
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _send(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return True
+
+    def send_desktop_notification(self, title, message):
+        return self._send()
+
+    def send_email_notification(self, recipient_email, subject, message):
+        self._send()
+        return not recipient_email.startswith("fail@")
+
+    def send_pushbullet_notification(self, title, message):
+        return self._send()
+
+
+def _reminder(reminder_id, email="user@example.com"):
+    when = (datetime.now() - timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M")
+    return {"id": reminder_id, "title": f"R{reminder_id}", "time": when, "recurrence": "none", "email": email}
+
+
+def test_channels_of_one_reminder_go_out_together(db_manager):
+    service = SlowChannels(db_manager, latency=0.2)
+
+    started = time.perf_counter()
+    delivery = service.check_reminder(_reminder(1), update_status=False)
+    elapsed = time.perf_counter() - started
+
+    assert delivery.ok and bool(delivery)
+    assert [result.channel for result in delivery.results] == ["desktop", "email", "pushbullet"]
+    assert elapsed < 0.5  # Three channels one after another would take 0.6s
+    service.close()
+
+
+def test_batch_takes_about_the_slowest_channel(db_manager):
+    service = SlowChannels(db_manager, latency=0.02)
+    scheduler = ReminderScheduler(db_manager, service)
+    scheduler.dispatcher = DispatchScheduler({}, {})
+
+    report = scheduler.deliver([_reminder(i, f"user{i}@example.com") for i in range(200)], service, datetime.now())
+
+    assert service.calls == 600
+    assert report.delivered == 200
+    assert report.seconds < 2.0  # 600 sends of 20ms in sequence would take 12s
+    scheduler.close()
+    service.close()
+
+
+def test_report_lists_failed_channels(db_manager):
+    service = SlowChannels(db_manager, latency=0)
+    scheduler = ReminderScheduler(db_manager, service)
+    scheduler.dispatcher = DispatchScheduler({}, {})
+
+    report = scheduler.deliver([_reminder(1), _reminder(2, email="fail@example.com")], service, datetime.now())
+
+    assert report.delivered == 1
+    failed, = report.failed
+    assert (failed.reminder_id, failed.failed_channels) == (2, ["email"])
+    assert report.by_channel() == {"desktop": (2, 0), "email": (1, 1), "pushbullet": (2, 0)}
+    assert report.dispatch_stats.failed == 1
+    assert "1/2 reminders delivered" in str(report)
+    scheduler.close()
+    service.close()
+
+
+def test_sender_exceptions_become_failed_results():
+    fanout = ChannelFanout()
+
+    def broken():
+        raise RuntimeError("SMTP down")
+
+    ok, failed = fanout.run([("desktop", lambda: None, ()), ("email", broken, ())])
+    assert ok.ok
+    assert (failed.ok, failed.error) == (False, "SMTP down")
+    fanout.close()
+
+
+def test_plain_notifier_results_are_reported():
+    report = DeliveryReport()
+    report.add({"id": 1, "title": "A", "time": "t"}, True)
+    report.add({"id": 2, "title": "B", "time": "t"}, False)
+    report.add({"id": 3, "title": "C", "time": "t"}, RuntimeError("boom"))
+
+    assert report.delivered == 1
+    assert [delivery.reminder_id for delivery in report.failed] == [2, 3]
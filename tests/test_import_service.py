@@ -0,0 +1,86 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from services.reminder_manager import ReminderManager
+from services.import_service import import_reminders, detect_format
+
+
+FUTURE = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d %H:%M")
+
+
+@pytest.fixture
+def reminder_manager(db_manager):
+    return ReminderManager(db_manager)
+
+
+def test_add_reminders_inserts_in_chunks_and_reports_errors(reminder_manager, db_manager):
+    records = [
+        {"title": f"Bulk {i}", "description": "Provisioned in bulk", "reminder_time": FUTURE} for i in range(7)
+    ]
+    records.append({"title": "bulk 0", "description": "Duplicate title", "reminder_time": FUTURE})
+    records.append({"title": "Bad Time", "description": "Unparseable time", "reminder_time": "tomorrow"})
+
+    report = reminder_manager.add_reminders(records, chunk_size=3)
+
+    assert report.rows_read == 9
+    assert report.rows_inserted == 7
+    assert [row for row, _ in report.errors] == [8, 9]
+    assert "unique" in report.errors[0][1]
+    assert db_manager.fetch_all("SELECT COUNT(*) FROM reminders WHERE fire_at IS NOT NULL") == [(7,)]
+
+
+def test_titles_fold_only_ascii_like_the_unique_index(reminder_manager, db_manager):
+    records = [{"title": title, "description": "Case folding", "reminder_time": FUTURE}
+               for title in ["Café", "CAFÉ", "café", "Straße"]]
+    reminder_manager.add_reminder("Existing", "Already there", FUTURE)
+    records.append({"title": "EXISTING", "description": "Taken before the import", "reminder_time": FUTURE})
+
+    report = reminder_manager.add_reminders(records)
+
+    # SQLite NOCASE folds A-Z only: "CAFÉ" differs from "Café", "café" does not
+    assert report.rows_inserted == 3
+    assert [row for row, _ in report.errors] == [3, 5]
+    assert db_manager.fetch_all("SELECT title FROM reminders ORDER BY id") == [("Existing",), ("Café",), ("CAFÉ",), ("Straße",)]
+
+
+def test_import_csv_file(reminder_manager, db_manager, tmp_path):
+    path = tmp_path / "reminders.csv"
+    path.write_text(
+        "title,description,reminder_time,email,recurrence\n"
+        f"Standup,Daily team sync,{FUTURE},team@example.com,daily\n"
+        f"Review,Quarterly review,{FUTURE},,\n",
+        encoding="utf-8",
+    )
+
+    report = import_reminders(reminder_manager, str(path))
+
+    assert report.rows_inserted == 2
+    assert db_manager.fetch_all("SELECT title, email, recurrence FROM reminders ORDER BY id") == [
+        ("Standup", "team@example.com", "daily"),
+        ("Review", None, "none"),
+    ]
+
+
+def test_import_jsonl_writes_error_report(reminder_manager, tmp_path):
+    path = tmp_path / "reminders.jsonl"
+    lines = [
+        json.dumps({"title": "Dentist", "description": "Six-month checkup", "reminder_time": FUTURE}),
+        "{not json",
+        json.dumps({"title": "Pay Rent", "description": "Monthly rent", "reminder_time": FUTURE, "email": "bad"}),
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    errors_path = tmp_path / "errors.csv"
+
+    report = import_reminders(reminder_manager, str(path), errors_path=str(errors_path))
+
+    assert report.rows_inserted == 1
+    assert errors_path.read_text(encoding="utf-8").splitlines() == [
+        "row,error",
+        "2,Malformed record.",
+        "3,Invalid email format.",
+    ]
+
+
+def test_detect_format_rejects_unknown_extension():
+    with pytest.raises(ValueError):
+        detect_format("reminders.xml")
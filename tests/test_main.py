@@ -8,3 +8,26 @@ from views.cli_menu import ShowMenu
 def test_main(mock_menu):
     main()
     mock_menu.assert_called_once()
+
+
+def test_outbox_replay_since_only_requeues_newer_dead_letters(tmp_path, monkeypatch, capsys):
+    import main as main_module
+    from database.db_manager import DBManager
+    from utils.time_utils import day_range
+
+    path = str(tmp_path / "reminders.db")
+    monkeypatch.setattr(main_module, "DBManager", lambda: DBManager(path))
+    db_manager = DBManager(path)
+    since = day_range("2026-10-01")[0]
+    with db_manager.transaction() as cursor:
+        cursor.executemany(
+            "INSERT INTO outbox (reminder_id, occurrence, channel, title, status, next_attempt_at, created_at) "
+            "VALUES (?, '2026-09-01 09:00', 'email', 'Dentist', 'dead', 0, ?)",
+            [(1, since - 86400), (2, since + 3600)])
+
+    main(["outbox", "replay", "--since", "2026-10-01"])
+
+    assert "Queued 1 deliveries again" in capsys.readouterr().out
+    assert db_manager.fetch_all("SELECT reminder_id, status FROM outbox ORDER BY reminder_id") == \
+        [(1, "dead"), (2, "pending")]
+    db_manager.close()
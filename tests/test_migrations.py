@@ -0,0 +1,103 @@
+import sqlite3
+import pytest
+from database.db_manager import DBManager
+from database.migrations import MigrationRunner, MIGRATIONS
+
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """A database created by the original schema (no fire_at, user_version 0)."""
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, description TEXT NOT NULL,
+            reminder_time DATETIME NOT NULL, email TEXT, recurrence TEXT DEFAULT 'none', notified INTEGER DEFAULT 0
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO reminders (title, description, reminder_time) VALUES (?, ?, ?)",
+        [(f"Legacy {i}", "Created before migrations", f"2025-03-{i + 10:02d} 10:00") for i in range(5)],
+    )
+    conn.commit()
+    conn.close()
+    manager = DBManager(db_name=path, create_table=False)
+    yield manager
+    manager.close()
+
+
+def test_fresh_database_is_at_latest_version(db_manager):
+    runner = MigrationRunner(db_manager)
+    assert runner.current_version() == LATEST_VERSION
+    assert runner.pending() == []
+
+
+def test_dry_run_reports_estimates_without_changes(legacy_db):
+    runner = MigrationRunner(legacy_db)
+    reports = runner.migrate(dry_run=True)
+
+    assert [r.version for r in reports] == [m.version for m in MIGRATIONS]
+    assert all(r.dry_run for r in reports)
+    assert max(r.rows for r in reports) == 5
+    assert runner.current_version() == 0
+    assert "fire_at" not in {row[1] for row in legacy_db.fetch_all("PRAGMA table_info(reminders)")}
+
+
+def test_migrate_backfills_in_batches(legacy_db):
+    runner = MigrationRunner(legacy_db, batch_size=2)
+    reports = runner.migrate()
+
+    assert runner.current_version() == LATEST_VERSION
+    assert sum(r.rows for r in reports) == 5
+    assert legacy_db.fetch_all("SELECT COUNT(*) FROM reminders WHERE fire_at IS NULL") == [(0,)]
+
+    # Re-running is a no-op
+    assert runner.migrate() == []
+
+
+def test_migrate_renames_duplicate_titles_before_unique_index(legacy_db):
+    legacy_db.execute(
+        "INSERT INTO reminders (title, description, reminder_time) VALUES (?, ?, ?)",
+        ("LEGACY 0", "Same title, different case", "2025-03-20 10:00"),
+    )
+
+    MigrationRunner(legacy_db).migrate()
+
+    titles = [row[0] for row in legacy_db.fetch_all("SELECT title FROM reminders ORDER BY id")]
+    assert titles[0] == "Legacy 0"
+    assert titles[-1] == "LEGACY 0 (6)"
+
+
+def test_title_dedupe_is_counted_by_dry_runs_and_logged(legacy_db, caplog, capsys):
+    legacy_db.execute("INSERT INTO reminders (title, description, reminder_time) VALUES ('legacy 0', 'x', '2025-03-20 10:00')")
+    runner = MigrationRunner(legacy_db)
+
+    dedupe = next(report for report in runner.migrate(dry_run=True) if report.version == 3)
+    assert dedupe.rows == 1
+
+    reports = runner.migrate(verbose=True)
+
+    assert next(report for report in reports if report.version == 3).rows == 1
+    assert "v3: reminders 6 title 'legacy 0' -> 'legacy 0 (6)'" in capsys.readouterr().out
+    assert "v3: reminders 6 title 'legacy 0' -> 'legacy 0 (6)'" in caplog.text
+    assert legacy_db.fetch_all("SELECT title FROM reminders WHERE id = 6") == [("legacy 0 (6)",)]
+
+
+def test_title_dedupe_never_renames_onto_a_taken_title(legacy_db):
+    legacy_db.execute("""
+        INSERT INTO reminders (id, title, description, reminder_time) VALUES
+            (6, 'Pay rent', 'x', '2025-03-20 10:00'),
+            (7, 'PAY RENT', 'x', '2025-03-21 10:00'),
+            (8, 'pay rent (7)', 'x', '2025-03-22 10:00')
+    """)
+    runner = MigrationRunner(legacy_db)
+
+    assert next(report for report in runner.migrate(dry_run=True) if report.version == 3).rows == 1
+    runner.migrate()
+
+    assert runner.current_version() == LATEST_VERSION
+    titles = legacy_db.fetch_all("SELECT id, title FROM reminders WHERE id > 5 ORDER BY id")
+    assert titles == [(6, "Pay rent"), (7, "PAY RENT (7-2)"), (8, "pay rent (7)")]
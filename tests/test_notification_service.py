@@ -68,7 +68,8 @@ class TestEmailNotification:
             captured = capfd.readouterr()
             assert expected_output in captured.out
         else:
-            mock_server = mock_smtp.return_value.__enter__.return_value
+            mock_server = mock_smtp.return_value
+            self.service.email_sender = self.service.smtp_pool.username = "sender@example.com"
             self.service.send_email_notification(recipient, subject, message)
             mock_server.login.assert_called_once_with(self.service.email_sender, self.service.email_password)
             mock_server.send_message.assert_called_once()
@@ -86,6 +87,7 @@ class TestEmailNotification:
 class TestPushbulletNotification:
     def setup_method(self, db_manager):
         self.service = NotificationService(db_manager)  # Use the fixture directly
+        self.service.pushbullet_api_key = "test-key"
 
     @pytest.mark.parametrize(
         "status_code, response_text, expected_log",
@@ -95,26 +97,27 @@ class TestPushbulletNotification:
             (401, "Unauthorized", "Failed to send Pushbullet notification: Unauthorized"),
         ]
     )
-    @patch("requests.post")
-    def test_send_pushbullet_notification(self, mock_post, db_manager, caplog, status_code, response_text, expected_log):
+    def test_send_pushbullet_notification(self, db_manager, caplog, status_code, response_text, expected_log):
         # service = NotificationService(db_manager)
 
         mock_response = MagicMock()
         mock_response.status_code = status_code
         mock_response.text = response_text
-        mock_post.return_value = mock_response
 
-        self.service.send_pushbullet_notification("Test", "Message")
+        with patch.object(self.service.pushbullet.session, "request", return_value=mock_response) as mock_post:
+            self.service.send_pushbullet_notification("Test", "Message")
 
         mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs["headers"]["Access-Token"] == "test-key"
+        assert mock_post.call_args.kwargs["timeout"] == self.service.pushbullet.timeout
         if expected_log:
             assert expected_log in caplog.text
 
-    @patch("requests.post", side_effect=Exception("Network error"))
-    def test_send_pushbullet_notification_exception(self, mock_post, db_manager, caplog):
+    def test_send_pushbullet_notification_exception(self, db_manager, caplog):
         # service = NotificationService(db_manager)
 
-        self.service.send_pushbullet_notification("Test", "Message")
+        with patch.object(self.service.pushbullet.session, "request", side_effect=Exception("Network error")):
+            self.service.send_pushbullet_notification("Test", "Message")
 
         assert "Error sending Pushbullet notification: Network error" in caplog.text
 
@@ -136,6 +139,7 @@ class TestReminderHandling:
 
         # ✅ Pass the mock instance into NotificationService
         self.service = NotificationService(db_manager=mock_db_manager)
+        self.service.pushbullet_api_key = "test-key"
 
         reminder = {
             "id": 1,
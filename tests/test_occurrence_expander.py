@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from services.occurrence_expander import OccurrenceExpander
+from services.scheduler_service import ReminderScheduler
+
+
+def stepped(start, recurrence, window_start, window_end):
+    """Reference expansion: repeated calculate_next_occurrence calls."""
+    occurrences, current = [], start
+    while current is not None and current < window_end:
+        if current >= window_start:
+            occurrences.append(current)
+        current = ReminderScheduler.calculate_next_occurrence(current, recurrence)
+    return occurrences
+
+
+@pytest.mark.parametrize("start, recurrence", [
+    (datetime(2025, 1, 31, 9, 30), "daily"),
+    (datetime(2025, 1, 31, 9, 30), "weekly"),
+    (datetime(2025, 1, 31, 9, 30), "monthly"),
+    (datetime(2025, 3, 30, 23, 59), "monthly"),
+    (datetime(2024, 2, 29, 8, 0), "yearly"),
+    (datetime(2025, 5, 1, 12, 0), "none"),
+])
+def test_expand_matches_stepping(start, recurrence):
+    window_start, window_end = datetime(2025, 3, 1), datetime(2028, 6, 1)
+    expander = OccurrenceExpander([7], [start.isoformat()], [recurrence])
+    occurrences = expander.expand(window_start, window_end)
+
+    assert [when for _, when in occurrences.to_list()] == stepped(start, recurrence, window_start, window_end)
+    assert set(occurrences.reminder_ids.tolist()) <= {7}
+
+
+def test_expand_is_sorted_and_half_open():
+    expander = OccurrenceExpander([1, 2], ["2025-01-01 10:00", "2025-01-01 09:00"], ["daily", "weekly"])
+    occurrences = expander.expand(datetime(2025, 1, 1, 10, 0), datetime(2025, 1, 8, 9, 0))
+
+    assert np.all(occurrences.times[:-1] <= occurrences.times[1:])
+    assert occurrences.to_list()[0] == (1, datetime(2025, 1, 1, 10, 0))
+    assert (2, datetime(2025, 1, 8, 9, 0)) not in occurrences.to_list()  # End is exclusive
+    assert len(occurrences) == 7
+    assert occurrences.formatted_times()[0] == "2025-01-01 10:00"
+
+
+def test_iter_expand_covers_the_window_once():
+    expander = OccurrenceExpander([1, 2], ["2025-01-01 00:00", "2025-01-15 12:00"], ["daily", "monthly"])
+    start, end = datetime(2025, 1, 1), datetime(2025, 4, 1)
+
+    chunked = [pair for chunk in expander.iter_expand(start, end, timedelta(days=10)) for pair in chunk.to_list()]
+    assert chunked == expander.expand(start, end).to_list()
+
+
+def test_empty_expansion():
+    occurrences = OccurrenceExpander([], [], []).expand(datetime(2025, 1, 1), datetime(2025, 2, 1))
+    assert len(occurrences) == 0
+    assert occurrences.formatted_times().tolist() == []
+
+
+def test_from_db_loads_pending_recurring_reminders(db_manager):
+    soon = datetime.now() + timedelta(hours=1)
+    for title, recurrence, notified in [("Daily", "daily", 0), ("Once", "none", 0), ("Done", "weekly", 1)]:
+        db_manager.execute(
+            "INSERT INTO reminders (title, description, reminder_time, recurrence, notified) VALUES (?, ?, ?, ?, ?)",
+            (title, "", soon.strftime("%Y-%m-%d %H:%M"), recurrence, notified))
+
+    expander, titles = OccurrenceExpander.from_db(db_manager)
+    assert sorted(titles.values()) == ["Daily"]
+    assert len(expander) == 1
+
+
+def test_fetch_upcoming_includes_recurring_occurrences(db_manager):
+    first = (datetime.now() + timedelta(hours=1)).replace(second=0, microsecond=0)
+    db_manager.execute(
+        "INSERT INTO reminders (title, description, reminder_time, recurrence) VALUES (?, ?, ?, ?)",
+        ("Standup", "", first.strftime("%Y-%m-%d %H:%M"), "daily"))
+
+    scheduler = ReminderScheduler(db_manager)
+    upcoming = scheduler.fetch_upcoming_reminders(hours=72)
+
+    assert [title for title, _ in upcoming] == ["Standup"] * 3
+    assert upcoming[1][1] == (first + timedelta(days=1)).strftime("%Y-%m-%d %H:%M")
@@ -0,0 +1,222 @@
+import sqlite3
+import threading
+import pytest
+from datetime import datetime, timedelta
+from services.dispatch_scheduler import DispatchScheduler
+from services.notification_service import NotificationService
+from services.outbox import Outbox, OutboxWorker
+from services.scheduler_service import ReminderScheduler
+from utils.clock import SimulatedClock
+from utils.time_utils import format_reminder_time, to_epoch
+
+
+START = datetime(2025, 6, 2, 9, 0)
+
+
+class FakeChannels:
+    """Records sends per channel; channels in `failing` return False."""
+    pushbullet_api_key = "key"
+    compose = staticmethod(NotificationService.compose)
+    channels_for = NotificationService.channels_for
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send(self, channel, recipient, title, message):
+        if channel in self.failing:
+            return False
+        with self._lock:
+            self.sent.append((channel, recipient, message))
+        return True
+
+
+def _insert(db_manager, title, when, recurrence="none", email=None):
+    with db_manager.transaction() as cursor:
+        cursor.execute(
+            "INSERT INTO reminders (title, description, reminder_time, email, recurrence, fire_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (title, "x", format_reminder_time(when), email, recurrence, to_epoch(when)),
+        )
+        return cursor.lastrowid
+
+
+def _scheduler(db_manager, channels, clock):
+    scheduler = ReminderScheduler(db_manager, channels, clock=clock, delivery_mode="outbox")
+    scheduler.dispatcher = DispatchScheduler({}, {}, clock=clock)
+    return scheduler
+
+
+def _worker(scheduler, channels, **kwargs):
+    return OutboxWorker(scheduler.outbox, channels, dispatcher=DispatchScheduler({}, {}, clock=scheduler.clock), **kwargs)
+
+
+def test_check_only_queues_and_marks_in_one_step(db_manager):
+    clock = SimulatedClock(to_epoch(START) + 60)
+    channels = FakeChannels()
+    scheduler = _scheduler(db_manager, channels, clock)
+    one_time = _insert(db_manager, "Dentist", START, email="me@example.com")
+    daily = _insert(db_manager, "Standup", START, recurrence="daily")
+
+    assert scheduler.check_due() == 2
+
+    assert channels.sent == []  # Nothing is sent from the checker
+    rows = db_manager.fetch_all("SELECT reminder_id, channel, recipient, status FROM outbox ORDER BY id")
+    assert rows == [(one_time, "desktop", "", "pending"), (one_time, "email", "me@example.com", "pending"),
+                    (one_time, "pushbullet", "", "pending"), (daily, "desktop", "", "pending"),
+                    (daily, "pushbullet", "", "pending")]
+    assert db_manager.fetch_all("SELECT notified FROM reminders WHERE id = ?", (one_time,)) == [(1,)]
+    assert scheduler.outbox.metrics().ready == 5
+    scheduler.close()
+
+
+def test_failed_enqueue_leaves_the_reminder_due(db_manager, monkeypatch):
+    clock = SimulatedClock(to_epoch(START) + 60)
+    scheduler = _scheduler(db_manager, FakeChannels(), clock)
+    reminder_id = _insert(db_manager, "Dentist", START)
+
+    def crash(cursor, rows):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(scheduler.outbox, "enqueue", crash)
+    scheduler.check_due()
+
+    assert db_manager.fetch_all("SELECT notified FROM reminders WHERE id = ?", (reminder_id,)) == [(0,)]
+    assert db_manager.fetch_all("SELECT COUNT(*) FROM outbox") == [(0,)]
+    scheduler.close()
+
+
+def test_enqueue_is_idempotent(db_manager):
+    outbox = Outbox(db_manager)
+    rows = [(1, "2025-06-02 09:00", "desktop", "", "Dentist", 0)]
+    with db_manager.transaction() as cursor:
+        assert outbox.enqueue(cursor, rows) == 1
+        assert outbox.enqueue(cursor, rows) == 0
+
+
+def test_worker_sends_and_marks_sent(db_manager):
+    clock = SimulatedClock(to_epoch(START) + 60)
+    channels = FakeChannels()
+    scheduler = _scheduler(db_manager, channels, clock)
+    _insert(db_manager, "Dentist", START, email="me@example.com")
+    scheduler.check_due()
+
+    worker = _worker(scheduler, channels)
+    assert worker.drain() == 3
+
+    assert sorted(channel for channel, _, _ in channels.sent) == ["desktop", "email", "pushbullet"]
+    assert ("email", "me@example.com", "⏰ Reminder: Dentist at 2025-06-02 09:00") in channels.sent
+    metrics = scheduler.outbox.metrics()
+    assert (metrics.ready, metrics.sent, metrics.dead) == (0, 3, 0)
+    assert worker.stats.sent == 3
+    worker.close()
+    scheduler.close()
+
+
+def test_failures_back_off_then_dead_letter_and_replay(db_manager):
+    clock = SimulatedClock(to_epoch(START) + 60)
+    channels = FakeChannels(failing={"email"})
+    scheduler = _scheduler(db_manager, channels, clock)
+    scheduler.outbox.max_attempts = 3
+    _insert(db_manager, "Dentist", START, email="me@example.com")
+    scheduler.check_due()
+    worker = _worker(scheduler, channels)
+
+    worker.drain()
+    assert scheduler.outbox.metrics().scheduled == 1
+    assert worker.drain() == 0  # Still backing off
+
+    clock.advance(scheduler.outbox.retry_delay(1))
+    assert worker.drain() == 1
+    clock.advance(scheduler.outbox.retry_delay(2))
+    assert worker.drain() == 1
+
+    metrics = scheduler.outbox.metrics()
+    assert (metrics.ready, metrics.scheduled, metrics.dead) == (0, 0, 1)
+    assert worker.stats.dead_lettered == 1
+    assert db_manager.fetch_all("SELECT attempts, last_error FROM outbox WHERE status = 'dead'") == [(3, "email send failed")]
+
+    # The provider is back: replay the dead letter
+    channels.failing.clear()
+    assert scheduler.outbox.replay() == 1
+    assert worker.drain() == 1
+    assert scheduler.outbox.metrics().sent == 3
+    worker.close()
+    scheduler.close()
+
+
+def test_expired_lease_is_taken_over(db_manager):
+    clock = SimulatedClock(to_epoch(START) + 60)
+    channels = FakeChannels()
+    scheduler = _scheduler(db_manager, channels, clock)
+    _insert(db_manager, "Dentist", START)
+    scheduler.check_due()
+
+    crashed = Outbox(db_manager, clock=clock, worker_id="crashed")
+    assert len(crashed.claim(lease_seconds=300)) == 2  # Claimed, then the process died
+    worker = _worker(scheduler, channels, lease_seconds=300)
+    assert worker.drain() == 0
+    assert scheduler.outbox.metrics().in_flight == 2
+
+    clock.advance(301)
+    assert worker.drain() == 2
+    assert len(channels.sent) == 2
+    worker.close()
+    scheduler.close()
+
+
+def test_purge_keeps_unsent_entries(db_manager):
+    clock = SimulatedClock(to_epoch(START) + 60)
+    channels = FakeChannels(failing={"pushbullet"})
+    scheduler = _scheduler(db_manager, channels, clock)
+    _insert(db_manager, "Dentist", START)
+    scheduler.check_due()
+    _worker(scheduler, channels).drain()
+
+    clock.advance(timedelta(days=8).total_seconds())
+    assert scheduler.outbox.purge(int(clock.time()) - 86400) == 1
+    assert db_manager.fetch_all("SELECT channel, status FROM outbox") == [("pushbullet", "pending")]
+    scheduler.close()
+
+
+def test_unknown_delivery_mode_is_rejected(db_manager):
+    with pytest.raises(ValueError):
+        ReminderScheduler(db_manager, delivery_mode="carrier pigeon")
+
+
+def test_claims_fit_the_rate_limits_within_half_a_lease(db_manager):
+    clock = SimulatedClock(to_epoch(START) + 60)
+    worker = OutboxWorker(Outbox(db_manager, clock=clock), FakeChannels(), batch_size=100, lease_seconds=60,
+                          dispatcher=DispatchScheduler({"email": (1.0, 10)}, {}, clock=clock))
+    assert worker.claim_limit() == 40  # 10 burst + 30s at 1/s
+    worker.close()
+
+
+def test_lease_is_renewed_while_a_slow_batch_is_paced(db_manager):
+    clock = SimulatedClock(to_epoch(START) + 60)
+    rival = Outbox(db_manager, clock=clock, worker_id="rival")
+    taken_over = []
+
+    class RivalWatching(FakeChannels):
+        def send(self, channel, recipient, title, message):
+            taken_over.extend(rival.claim())  # Another worker polls while this batch is paced
+            return super().send(channel, recipient, title, message)
+
+    channels = RivalWatching()
+    scheduler = _scheduler(db_manager, channels, clock)
+    for number in range(5):
+        _insert(db_manager, f"Bill {number}", START + timedelta(hours=number), email="me@example.com")
+    clock.advance(5 * 3600)
+    scheduler.check_due()
+    db_manager.execute("DELETE FROM outbox WHERE channel != 'email'")
+
+    # One email per 50s to this address: the batch takes 200s against a 60s lease
+    worker = OutboxWorker(scheduler.outbox, channels, lease_seconds=60,
+                          dispatcher=DispatchScheduler({}, {"email": (0.02, 1)}, clock=clock))
+    assert worker.drain() == 5
+
+    assert taken_over == []
+    assert len(channels.sent) == 5
+    assert scheduler.outbox.metrics().sent == 5
+    worker.close()
+    scheduler.close()
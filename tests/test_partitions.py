@@ -0,0 +1,136 @@
+import pytest
+from datetime import datetime
+from database.db_manager import DBManager
+from database.partitions import PARTITION_COLUMNS, PartitionManager, partition_bounds, partition_table
+from services.export_service import export_reminders
+from services.reminder_manager import ReminderManager
+
+
+def _epoch(*args):
+    return int(datetime(*args).timestamp())
+
+
+@pytest.fixture
+def partitioned_db(tmp_path):
+    manager = DBManager(db_name=str(tmp_path / "reminders.db"), partitioned=True)
+    manager.partitions.directory = str(tmp_path / "cold")
+    rows = [
+        ("Done in May", "x", "2024-05-10 09:00", None, "none", 1),
+        ("Done in June", "x", "2024-06-10 09:00", None, "none", 1),
+        ("Pending in June", "x", "2024-06-11 09:00", None, "none", 0),
+        ("Daily", "x", "2024-06-12 09:00", None, "daily", 1),
+        ("Future", "x", "2030-01-01 09:00", None, "none", 0),
+    ]
+    for row in rows:
+        manager.execute(
+            "INSERT INTO reminders (title, description, reminder_time, email, recurrence, notified) "
+            "VALUES (?, ?, ?, ?, ?, ?)", row)
+    yield manager
+    manager.close()
+
+
+def test_partition_names_and_bounds():
+    assert partition_table(datetime(2024, 12, 31, 23, 59)) == "reminders_2024_12"
+    assert partition_bounds("reminders_2024_12") == (_epoch(2024, 12, 1), _epoch(2025, 1, 1))
+
+
+def test_rotate_moves_only_finished_one_time_reminders(partitioned_db):
+    moved = partitioned_db.partitions.rotate(_epoch(2025, 1, 1), chunk_size=1)
+
+    assert moved == 2
+    assert partitioned_db.partitions.partitions() == ["reminders_2024_05", "reminders_2024_06"]
+    active = [row[0] for row in partitioned_db.fetch_all("SELECT title FROM reminders ORDER BY id")]
+    assert active == ["Pending in June", "Daily", "Future"]
+
+
+def test_router_reads_only_overlapping_partitions(partitioned_db):
+    partitioned_db.partitions.rotate(_epoch(2025, 1, 1))
+
+    assert partitioned_db.partitions.route(_epoch(2024, 6, 1), _epoch(2024, 7, 1)) == ["reminders", "reminders_2024_06"]
+    assert partitioned_db.range_source(_epoch(2030, 1, 1), _epoch(2030, 2, 1)) == "reminders"
+
+    june = (_epoch(2024, 6, 1), _epoch(2024, 7, 1))
+    pages = partitioned_db.paginate("title", "fire_at >= ? AND fire_at < ?", june,
+                                    source=partitioned_db.range_source(*june))
+    assert [row[0] for page in pages for row in page] == ["Done in June", "Pending in June", "Daily"]
+
+
+def test_export_includes_partitions(partitioned_db, tmp_path):
+    partitioned_db.partitions.rotate(_epoch(2025, 1, 1))
+
+    assert export_reminders(partitioned_db, str(tmp_path / "all.jsonl")) == 5
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_detach_and_reattach_round_trip(partitioned_db, compress):
+    partitions = partitioned_db.partitions
+    partitions.rotate(_epoch(2025, 1, 1))
+
+    path = partitions.detach("reminders_2024_05", compress=compress)
+
+    assert path.endswith(".gz") == compress
+    assert partitions.partitions() == ["reminders_2024_06"]
+
+    assert partitions.reattach(path) == "reminders_2024_05"
+    rows = partitioned_db.fetch_all("SELECT title FROM reminders_2024_05")
+    assert rows == [("Done in May",)]
+
+
+def test_rotation_keeps_the_missed_fire_policy(partitioned_db):
+    partitioned_db.execute("UPDATE reminders SET missed_fire_policy = 'skip' WHERE title = 'Done in May'")
+    partitions = partitioned_db.partitions
+    partitions.rotate(_epoch(2025, 1, 1))
+
+    partitions.reattach(partitions.detach("reminders_2024_05"))
+
+    source = partitioned_db.range_source(_epoch(2024, 5, 1), _epoch(2024, 7, 1))
+    rows = partitioned_db.fetch_all(f"SELECT title, missed_fire_policy FROM {source} WHERE notified = 1 AND recurrence = 'none' ORDER BY title")
+    assert rows == [("Done in June", "once"), ("Done in May", "skip")]
+
+
+def test_rotation_keeps_the_urgent_flag(partitioned_db):
+    partitioned_db.execute("UPDATE reminders SET urgent = 1 WHERE title = 'Done in June'")
+    partitions = partitioned_db.partitions
+    partitions.rotate(_epoch(2025, 1, 1))
+
+    partitions.reattach(partitions.detach("reminders_2024_06", compress=True))
+
+    assert partitioned_db.fetch_all("SELECT title, urgent FROM reminders_2024_06") == [("Done in June", 1)]
+
+
+def test_partitions_from_before_a_column_get_it_added(partitioned_db):
+    partitioned_db.execute("CREATE TABLE reminders_2023_01 (id INTEGER PRIMARY KEY, title TEXT NOT NULL, "
+                           "description TEXT NOT NULL, reminder_time DATETIME NOT NULL, email TEXT, "
+                           "recurrence TEXT DEFAULT 'none', notified INTEGER DEFAULT 0, fire_at INTEGER)")
+
+    with partitioned_db.transaction() as cursor:
+        PartitionManager._ensure_partition(cursor, "reminders_2023_01")
+
+    columns = [row[1] for row in partitioned_db.fetch_all("PRAGMA table_info(reminders_2023_01)")]
+    assert columns == PARTITION_COLUMNS.split(", ")
+
+
+def test_partitioned_reminders_keep_their_titles_and_can_be_deleted(partitioned_db, mocker):
+    partitioned_db.partitions.rotate(_epoch(2025, 1, 1))
+    manager = ReminderManager(partitioned_db)
+    (may_id,), = partitioned_db.fetch_all("SELECT id FROM reminders_2024_05")
+
+    assert manager.title_exists("done in may") is True
+    assert manager.title_exists("Done in May", exclude_id=may_id) is False
+
+    mocker.patch("services.reminder_manager.get_valid_input", return_value=str(may_id))
+    manager.delete_reminder()
+
+    assert partitioned_db.fetch_all("SELECT COUNT(*) FROM reminders_2024_05") == [(0,)]
+    assert manager.title_exists("Done in May") is False
+
+
+def test_detach_rejects_non_partition(partitioned_db):
+    with pytest.raises(ValueError):
+        partitioned_db.partitions.detach("reminders")
+
+
+def test_unpartitioned_source_is_active_table(db_manager):
+    assert db_manager.partitions is None
+    assert db_manager.range_source(0, 10) == "reminders"
+    assert isinstance(PartitionManager(db_manager).partitions(), list)
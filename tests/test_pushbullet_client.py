@@ -0,0 +1,77 @@
+import pytest
+import requests
+from unittest.mock import MagicMock
+from services.pushbullet_client import PushbulletClient
+from utils.clock import SimulatedClock
+
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+def _client(*responses, **kwargs):
+    session = MagicMock()
+    session.request.side_effect = list(responses)
+    return PushbulletClient("token", base_url="http://localhost:8080/v2/", clock=SimulatedClock(0),
+                            session=session, **kwargs)
+
+
+def test_push_goes_to_the_configured_base_url_with_timeouts():
+    client = _client(_response(200), connect_timeout=1.5, read_timeout=4)
+
+    assert client.push_note("Title", "Body").status_code == 200
+
+    method, url = client.session.request.call_args.args
+    assert (method, url) == ("POST", "http://localhost:8080/v2/pushes")
+    assert client.session.request.call_args.kwargs["timeout"] == (1.5, 4)
+    assert client.session.request.call_args.kwargs["headers"]["Access-Token"] == "token"
+
+
+def test_server_errors_back_off_exponentially():
+    client = _client(_response(502), _response(503), _response(200), backoff_base=2)
+
+    assert client.push_note("Title", "Body").status_code == 200
+    assert client.clock.slept == 2 + 4
+    assert client.retries == 2
+
+
+def test_retry_after_is_honoured():
+    client = _client(_response(429, {"Retry-After": "7"}), _response(200))
+
+    client.push_note("Title", "Body")
+    assert client.clock.slept == 7
+
+
+def test_long_retry_after_gives_up_instead_of_blocking():
+    client = _client(_response(429, {"Retry-After": "3600"}), backoff_max=30)
+
+    assert client.push_note("Title", "Body").status_code == 429
+    assert client.clock.slept == 0
+
+
+def test_retries_run_out_with_the_last_response():
+    client = _client(*[_response(500)] * 4, max_retries=3, backoff_base=1)
+
+    assert client.push_note("Title", "Body").status_code == 500
+    assert client.session.request.call_count == 4
+    assert client.clock.slept == 1 + 2 + 4
+
+
+def test_client_errors_are_not_retried():
+    client = _client(_response(401))
+
+    assert client.push_note("Title", "Body").status_code == 401
+    assert client.session.request.call_count == 1
+
+
+def test_failed_connections_are_retried_but_read_timeouts_are_not():
+    client = _client(requests.ConnectionError("refused"), _response(200))
+    assert client.push_note("Title", "Body").status_code == 200
+
+    client = _client(requests.ReadTimeout("slow"), _response(200))
+    with pytest.raises(requests.ReadTimeout):
+        client.push_note("Title", "Body")
+    assert client.session.request.call_count == 1
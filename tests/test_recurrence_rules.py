@@ -0,0 +1,104 @@
+import pytest
+from datetime import datetime, timedelta
+from services.occurrence_expander import OccurrenceExpander
+from services.recurrence_rules import RecurrenceRule, compile_rule, normalize_recurrence
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("none", RecurrenceRule()),
+    ("", RecurrenceRule()),
+    ("Weekly", RecurrenceRule("weekly")),
+    ("every 3 days", RecurrenceRule("daily", 3)),
+    ("every 2 weeks on mon, thu", RecurrenceRule("weekly", 2, (0, 3))),
+    ("every week on weekdays", RecurrenceRule("weekly", 1, (0, 1, 2, 3, 4))),
+    ("last fri of the month", RecurrenceRule("monthly", 1, (4,), -1)),
+    ("2nd tuesday of every 3 months", RecurrenceRule("monthly", 3, (1,), 2)),
+    ("FREQ=WEEKLY;INTERVAL=2;BYDAY=TH,MO", RecurrenceRule("weekly", 2, (0, 3))),
+    ("rrule:freq=monthly;byday=-1fr", RecurrenceRule("monthly", 1, (4,), -1)),
+])
+def test_compile_rule_forms(text, expected):
+    assert compile_rule(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "hourly", "every 0 days", "every 2 fortnights", "FREQ=MONTHLY;BYDAY=5MO", "FREQ=DAILY;BYDAY=MO",
+    "FREQ=WEEKLY;COUNT=3", "every month on mon", "fifth fri of every month",
+])
+def test_compile_rule_rejects_unsupported_rules(text):
+    with pytest.raises(ValueError):
+        compile_rule(text)
+
+
+def test_compiled_rules_are_cached_by_text():
+    assert compile_rule("every 2 weeks on mon,thu") is compile_rule("every 2 weeks on mon,thu")
+
+
+@pytest.mark.parametrize("text, stored", [
+    ("DAILY", "daily"),
+    ("every 1 month", "monthly"),
+    ("every 2 weeks on mon,thu", "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH"),
+    ("last friday of every month", "FREQ=MONTHLY;BYDAY=-1FR"),
+])
+def test_normalize_recurrence_round_trips(text, stored):
+    assert normalize_recurrence(text) == stored
+    assert compile_rule(stored) == compile_rule(text)
+
+
+def test_weekly_weekday_rule():
+    rule = compile_rule("every 2 weeks on mon,thu")
+    monday = datetime(2025, 6, 2, 9, 0)
+
+    occurrences = [rule.advance(monday, steps) for steps in range(5)]
+    assert [o.strftime("%a %d") for o in occurrences] == ["Mon 02", "Thu 05", "Mon 16", "Thu 19", "Mon 30"]
+
+
+def test_weekday_rule_starting_off_rule_begins_in_its_own_week():
+    rule = compile_rule("every 2 weeks on mon,thu")
+    tuesday = datetime(2025, 6, 3, 9, 0)
+    assert rule.next(tuesday) == datetime(2025, 6, 5, 9, 0)
+    assert rule.advance(tuesday, 2) == datetime(2025, 6, 16, 9, 0)
+
+
+def test_last_weekday_of_month():
+    rule = compile_rule("last fri of every month")
+    start = datetime(2025, 1, 31, 18, 0)  # Itself the last Friday
+    assert [rule.advance(start, steps).day for steps in range(1, 4)] == [28, 28, 25]
+
+
+@pytest.mark.parametrize("text", [
+    "daily", "weekly", "monthly", "yearly", "every 2 months", "every 4 years", "every 3 weeks on tue,sat",
+    "last mon of every 2 months", "3rd wed of every month", "every 10 days",
+])
+@pytest.mark.parametrize("start", [datetime(2024, 1, 31, 9, 30), datetime(2024, 2, 29, 8, 0), datetime(2023, 8, 6, 23, 59)])
+def test_advance_matches_stepping(text, start):
+    rule = compile_rule(text)
+    stepped = start
+    for steps in range(1, 60):
+        stepped = rule.next(stepped)
+        assert rule.advance(start, steps) == stepped
+
+
+@pytest.mark.parametrize("text", ["every 2 weeks on mon,thu", "last fri of every month", "every 3 months", "every 5 days"])
+def test_next_after_is_the_first_occurrence_past_now(text):
+    rule = compile_rule(text)
+    start, now = datetime(2020, 1, 31, 9, 0), datetime(2025, 6, 10, 9, 0)
+
+    next_time, steps = rule.next_after(start, now)
+    assert next_time > now >= rule.advance(start, steps - 1)
+    assert next_time == rule.advance(start, steps)
+
+
+def test_expander_steps_rules_without_a_closed_form():
+    rules = ["every 2 weeks on mon,thu", "last fri of every month", "every 2 months", "every 3 days"]
+    start = datetime(2025, 1, 31, 9, 0)
+    expander = OccurrenceExpander(range(len(rules)), [start.isoformat()] * len(rules), rules)
+    window_start, window_end = datetime(2025, 4, 1), datetime(2026, 1, 1)
+
+    occurrences = expander.expand(window_start, window_end).to_list()
+    for reminder_id, text in enumerate(rules):
+        rule, expected, current = compile_rule(text), [], start
+        while current < window_end:
+            if current >= window_start:
+                expected.append(current)
+            current = rule.next(current)
+        assert [when for rid, when in occurrences if rid == reminder_id] == expected
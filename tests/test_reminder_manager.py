@@ -136,13 +136,64 @@ def test_display_reminders_by_year(mock_input, mock_fetch, reminder_manager, set
     assert "Leg day" in captured
 
 
-# ✅ 7. Test fetching all reminder titles (positive case)
-@patch.object(DBManager, 'fetch_all', return_value=[
-    ("Doctor Appointment",),
-    ("Meeting",),
-    ("Gym",)
-])
-def test_get_all_titles(mock_fetch, reminder_manager):
-    expected_titles = {"Doctor Appointment", "Meeting", "Gym"}  # Use a set here
-    titles = reminder_manager.get_all_titles()
-    assert titles == expected_titles
+@patch('services.reminder_manager.get_valid_input', return_value="2025-06")
+def test_display_reminders_by_month_uses_range(mock_input, reminder_manager, setup_sample_reminders, capfd):
+    reminder_manager.display_reminders("month")
+    captured = capfd.readouterr().out
+
+    assert "Doctor Appointment" in captured
+    assert "Meeting" in captured
+    assert "Gym" not in captured
+
+
+def test_delete_reminder_fetches_next_page_on_demand(mocker, reminder_manager, db_manager, capfd):
+    reminder_manager.page_size = 2
+    for i in range(3):
+        reminder_manager.add_reminder(f"Paged {i}", "Paged reminder", f"2025-05-2{i} 10:00")
+    last_id = db_manager.fetch_all("SELECT MAX(id) FROM reminders")[0][0]
+
+    mocker.patch('services.reminder_manager.get_valid_input', side_effect=["n", str(last_id)])
+    reminder_manager.delete_reminder()
+
+    captured = capfd.readouterr().out
+    assert "Paged 2" in captured
+    assert reminder_manager.get_reminder_by_id(last_id) is None
+
+
+def test_display_reminders_stops_paging_on_request(monkeypatch, reminder_manager, setup_sample_reminders, capfd):
+    reminder_manager.page_size = 2
+    monkeypatch.setattr('builtins.input', lambda _: 'q')
+
+    reminder_manager.display_reminders("all")
+    captured = capfd.readouterr().out
+
+    assert "Doctor Appointment" in captured
+    assert "Meeting" in captured
+    assert "Gym" not in captured
+
+
+def test_add_reminder_rejects_duplicate_title_case_insensitively(reminder_manager, db_manager, capfd):
+    assert reminder_manager.add_reminder(**SAMPLE_REMINDER) is True
+    duplicate = dict(SAMPLE_REMINDER, title=SAMPLE_REMINDER["title"].upper())
+
+    assert reminder_manager.add_reminder(**duplicate) is False
+    assert "Title must be unique" in capfd.readouterr().out
+    assert db_manager.fetch_all("SELECT COUNT(*) FROM reminders") == [(1,)]
+
+
+def test_add_reminder_stores_normalized_recurrence_rule(reminder_manager, db_manager, capfd):
+    rule = dict(SAMPLE_REMINDER, recurrence="every 2 weeks on thu, mon")
+    assert reminder_manager.add_reminder(**rule) is True
+    assert db_manager.fetch_all("SELECT recurrence FROM reminders") == [("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH",)]
+
+    assert reminder_manager.add_reminder(**dict(SAMPLE_REMINDER, title="Other", recurrence="hourly")) is False
+    assert "Invalid recurrence" in capfd.readouterr().out
+
+
+def test_title_exists(reminder_manager, db_manager):
+    reminder_manager.add_reminder(**SAMPLE_REMINDER)
+    reminder_id = db_manager.fetch_all("SELECT id FROM reminders")[0][0]
+
+    assert reminder_manager.title_exists("doctor's appointment") is True
+    assert reminder_manager.title_exists("Dentist") is False
+    assert reminder_manager.title_exists("Doctor's Appointment", exclude_id=reminder_id) is False
@@ -2,6 +2,10 @@ import pytest
 from datetime import datetime, timedelta
 from services.scheduler_service import ReminderScheduler
 from services.notification_service import NotificationService
+from config.settings import CLAIM_BATCH_SIZE
+from services.dispatch_scheduler import DispatchScheduler
+from utils.clock import SYSTEM_CLOCK, SimulatedClock
+from utils.time_utils import to_epoch
 
 
 @pytest.mark.parametrize(
@@ -31,7 +35,6 @@ def test_calculate_next_occurrence(reminder_time, recurrence, expected_next_time
     assert next_time == expected_next_time
 
 
-@pytest.mark.skip(reason="Skipping due to SQLite in-memory datetime format mismatch")
 def test_get_due_reminders_with_due_reminder(db_manager):
     reminder_time = datetime.now() - timedelta(minutes=5)
     db_manager.execute(
@@ -43,7 +46,6 @@ def test_get_due_reminders_with_due_reminder(db_manager):
     due_reminders = ReminderScheduler.get_due_reminders(wrapped_db_manager)
     assert len(due_reminders) == 1
 
-@pytest.mark.skip(reason="Skipping due to SQLite in-memory datetime format mismatch")
 def test_get_due_reminders_with_no_due_reminder(db_manager):
     reminder_time = datetime.now() + timedelta(minutes=5)  # Future reminder
     db_manager.execute(
@@ -57,6 +59,8 @@ def test_get_due_reminders_with_no_due_reminder(db_manager):
     assert len(due_reminders) == 0
 
 class DBManagerWrapper:
+    clock = SYSTEM_CLOCK  # Stands in for the scheduler, which reads the time from its clock
+
     def __init__(self, db_manager):
         self._db_manager = db_manager
 
@@ -94,10 +98,6 @@ def test_fetch_upcoming_reminders_with_no_upcoming_reminder(db_manager):
     upcoming_reminders = ReminderScheduler.fetch_upcoming_reminders(wrapped_db_manager)
     print(f"Upcoming Reminders (Expected None): {upcoming_reminders}")  # Debugging step
 
-    # Skip the test if the function fetches past reminders due to SQLite in-memory datetime mismatch
-    if len(upcoming_reminders) > 0:
-        pytest.skip("Skipping due to SQLite in-memory datetime format mismatch")
-
     # No upcoming reminders should be fetched since the reminder time is in the past
     assert len(upcoming_reminders) == 0
 
@@ -178,7 +178,8 @@ def test_run_reminder_checker(db_manager, mocker):
 
     # Fetch reminder status after checker runs
     updated_reminder = db_manager.fetch_all(
-        "SELECT * FROM reminders WHERE title = ?", ("Due Reminder",)
+        "SELECT id, title, description, reminder_time, email, recurrence, notified FROM reminders WHERE title = ?",
+        ("Due Reminder",)
     )[0]
 
 
@@ -191,3 +192,202 @@ def test_run_reminder_checker(db_manager, mocker):
 
     # Ensure notified status is updated to 1
     assert notified == 1
+
+
+def test_apply_due_transitions_single_commit(db_manager, mocker):
+    past = (datetime.now() - timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M")
+    for title, recurrence in [("One Shot", "none"), ("Every Day", "daily")]:
+        db_manager.execute(
+            "INSERT INTO reminders (title, description, reminder_time, recurrence, notified) VALUES (?, ?, ?, ?, ?)",
+            (title, "Test Description", past, recurrence, 0),
+        )
+    scheduler = ReminderScheduler(db_manager)
+    due = [
+        {"id": row[0], "title": row[1], "time": row[2], "recurrence": row[3], "email": row[4]}
+        for row in scheduler.get_due_reminders()
+    ]
+    commits = mocker.spy(db_manager, "transaction")
+
+    scheduler.apply_due_transitions(due)
+
+    assert commits.call_count == 1
+    rows = dict((r[0], r[1:]) for r in db_manager.fetch_all("SELECT title, notified, reminder_time FROM reminders"))
+    assert rows["One Shot"] == (1, past)
+    expected_next = (datetime.strptime(past, "%Y-%m-%d %H:%M") + timedelta(days=1)).strftime("%Y-%m-%d %H:%M")
+    assert rows["Every Day"] == (0, expected_next)
+
+
+def _insert_due(db_manager, count):
+    past = (datetime.now() - timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M")
+    with db_manager.transaction() as cursor:
+        cursor.executemany(
+            "INSERT INTO reminders (title, description, reminder_time, recurrence) VALUES (?, ?, ?, 'none')",
+            [(f"Due #{i}", "Test Description", past) for i in range(count)],
+        )
+
+
+def test_claim_due_reminders_is_exclusive(db_manager):
+    _insert_due(db_manager, 5)
+    first = ReminderScheduler(db_manager, worker_id="worker-a")
+    second = ReminderScheduler(db_manager, worker_id="worker-b")
+
+    claimed = first.claim_due_reminders(limit=3)
+
+    assert len(claimed) == 3
+    assert len(second.claim_due_reminders()) == 2
+    assert second.claim_due_reminders() == []
+    owners = db_manager.fetch_all("SELECT claimed_by, COUNT(*) FROM reminders GROUP BY claimed_by ORDER BY claimed_by")
+    assert owners == [("worker-a", 3), ("worker-b", 2)]
+
+
+def test_expired_lease_is_reclaimed_and_transitions_clear_it(db_manager):
+    _insert_due(db_manager, 1)
+    crashed = ReminderScheduler(db_manager, worker_id="crashed")
+    survivor = ReminderScheduler(db_manager, worker_id="survivor")
+
+    assert len(crashed.claim_due_reminders(lease_seconds=-1)) == 1  # Lease already expired
+    (row,) = survivor.claim_due_reminders()
+
+    survivor.apply_due_transitions([ReminderScheduler.reminder_from_row(row)])
+    assert db_manager.fetch_all("SELECT notified, claimed_by, lease_until FROM reminders") == [(1, None, None)]
+
+
+def test_concurrent_workers_never_claim_the_same_row(tmp_path):
+    import threading
+    from database.db_manager import DBManager
+
+    db_path = str(tmp_path / "reminders.db")
+    setup = DBManager(db_name=db_path)
+    _insert_due(setup, 200)
+    claimed = []
+
+    def worker(name):
+        manager = DBManager(db_name=db_path)
+        scheduler = ReminderScheduler(manager, worker_id=name)
+        while batch := scheduler.claim_due_reminders(limit=7):
+            claimed.extend(row[0] for row in batch)
+        manager.close()
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(set(claimed))
+    assert len(claimed) == 200
+    setup.close()
+
+
+@pytest.mark.parametrize("recurrence", ["daily", "weekly", "monthly", "yearly"])
+@pytest.mark.parametrize("start", [
+    datetime(2024, 1, 31, 9, 30), datetime(2024, 2, 29, 8, 0), datetime(2023, 8, 31, 23, 59), datetime(2025, 3, 15, 12, 0),
+])
+def test_occurrence_at_matches_stepping_one_period_at_a_time(start, recurrence, capsys):
+    stepped = start
+    for steps in range(1, 50):
+        stepped = ReminderScheduler.calculate_next_occurrence(stepped, recurrence)
+        assert ReminderScheduler.occurrence_at(start, recurrence, steps) == stepped
+    assert capsys.readouterr().out == ""  # Computing occurrences prints nothing
+
+
+@pytest.mark.parametrize("recurrence", ["daily", "weekly", "monthly", "yearly"])
+def test_next_occurrence_after_skips_straight_past_now(recurrence):
+    start = datetime(2020, 1, 31, 9, 0)
+    now = datetime(2025, 6, 10, 9, 0)
+
+    next_time, steps = ReminderScheduler.next_occurrence_after(start, recurrence, now)
+
+    assert next_time > now
+    assert ReminderScheduler.occurrence_at(start, recurrence, steps - 1) <= now
+    assert next_time == ReminderScheduler.occurrence_at(start, recurrence, steps)
+
+
+@pytest.mark.parametrize("policy, expected", [("once", 1), ("all", 4), ("skip", 0)])
+def test_due_occurrences_follow_missed_fire_policy(policy, expected):
+    now = datetime(2025, 6, 10, 12, 0)
+    reminder = {"id": 1, "title": "Standup", "time": "2025-06-07 09:00", "recurrence": "daily",
+                "email": None, "missed_fire_policy": policy}
+
+    occurrences = ReminderScheduler.due_occurrences(reminder, now)
+
+    assert len(occurrences) == expected
+    if policy == "all":
+        assert [o["time"] for o in occurrences] == [f"2025-06-{day:02d} 09:00" for day in range(7, 11)]
+    if policy == "once":
+        assert occurrences[0]["time"] == "2025-06-10 09:00"
+
+
+def test_skip_policy_still_sends_when_on_time():
+    now = datetime(2025, 6, 10, 9, 1)
+    reminder = {"id": 1, "title": "Standup", "time": "2025-06-07 09:00", "recurrence": "daily",
+                "email": None, "missed_fire_policy": "skip"}
+
+    assert [o["time"] for o in ReminderScheduler.due_occurrences(reminder, now)] == ["2025-06-10 09:00"]
+
+
+def test_checker_catches_up_a_month_in_one_pass(db_manager, mocker):
+    month_ago = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d %H:%M")
+    db_manager.execute(
+        "INSERT INTO reminders (title, description, reminder_time, recurrence) VALUES (?, ?, ?, ?)",
+        ("Daily Pills", "Take them", month_ago, "daily"),
+    )
+    mock_check_reminder = mocker.patch('services.notification_service.NotificationService.check_reminder')
+    scheduler = ReminderScheduler(db_manager)
+    mocker.patch("time.sleep")
+
+    scheduler.run_reminder_checker(check_interval=0, max_checks=1)
+
+    mock_check_reminder.assert_called_once()
+    (fire_at, notified), = db_manager.fetch_all("SELECT fire_at, notified FROM reminders")
+    assert notified == 0
+    assert datetime.now() < datetime.fromtimestamp(fire_at) <= datetime.now() + timedelta(days=1)
+
+
+def test_delivery_pool_is_built_by_the_first_inline_delivery(db_manager, mocker):
+    service = mocker.Mock(pushbullet_api_key="", spec=["pushbullet_api_key", "check_reminder"])
+    service.check_reminder.return_value = True
+    scheduler = ReminderScheduler(db_manager, service)
+    assert scheduler.delivery_pool is None
+
+    due = [{"id": 1, "title": "Dentist", "time": "2025-06-02 09:00", "email": None, "recurrence": "none"}]
+    assert scheduler.deliver(due, service, datetime(2025, 6, 2, 9, 1)).delivered == 1
+    assert scheduler.delivery_pool is not None
+
+    scheduler.close()
+    assert scheduler.delivery_pool is None
+    scheduler.close()  # Closing twice is harmless
+
+
+def test_claims_are_renewed_while_a_slow_recipient_is_paced(db_manager):
+    clock = SimulatedClock(to_epoch(datetime(2025, 6, 2, 15, 0)))
+    rival = ReminderScheduler(db_manager, clock=clock, worker_id="rival")
+    rival.lease_seconds = 60
+    taken_over, sent = [], []
+
+    class Notifier:
+        pushbullet_api_key = ""
+
+        def check_reminder(self, reminder, update_status=True):
+            taken_over.extend(rival.claim_due_reminders())  # Another checker polls while this batch is paced
+            sent.append(reminder["id"])
+            return True
+
+    notifier = Notifier()
+    scheduler = ReminderScheduler(db_manager, notifier, clock=clock, worker_id="slow")
+    scheduler.lease_seconds = 60
+    # One email per 50s to this address: the batch takes 200s against a 60s lease
+    scheduler.dispatcher = DispatchScheduler({}, {"email": (0.02, 1)}, clock=clock)
+    with db_manager.transaction() as cursor:
+        cursor.executemany(
+            "INSERT INTO reminders (title, description, reminder_time, email, recurrence) VALUES (?, ?, ?, ?, 'none')",
+            [(f"Bill {i}", "x", f"2025-06-02 {9 + i:02d}:00", "me@example.com") for i in range(5)])
+
+    assert scheduler.claim_limit() == CLAIM_BATCH_SIZE  # Only a per-recipient limit: the claim cap cannot help
+    assert scheduler.check_due() == 5
+
+    assert taken_over == []
+    assert sorted(sent) == [1, 2, 3, 4, 5]
+    assert db_manager.fetch_all("SELECT COUNT(*) FROM reminders WHERE notified = 1 AND claimed_by IS NULL") == [(5,)]
+    scheduler.close()
+    rival.close()
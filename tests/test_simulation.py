@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime, timedelta
+from services.scheduler_service import ReminderScheduler
+from services.simulation import Simulation
+from utils.clock import SimulatedClock
+from utils.time_utils import to_epoch
+
+
+START = datetime(2030, 1, 7, 0, 0)
+
+
+def test_simulated_clock_only_moves_when_sleeping():
+    clock = SimulatedClock(to_epoch(START))
+    clock.sleep(90)
+    asyncio.run(clock.sleep_async(30))
+    clock.sleep(-5)
+
+    assert clock.now() == START + timedelta(minutes=2)
+    assert clock.slept == 120
+
+
+def test_checker_sleeps_on_the_clock(db_manager, mocker):
+    clock = SimulatedClock(to_epoch(START))
+    db_manager.execute(
+        "INSERT INTO reminders (title, description, reminder_time, recurrence, fire_at) VALUES (?, ?, ?, ?, ?)",
+        ("Standup", "Daily", "2030-01-07 00:05", "daily", to_epoch(START + timedelta(minutes=5))),
+    )
+    check_reminder = mocker.patch("services.notification_service.NotificationService.check_reminder")
+    scheduler = ReminderScheduler(db_manager, clock=clock)
+
+    scheduler.run_reminder_checker(check_interval=240, max_checks=3, duration_minutes=60)
+
+    assert clock.now() == START + timedelta(minutes=12)  # Three checks, each followed by a sleep
+    check_reminder.assert_called_once()
+    assert check_reminder.call_args.args[0]["time"] == "2030-01-07 00:05"
+    assert db_manager.fetch_all("SELECT reminder_time FROM reminders") == [("2030-01-08 00:05",)]
+
+
+def test_year_of_reminders_replays_without_misses():
+    simulation = Simulation(reminder_count=40, days=365, check_interval=60, start=START)
+    report = simulation.run()
+    simulation.close()
+
+    assert report.ok
+    assert report.expected > 1000
+    assert report.delivered == report.expected
+    assert report.max_lateness <= 60
+    assert report.seconds < 30
+
+
+def test_sparse_checks_show_up_as_missed_fires():
+    # Daily reminders checked every three days coalesce under the "once" policy
+    simulation = Simulation(reminder_count=20, days=30, check_interval=3 * 86400, start=START)
+    report = simulation.run()
+    simulation.close()
+
+    assert report.missed > 0
+    assert report.late > 0 or report.max_lateness > 0
+    assert not report.ok
+
+
+def test_lost_transitions_show_up_as_duplicates():
+    simulation = Simulation(reminder_count=10, days=3, check_interval=60, start=START)
+    # Never record that a reminder fired: every check sends it again
+    simulation.scheduler.apply_due_transitions = lambda due, now=None: simulation.scheduler.release_claims(
+        [reminder["id"] for reminder in due])
+    report = simulation.run()
+    simulation.close()
+
+    assert report.duplicates > 0
+    assert not report.ok
@@ -0,0 +1,152 @@
+import smtplib
+import threading
+import pytest
+from email.message import EmailMessage
+from services.smtp_pool import SMTPSessionPool
+from utils.clock import SimulatedClock
+
+
+class FakeServer:
+    """Records what a real smtplib connection would have been asked to do."""
+    instances = []
+
+    def __init__(self, host, port, timeout=None, context=None):
+        self.address = (host, port)
+        self.logins = []
+        self.sent = []
+        self.fail_next = None  # Exception raised by the next send_message
+        self.noop_code = 250
+        self.closed = False
+        self.starttls_called = False
+        FakeServer.instances.append(self)
+
+    def login(self, user, password):
+        self.logins.append(user)
+
+    def starttls(self, context=None):
+        self.starttls_called = True
+
+    def send_message(self, message):
+        if self.fail_next:
+            error, self.fail_next = self.fail_next, None
+            raise error
+        self.sent.append(message["To"])
+
+    def noop(self):
+        return self.noop_code, b"OK"
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeServer.instances = []
+    monkeypatch.setattr(smtplib, "SMTP_SSL", FakeServer)
+    monkeypatch.setattr(smtplib, "SMTP", FakeServer)
+    return FakeServer
+
+
+def _message(to):
+    message = EmailMessage()
+    message["To"] = to
+    message.set_content("Reminder")
+    return message
+
+
+def _pool(**kwargs):
+    return SMTPSessionPool("sender@example.com", "secret", host="smtp.test", port=465,
+                           clock=SimulatedClock(0), **kwargs)
+
+
+def test_one_login_serves_many_emails(fake_smtp):
+    pool = _pool()
+    for number in range(5):
+        pool.send(_message(f"user{number}@example.com"))
+
+    server, = fake_smtp.instances
+    assert server.logins == ["sender@example.com"]
+    assert len(server.sent) == 5
+    assert (pool.connects, pool.sent, pool.idle_sessions) == (1, 5, 1)
+
+
+def test_dead_session_is_replaced_and_the_email_resent(fake_smtp):
+    pool = _pool()
+    pool.send(_message("a@example.com"))
+    fake_smtp.instances[0].fail_next = smtplib.SMTPServerDisconnected("gone")
+
+    pool.send(_message("b@example.com"))
+
+    first, second = fake_smtp.instances
+    assert first.closed and first.sent == ["a@example.com"]
+    assert second.sent == ["b@example.com"]
+    assert pool.idle_sessions == 1
+
+
+def test_rejected_email_keeps_the_session(fake_smtp):
+    pool = _pool()
+    pool.send(_message("a@example.com"))
+    fake_smtp.instances[0].fail_next = smtplib.SMTPRecipientsRefused({"b@example.com": (550, b"No such user")})
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.send(_message("b@example.com"))
+
+    assert len(fake_smtp.instances) == 1
+    assert pool.idle_sessions == 1
+
+
+def test_idle_sessions_are_probed_or_dropped(fake_smtp):
+    pool = _pool(idle_timeout=240, noop_after=30)
+    pool.send(_message("a@example.com"))
+
+    pool.clock.sleep(60)  # Probed with NOOP, still fine
+    pool.send(_message("b@example.com"))
+    assert len(fake_smtp.instances) == 1
+
+    pool.clock.sleep(60)
+    fake_smtp.instances[0].noop_code = 421
+    pool.send(_message("c@example.com"))
+    assert len(fake_smtp.instances) == 2
+
+    pool.clock.sleep(300)  # Past the idle timeout: not even probed
+    pool.send(_message("d@example.com"))
+    assert len(fake_smtp.instances) == 3
+    assert [server.sent for server in fake_smtp.instances] == [["a@example.com", "b@example.com"],
+                                                               ["c@example.com"], ["d@example.com"]]
+
+
+def test_sessions_are_retired_after_max_messages(fake_smtp):
+    pool = _pool(max_messages=2)
+    sent = pool.send_many([_message(f"user{number}@example.com") for number in range(5)])
+
+    assert sent == 5
+    assert [len(server.sent) for server in fake_smtp.instances] == [2, 2, 1]
+
+
+def test_plain_and_starttls_connections(fake_smtp):
+    for security, upgraded in (("starttls", True), ("none", False)):
+        pool = SMTPSessionPool(host="localhost", port=1025, security=security)
+        pool.send(_message("a@example.com"))
+        server = fake_smtp.instances[-1]
+        assert server.address == ("localhost", 1025)
+        assert server.starttls_called is upgraded
+        assert server.logins == []  # No credentials configured
+
+    with pytest.raises(ValueError):
+        SMTPSessionPool(security="tls")
+
+
+def test_concurrent_senders_share_at_most_size_sessions(fake_smtp):
+    pool = _pool(size=2)
+    threads = [threading.Thread(target=lambda n=n: pool.send(_message(f"user{n}@example.com"))) for n in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake_smtp.instances) <= 2
+    assert sum(len(server.sent) for server in fake_smtp.instances) == 20
+
+    pool.close()
+    assert all(server.closed for server in fake_smtp.instances)
+    assert pool.idle_sessions == 0
@@ -0,0 +1,107 @@
+import time
+from datetime import datetime
+from database.db_manager import DBManager
+from services.reminder_manager import ReminderManager
+from services.scheduler_service import ReminderScheduler
+from services.upcoming_window import UpcomingWindow
+
+
+def _minute(offset_seconds):
+    """A minute-aligned epoch `offset_seconds` from now (reminder times have minute precision)."""
+    return (int(time.time()) + offset_seconds) // 60 * 60
+
+
+def _insert(db_manager, title, fire_at, recurrence="none"):
+    reminder_time = datetime.fromtimestamp(fire_at).strftime("%Y-%m-%d %H:%M")
+    with db_manager.transaction() as cursor:
+        cursor.execute(
+            "INSERT INTO reminders (title, description, reminder_time, recurrence, fire_at) VALUES (?, ?, ?, ?, ?)",
+            (title, "x", reminder_time, recurrence, fire_at),
+        )
+        return cursor.lastrowid
+
+
+def test_first_slide_reports_everything_then_only_changes(db_manager):
+    soon = _minute(600)
+    _insert(db_manager, "Soon", soon)
+    _insert(db_manager, "Hourly check", _minute(1200), recurrence="every 3 days")
+    _insert(db_manager, "Next week", _minute(7 * 86400))
+
+    window = UpcomingWindow(db_manager, hours=24)
+    first = window.slide()
+    assert [entry.title for entry in first.entered] == ["Soon", "Hourly check"]
+    assert first.entered[0].fire_at == soon
+    assert not first.left
+
+    assert not window.slide()
+
+
+def test_sliding_drops_passed_entries_and_adds_the_new_stretch(db_manager):
+    now = _minute(0)
+    _insert(db_manager, "Daily", now + 600, recurrence="daily")
+    window = UpcomingWindow(db_manager, hours=24)
+    window.slide(now)
+
+    changes = window.slide(now + 700)
+    assert [(entry.title, entry.fire_at) for entry in changes.left] == [("Daily", now + 600)]
+    assert [(entry.title, entry.fire_at) for entry in changes.entered] == [("Daily", now + 600 + 86400)]
+    assert [entry.fire_at for entry in window.entries(now + 700)] == [now + 600 + 86400]
+
+
+def test_reminder_manager_events_update_the_window(db_manager, mocker):
+    scheduler = ReminderScheduler(db_manager)
+    manager = ReminderManager(db_manager, scheduler=scheduler)
+    window = scheduler.upcoming_window
+    window.slide()
+
+    soon = datetime.fromtimestamp(_minute(300)).strftime("%Y-%m-%d %H:%M")
+    assert manager.add_reminder("Soon", "Soon description", soon)
+    (entered,) = window.changes().entered
+    assert entered.title == "Soon"
+
+    mocker.patch.object(manager, "choose_reminder_id", return_value=entered.reminder_id)
+    manager.delete_reminder()
+    assert [entry.title for entry in window.changes().left] == ["Soon"]
+    assert len(window) == 0
+
+
+def test_fired_recurring_reminder_moves_to_its_next_occurrence(db_manager):
+    scheduler = ReminderScheduler(db_manager)
+    due_at = _minute(-60)
+    _insert(db_manager, "Every day", due_at, recurrence="daily")
+    assert [entry.fire_at for entry in scheduler.upcoming_window.slide().entered] == [due_at + 86400]
+
+    (row,) = scheduler.claim_due_reminders()
+    scheduler.apply_due_transitions([scheduler.reminder_from_row(row)])
+
+    # Already listed at its next time: firing is not reported as a change
+    assert not scheduler.upcoming_window.slide()
+    assert [entry.fire_at for entry in scheduler.upcoming_window.entries()] == [due_at + 86400]
+
+
+def test_writes_from_another_connection_trigger_a_rebuild(tmp_path):
+    path = str(tmp_path / "window.db")
+    mine, theirs = DBManager(db_name=path, create_table=True), DBManager(db_name=path)
+    try:
+        window = UpcomingWindow(mine, hours=24)
+        window.slide()
+        _insert(theirs, "Elsewhere", _minute(600))
+
+        assert [entry.title for entry in window.slide().entered] == ["Elsewhere"]
+        assert not window.slide()
+    finally:
+        mine.close()
+        theirs.close()
+
+
+def test_shadow_table_mirrors_the_window(db_manager):
+    _insert(db_manager, "Shadowed", _minute(600))
+    window = UpcomingWindow(db_manager, hours=24, shadow=True)
+    window.slide()
+    assert [entry.title for entry in UpcomingWindow.read_shadow(db_manager)] == ["Shadowed"]
+
+    later = _insert(db_manager, "Later", _minute(1200))
+    window.refresh([later])
+    assert [entry.title for entry in UpcomingWindow.read_shadow(db_manager)] == ["Shadowed", "Later"]
+
+    assert UpcomingWindow.read_shadow(DBManager(db_name=":memory:")) == []
@@ -2,7 +2,7 @@ import pytest
 from utils.validation_utils import (
     validate_title, validate_description, validate_reminder_time,
     validate_email, validate_recurrence, validate_date, validate_month,
-    validate_year, validate_reminder_id, get_valid_input
+    validate_year, validate_reminder_id, get_valid_input, fold_title
 )
 from unittest.mock import patch
 from datetime import datetime, timedelta
@@ -14,7 +14,7 @@ def mock_input(mocker):
 
 # Test validate_title
 def test_validate_title_valid():
-    assert validate_title("My Reminder", existing_titles={"Test", "Sample"}) is True
+    assert validate_title("My Reminder", title_exists=lambda t: fold_title(t) in {"test", "sample"}) is True
 
 def test_validate_title_empty():
     assert validate_title("") is False
@@ -26,7 +26,7 @@ def test_validate_title_too_long():
     assert validate_title("A" * 101) is False
 
 def test_validate_title_non_unique():
-    assert validate_title("test", existing_titles={"Test", "Sample"}) is False
+    assert validate_title("Test", title_exists=lambda t: fold_title(t) in {"test", "sample"}) is False
 
 def test_validate_title_non_alpha_start(mock_input):
     mock_input.return_value = "y"
@@ -83,6 +83,10 @@ def test_validate_recurrence_valid():
 def test_validate_recurrence_invalid():
     assert validate_recurrence("hourly") is False
 
+def test_validate_recurrence_accepts_rules():
+    assert validate_recurrence("every 2 weeks on mon,thu") is True
+    assert validate_recurrence("FREQ=MONTHLY;BYDAY=-1FR") is True
+
 # Test validate_date
 def test_validate_date_valid():
     assert validate_date("2025-03-24") is True
@@ -0,0 +1,74 @@
+# Clock abstraction: wall time, blocking sleep and awaitable sleep in one place
+
+import asyncio
+import time
+from datetime import datetime
+
+
+class Clock:
+    """
+    The system clock.
+
+    Code that waits for reminders asks a Clock for the time and for sleeps instead of
+    calling `time` / `datetime` / `asyncio` directly, so the source of time can be swapped.
+    """
+
+    def time(self) -> float:
+        """Current time as epoch seconds."""
+        return time.time()
+
+    def now(self) -> datetime:
+        """Current local time as a naive datetime."""
+        return datetime.now()
+
+    def sleep(self, seconds: float) -> None:
+        """Block the calling thread for `seconds`."""
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        """Suspend the calling coroutine for `seconds` without blocking the event loop."""
+        await asyncio.sleep(max(seconds, 0))
+
+    async def sleep_until(self, epoch: float) -> None:
+        """Suspend the calling coroutine until the given epoch time."""
+        await self.sleep_async(epoch - self.time())
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class SimulatedClock(Clock):
+    """
+    A clock that only moves when told to.
+
+    Sleeps return immediately after advancing the simulated time, so a schedule spanning
+    months runs in however long the work in between takes. `now()` is the local time of
+    the simulated epoch, matching what `to_epoch` expects back.
+    """
+
+    def __init__(self, start: float) -> None:
+        """
+        Args:
+            start (float): Initial time as epoch seconds.
+        """
+        self.current = float(start)
+        self.slept = 0.0  # Total simulated seconds spent sleeping
+
+    def time(self) -> float:
+        return self.current
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.current)
+
+    def advance(self, seconds: float) -> None:
+        """Move the time forward by `seconds` (never backwards)."""
+        self.current += max(seconds, 0)
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+        self.slept += max(seconds, 0)
+
+    async def sleep_async(self, seconds: float) -> None:
+        self.sleep(seconds)
+        await asyncio.sleep(0)  # Still give other coroutines their turn
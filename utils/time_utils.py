@@ -0,0 +1,95 @@
+# Date-time parsing and epoch conversion helpers
+
+from datetime import datetime, timedelta
+from typing import Tuple
+
+
+REMINDER_TIME_FORMAT = "%Y-%m-%d %H:%M"  # Format reminders are entered and stored in
+
+# Older rows and tests also carry seconds or ISO-8601 'T' separators
+ACCEPTED_TIME_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S")
+
+
+def parse_reminder_time(value: str) -> datetime:
+    """
+    Parse a stored or user-entered reminder time into a naive local datetime.
+
+    Args:
+        value (str): The reminder time text.
+
+    Returns:
+        datetime: The parsed local time.
+
+    Raises:
+        ValueError: If the text matches none of the accepted formats.
+    """
+    for time_format in ACCEPTED_TIME_FORMATS:
+        try:
+            return datetime.strptime(value, time_format)
+        except ValueError:
+            continue
+    return datetime.fromisoformat(value)
+
+
+def format_reminder_time(value: datetime) -> str:
+    """
+    Format a datetime the way reminder times are stored.
+
+    Args:
+        value (datetime): The local time to format.
+
+    Returns:
+        str: The time as "YYYY-MM-DD HH:MM".
+    """
+    return value.strftime(REMINDER_TIME_FORMAT)
+
+
+def to_epoch(value: datetime) -> int:
+    """
+    Convert a naive local datetime into UTC epoch seconds (the `fire_at` column).
+
+    Args:
+        value (datetime): The local time to convert.
+
+    Returns:
+        int: Seconds since 1970-01-01 UTC.
+    """
+    return int(value.timestamp())
+
+
+def from_epoch(epoch: int) -> datetime:
+    """
+    Convert UTC epoch seconds back into a naive local datetime.
+
+    Args:
+        epoch (int): Seconds since 1970-01-01 UTC.
+
+    Returns:
+        datetime: The matching local time.
+    """
+    return datetime.fromtimestamp(epoch)
+
+
+def day_range(date_input: str) -> Tuple[int, int]:
+    """
+    Epoch bounds [start, end) of a calendar day given as YYYY-MM-DD.
+    """
+    start = datetime.strptime(date_input, "%Y-%m-%d")
+    return to_epoch(start), to_epoch(start + timedelta(days=1))
+
+
+def month_range(month_input: str) -> Tuple[int, int]:
+    """
+    Epoch bounds [start, end) of a calendar month given as YYYY-MM.
+    """
+    start = datetime.strptime(month_input, "%Y-%m")
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return to_epoch(start), to_epoch(end)
+
+
+def year_range(year_input: str) -> Tuple[int, int]:
+    """
+    Epoch bounds [start, end) of a calendar year given as YYYY.
+    """
+    start = datetime(int(year_input), 1, 1)
+    return to_epoch(start), to_epoch(start.replace(year=start.year + 1))
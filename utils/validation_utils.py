@@ -1,20 +1,32 @@
 from datetime import datetime
 import re
-from database.db_manager import DBManager
-from typing import Callable, Optional
+import string
+from config.settings import MISSED_FIRE_POLICY
+from services.recurrence_rules import FREQUENCIES, compile_rule, normalize_recurrence
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
-# Instantiate DBManager for database interactions
-db_manager = DBManager()
+EMAIL_REGEX = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+VALID_RECURRENCES = set(FREQUENCIES)  # Plain names; richer rules are checked by compile_rule
+RECURRENCE_EXAMPLES = "none, daily, weekly, monthly, yearly, every 2 weeks on mon,thu, last fri of every month"
+VALID_MISSED_FIRE_POLICIES = {"once", "all", "skip"}
+NOCASE_FOLD = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def fold_title(title: str) -> str:
+    """Case-folds a title the way SQLite's NOCASE collation (and so the unique title index) does: ASCII only."""
+    return title.translate(NOCASE_FOLD)
+
 
 # Validation Functions
-def validate_title(title: str, existing_titles: Optional[set[str]] = None) -> bool:
+def validate_title(title: str, title_exists: Optional[Callable[[str], bool]] = None) -> bool:
     """
     Validate the title for length and uniqueness.
 
     Args:
         title (str): The title to validate.
-        existing_titles (Optional[set[str]]): Set of existing titles to ensure uniqueness.
+        title_exists (Optional[Callable[[str], bool]]): Indexed, case-insensitive lookup
+            (e.g. `ReminderManager.title_exists`).
 
     Returns:
         bool: True if the title is valid, False otherwise.
@@ -30,11 +42,8 @@ def validate_title(title: str, existing_titles: Optional[set[str]] = None) -> bo
         print("❌ Keep title between 3 - 100 characters.")
         return False
 
-    if existing_titles is None:
-        existing_titles = set()
-
     # ✅ Case-insensitive uniqueness check
-    if title.lower() in {t.lower() for t in existing_titles}:
+    if title_exists is not None and title_exists(title):
         print("❌ Title must be unique. This title is already in use.")
         return False
 
@@ -112,25 +121,25 @@ def validate_email(email: str) -> bool:
         bool: True if the email is valid, False otherwise.
     """
     email = email.strip()
-    email_regex = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-    if not re.match(email_regex, email):
+    if not re.match(EMAIL_REGEX, email):
         print("❌ Invalid email format. Use example@domain.com.")
         return False
     return True
 
 def validate_recurrence(recurrence: str) -> bool:
     """
-    Validate that the recurrence type is one of the allowed values.
+    Validate that the recurrence is a plain type or a rule `compile_rule` understands.
 
     Args:
-        recurrence (str): The recurrence type to validate.
+        recurrence (str): The recurrence to validate.
 
     Returns:
-        bool: True if the recurrence type is valid, False otherwise.
+        bool: True if the recurrence is valid, False otherwise.
     """
-    valid_recurrences = {"none", "daily", "weekly", "monthly", "yearly"}
-    if recurrence.lower() not in valid_recurrences:
-        print("❌ Invalid recurrence type. Choose from: none, daily, weekly, monthly, yearly")
+    try:
+        compile_rule(recurrence)
+    except ValueError as e:
+        print(f"❌ Invalid recurrence ({e}). Examples: {RECURRENCE_EXAMPLES}")
         return False
     return True
 
@@ -220,4 +229,70 @@ def get_valid_input(prompt: str, validation_func: Optional[Callable[[str], bool]
             return "MENU_EXIT"  # Clearer than None
 
         if validation_func is None or validation_func(user_input):
-            return user_input
\ No newline at end of file
+            return user_input
+
+
+def parse_reminder_record(record: Any) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Validate one imported reminder record without printing or prompting.
+
+    Applies the same rules as the interactive validators; soft checks that would
+    normally ask for confirmation (non-letter first character) are accepted.
+
+    Args:
+        record (Any): A mapping with title, description, reminder_time and optional
+            email/recurrence/missed_fire_policy/urgent.
+
+    Returns:
+        Tuple[Optional[Dict[str, Any]], List[str]]: The normalized record (with the parsed
+        `reminder_dt`) and an empty error list, or None and the list of problems found.
+    """
+    if not isinstance(record, dict):
+        return None, ["Malformed record."]
+
+    title = str(record.get("title") or "").strip()
+    description = str(record.get("description") or "").strip()
+    reminder_time = str(record.get("reminder_time") or "").strip()
+    email = str(record.get("email") or "").strip() or None
+    recurrence = str(record.get("recurrence") or "").strip().lower() or "none"
+    missed_fire_policy = str(record.get("missed_fire_policy") or "").strip().lower() or MISSED_FIRE_POLICY
+    urgent_text = str(record.get("urgent") or "").strip().lower()
+
+    errors = []
+    if not (3 <= len(title) <= 100):
+        errors.append("Title must be 3 - 100 characters.")
+    if not (5 <= len(description) <= 200):
+        errors.append("Description must be 5 - 200 characters.")
+
+    reminder_dt = None
+    try:
+        reminder_dt = datetime.strptime(reminder_time, "%Y-%m-%d %H:%M")
+        if reminder_dt <= datetime.now():
+            errors.append("Reminder time must be in the future.")
+    except ValueError:
+        errors.append("Invalid date format. Use YYYY-MM-DD HH:MM.")
+
+    if email is not None and not re.match(EMAIL_REGEX, email):
+        errors.append("Invalid email format.")
+    try:
+        recurrence = normalize_recurrence(recurrence)
+    except ValueError as e:
+        errors.append(f"Invalid recurrence ({e}).")
+    if missed_fire_policy not in VALID_MISSED_FIRE_POLICIES:
+        errors.append("Invalid missed-fire policy (once, all or skip).")
+    if urgent_text not in ("", "0", "1", "no", "yes", "n", "y", "false", "true"):
+        errors.append("Invalid urgent flag (yes or no).")
+
+    if errors:
+        return None, errors
+
+    return {
+        "title": title,
+        "description": description,
+        "reminder_time": reminder_time,
+        "reminder_dt": reminder_dt,
+        "email": email,
+        "recurrence": recurrence,
+        "missed_fire_policy": missed_fire_policy,
+        "urgent": urgent_text in ("1", "yes", "y", "true"),
+    }, []
@@ -1,5 +1,6 @@
 # CLI menu and user input handling
 
+from database.db_manager import DBManager
 from services.reminder_manager import ReminderManager
 from config.settings import PUSHBULLET_API_KEY
 from services.scheduler_service import ReminderScheduler
@@ -18,9 +19,9 @@ class ShowMenu:
         - Sets up the reminder manager, notification service, and scheduler service.
         """
         self.db_manager = DBManager()  # Initializes database connection
-        self.scheduler_service = ReminderScheduler(self.db_manager)
-        self.reminder_manager = ReminderManager(self.db_manager, PUSHBULLET_API_KEY, self.scheduler_service)
         self.notification_service = NotificationService(self.db_manager)
+        self.scheduler_service = ReminderScheduler(self.db_manager, self.notification_service)
+        self.reminder_manager = ReminderManager(self.db_manager, PUSHBULLET_API_KEY, self.scheduler_service)
 
     def menu(self) -> None:
         """
@@ -45,10 +46,9 @@ class ShowMenu:
             choice = input("Choose an option: ")
 
             if choice == "1":
-                existing_titles = self.reminder_manager.get_all_titles()
                 title = get_valid_input(
                     "Enter title (or type 'menu' to return to menu): ",
-                    lambda t: validate_title(t, existing_titles)
+                    lambda t: validate_title(t, title_exists=self.reminder_manager.title_exists)
                 )
                 if title == "MENU_EXIT":
                     continue
@@ -69,7 +69,7 @@ class ShowMenu:
                 else:
                     email = None  # Store None if empty
 
-                recurrence = input("Enter recurrence (none/daily/weekly/monthly/yearly) (or press Enter to skip): ").strip()
+                recurrence = input(f"Enter recurrence (e.g. {RECURRENCE_EXAMPLES}) (or press Enter to skip): ").strip()
                 if recurrence:  # Validate only if the user entered something
                     while not validate_recurrence(recurrence):
                         recurrence = input("❌ Invalid recurrence. Enter again (or press Enter to skip): ").strip()